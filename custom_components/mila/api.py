@@ -0,0 +1,385 @@
+"""Mila API extensions used by the integration."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Iterable, Optional
+
+from gql.dsl import DSLField, DSLQuery, DSLSchema, DSLSubscription, dsl_gql
+from gql.transport.exceptions import TransportProtocolError, TransportQueryError, TransportServerError
+from gql.utilities import parse_result
+from graphql import (
+    DocumentNode,
+    GraphQLError,
+    GraphQLObjectType,
+    OperationDefinitionNode,
+    OperationType,
+    get_named_type,
+    is_leaf_type,
+    is_required_argument,
+)
+from homeassistant.util import dt as dt_util
+from milasdk import (
+    AbstractAsyncSession,
+    MilaApi,
+    MilaError,
+    OAuthError,
+    ApplianceSensorKind,
+    AggregateFunction,
+    OutdoorStationSensorKind,
+    appliance_fields_fragment,
+)
+
+from .const import RESPONSE_CACHE_SIZE, THROTTLED_STATUSES
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_FUNCTIONS = [
+    AggregateFunction.Mean,
+    AggregateFunction.Min,
+    AggregateFunction.Max,
+]
+
+# fields every appliance/location query needs to identify and name the device
+# (and to plan the poll rate around bedtime)
+APPLIANCE_REQUIRED_FIELDS = (
+    "id",
+    "name",
+    "room.id",
+    "room.kind",
+    "room.name",
+    "state.firmware.version",
+    "state.actualMode",
+    "room.bedtime.localStart",
+    "room.bedtime.localEnd",
+)
+LOCATION_REQUIRED_FIELDS = (
+    "id",
+    "address.city",
+    "address.country",
+)
+
+# when asked, an appliance query also lists the sensors of the kinds it leaves out,
+# with their latest value, under this alias
+SENSOR_KINDS_ALIAS = "sensorKinds"
+
+# daily pollen windows kept for trends, the latest one feeds the pollen sensors
+POLLEN_WINDOW_DAYS = 7
+
+# object fields without an explicit selection are expanded this deep
+EXPAND_DEPTH = 2
+
+# attempts per request when the API answers with a server or auth error
+API_ATTEMPTS = 3
+
+class MilaIntegrationApi(MilaApi):
+    """Mila API with the extra queries needed by the integration."""
+
+    def __init__(self, session: AbstractAsyncSession) -> None:
+        super().__init__(session)
+        #results are parsed here instead of by the client, so a response answered
+        #from the response cache (the same decoded object) is only parsed once
+        self._client.parse_results = False
+        #the session times the requests out, not counting the time they are queued
+        self._client.execute_timeout = None
+        self._parsed: OrderedDict[int, tuple[Any, Any]] = OrderedDict()
+        self.parses_skipped = 0
+
+    async def _execute(self, document: DocumentNode, variable_values: Optional[dict[str, Any]] = None) -> Any:
+        data = await self._execute_with_retries(document, variable_values)
+        if not _is_query(document):
+            return parse_result(self._client.schema, document, data)
+
+        cached = self._parsed.get(id(data))
+        if cached is not None and cached[0] is data:
+            self.parses_skipped += 1
+            self._parsed.move_to_end(id(data))
+            return cached[1]
+
+        result = parse_result(self._client.schema, document, data)
+        self._parsed[id(data)] = (data, result)
+        while len(self._parsed) > RESPONSE_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+        return result
+
+    async def _execute_with_retries(self, document: DocumentNode, variable_values: Optional[dict[str, Any]]) -> Any:
+        """
+        The retry loop of the SDK, except that a throttled request fails right away.
+
+        The SDK sleeps on a 429 (reading a response it never kept, which fails) and
+        retries a 503, while the scheduler already holds back every request for the
+        Retry-After. Failing lets the refresh keep the last data of the domain.
+        """
+        auth_errors = 0
+        async with self._client as session:
+            for attempt in range(1, API_ATTEMPTS + 1):
+                try:
+                    return await session.execute(document, variable_values)
+                except TransportServerError as ex:
+                    if ex.code in THROTTLED_STATUSES:
+                        raise MilaError(f"Mila API is throttling requests (HTTP {ex.code})") from ex
+                    if ex.code != 401 and ex.code < 500:
+                        raise MilaError("Transport server error occurred") from ex
+                    #an expired token is replaced on the next attempt
+                    auth_errors += ex.code == 401
+                    _LOGGER.debug(f"Mila API returned HTTP {ex.code}, attempt {attempt} of {API_ATTEMPTS}")
+                except TransportProtocolError as ex:
+                    raise MilaError("Transport protocol error occurred") from ex
+                except TransportQueryError as ex:
+                    raise MilaError("Transport reported query error") from ex
+                except GraphQLError as ex:
+                    raise MilaError("Invalid query") from ex
+                except (OAuthError, MilaError):
+                    raise
+                except Exception as ex:
+                    _LOGGER.debug("Unknown error calling the Mila API", exc_info=ex)
+                    if attempt == API_ATTEMPTS:
+                        raise MilaError("API call failed") from ex
+
+        if auth_errors > 1:
+            raise OAuthError("Multiple auth errors, assuming auth token invalid")
+        raise MilaError("Failed to get a valid response from Mila API service")
+
+    async def get_appliances(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        sensor_kinds: Optional[Iterable[ApplianceSensorKind]] = None,
+        list_other_kinds: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Returns the information for all appliances.
+
+        When `fields` is given only those (dotted) paths are requested, along with
+        the fields needed to identify the appliance, and `sensors` is limited to
+        `sensor_kinds`. With `list_other_kinds` the sensors of the other kinds are
+        listed too, so newly reported kinds can be found.
+        """
+        if fields is None:
+            return await super().get_appliances()
+
+        ds = DSLSchema(self._client.schema)
+        arguments = self._field_arguments(sensor_kinds)
+        selection = self._select(ds, "Appliance", [*APPLIANCE_REQUIRED_FIELDS, *fields], arguments)
+        polled_kinds = arguments[("Appliance", "sensors")]["kinds"]
+        other_kinds = [k.value for k in ApplianceSensorKind if k.value not in polled_kinds]
+        if list_other_kinds and other_kinds:
+            selection.append(
+                ds.Appliance.sensors(kinds=other_kinds).alias(SENSOR_KINDS_ALIAS).select(
+                    ds.ApplianceSensor.kind,
+                    ds.ApplianceSensor.latest(**arguments[("ApplianceSensor", "latest")]).select(
+                        ds.InstantValue.value
+                    )
+                )
+            )
+        query = dsl_gql(
+            DSLQuery(
+                ds.Query.owner.select(
+                    ds.Owner.appliances.select(*selection)
+                )
+            )
+        )
+        result = await self._execute(query)
+        return result["owner"]["appliances"]
+
+    async def get_location_data(self, fields: Optional[Iterable[str]] = None) -> list[dict[str, Any]]:
+        """
+        Returns location details.
+
+        When `fields` is given only those (dotted) paths are requested, along with
+        the fields needed to identify the location.
+        """
+        if fields is None:
+            return await super().get_location_data()
+
+        ds = DSLSchema(self._client.schema)
+        arguments = self._field_arguments()
+        query = dsl_gql(
+            DSLQuery(
+                ds.Query.owner.select(
+                    ds.Owner.locations.select(
+                        *self._select(ds, "Location", [*LOCATION_REQUIRED_FIELDS, *fields], arguments)
+                    )
+                )
+            )
+        )
+        result = await self._execute(query)
+        return result["owner"]["locations"]
+
+    def appliance_subscription(
+        self,
+        device_id: str,
+        fields: Optional[Iterable[str]] = None,
+        sensor_kinds: Optional[Iterable[ApplianceSensorKind]] = None
+    ) -> DocumentNode:
+        """Returns the subscription document for the updates of an appliance."""
+        ds = DSLSchema(self._client.schema)
+        if fields is None:
+            selection = appliance_fields_fragment(ds)
+        else:
+            selection = self._select(
+                ds, "Appliance", [*APPLIANCE_REQUIRED_FIELDS, *fields], self._field_arguments(sensor_kinds)
+            )
+        return dsl_gql(
+            DSLSubscription(
+                ds.Subscription.appliance(applianceId=device_id).select(*selection)
+            )
+        )
+
+    def parse_result(self, document: DocumentNode, data: dict[str, Any]) -> dict[str, Any]:
+        """Parse a raw result (e.g. a subscription event) into the same types as queries."""
+        return parse_result(self._client.schema, document, data)
+
+    async def get_appliance_sensor_history(
+        self,
+        device_id: str,
+        kinds: list[ApplianceSensorKind],
+        start: datetime,
+        stop: datetime
+    ) -> dict[str, dict[datetime, dict[str, float]]]:
+        """
+        Returns hourly mean/min/max values for the selected sensors of an appliance.
+
+        All aggregates for all kinds are requested in one round trip, the result
+        is keyed by sensor kind and then by the (UTC) start of each hour.
+        """
+        ds = DSLSchema(self._client.schema)
+        windows = [
+            ds.ApplianceSensor.aggregateWindow(input={
+                "range": {"start": start, "stop": stop},
+                "every": {"value": 1, "unit": "Hour"},
+                "fn": fn.value
+            }).alias(fn.value.lower()).select(
+                ds.InstantValue.instant,
+                ds.InstantValue.value
+            )
+            for fn in HISTORY_FUNCTIONS
+        ]
+        query = dsl_gql(
+            DSLQuery(
+                ds.Query.owner.select(
+                    ds.Owner.appliance(applianceId=device_id).select(
+                        ds.Appliance.sensors(kinds=[k.value for k in kinds]).select(
+                            ds.ApplianceSensor.kind,
+                            *windows
+                        )
+                    )
+                )
+            )
+        )
+        result = await self._execute(query)
+
+        history: dict[str, dict[datetime, dict[str, float]]] = {}
+        for sensor in result["owner"]["appliance"]["sensors"]:
+            rows: dict[datetime, dict[str, float]] = {}
+            for fn in HISTORY_FUNCTIONS:
+                key = fn.value.lower()
+                for point in sensor.get(key) or []:
+                    if point["value"] is None:
+                        continue
+                    rows.setdefault(_to_utc(point["instant"]), {})[key] = point["value"]
+            history[sensor["kind"]] = rows
+
+        return history
+
+    def _field_arguments(
+        self,
+        sensor_kinds: Optional[Iterable[ApplianceSensorKind]] = None
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """Arguments for the fields that require them, keyed by (type, field)."""
+        #keep the pollen window stable for a day so the query (and its cached
+        #response) only changes when a new day is available
+        now = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        kinds = list(sensor_kinds) if sensor_kinds is not None else list(ApplianceSensorKind)
+        return {
+            ("Appliance", "sensors"): {"kinds": [k.value for k in kinds]},
+            ("ApplianceSensor", "latest"): {"precision": {"unit": "Minute", "value": "1"}},
+            ("OutdoorStation", "sensor"): {"kind": OutdoorStationSensorKind.Pm2_5},
+            ("OutdoorStationSensor", "latest"): {"precision": {"unit": "Day", "value": "1"}},
+            ("PollenStation", "aggregateWindow"): {"input": {
+                "range": {"start": now - timedelta(days=POLLEN_WINDOW_DAYS), "stop": now},
+                "every": {"value": 1, "unit": "Day"},
+                "fn": AggregateFunction.Last.value
+            }},
+        }
+
+    def _select(
+        self,
+        ds: DSLSchema,
+        type_name: str,
+        paths: Iterable[str],
+        arguments: dict[tuple[str, str], dict[str, Any]]
+    ) -> list[DSLField]:
+        """Build the DSL selection for a set of dotted paths (`a.b[-1].c`) on a type."""
+        tree: dict[str, dict] = {}
+        for path in paths:
+            node = tree
+            for part in path.split("."):
+                node = node.setdefault(part.split("[")[0], {})
+        return self._select_tree(ds, type_name, tree, arguments, EXPAND_DEPTH)
+
+    def _select_tree(
+        self,
+        ds: DSLSchema,
+        type_name: str,
+        tree: dict[str, dict],
+        arguments: dict[tuple[str, str], dict[str, Any]],
+        depth: int
+    ) -> list[DSLField]:
+        gql_type: GraphQLObjectType = self._client.schema.type_map[type_name]
+        fields = []
+        for name, children in tree.items():
+            field_def = gql_type.fields.get(name)
+            if field_def is None:
+                #not an API field (e.g. computed by the integration)
+                continue
+
+            args = arguments.get((type_name, name))
+            if args is None and any(is_required_argument(a) for a in field_def.args.values()):
+                continue
+
+            field: DSLField = getattr(getattr(ds, type_name), name)
+            if args:
+                field = field(**args)
+
+            field_type = get_named_type(field_def.type)
+            if is_leaf_type(field_type):
+                fields.append(field)
+                continue
+            if not isinstance(field_type, GraphQLObjectType):
+                continue
+
+            if not children:
+                #an object was requested as a whole, expand it
+                if depth <= 0:
+                    continue
+                children = {n: {} for n in field_type.fields}
+                sub_fields = self._select_tree(ds, field_type.name, children, arguments, depth - 1)
+            else:
+                sub_fields = self._select_tree(ds, field_type.name, children, arguments, depth)
+
+            if sub_fields:
+                fields.append(field.select(*sub_fields))
+
+        return fields
+
+def reported_sensor_kinds(appliance: dict[str, Any]) -> set[ApplianceSensorKind]:
+    """The sensor kinds an appliance reports a value for, among the ones in the document."""
+    sensors = [*(appliance.get("sensors") or []), *(appliance.get(SENSOR_KINDS_ALIAS) or [])]
+    return {
+        s["kind"] for s in sensors
+        if s.get("kind") is not None and (s.get("latest") or {}).get("value") is not None
+    }
+
+def _is_query(document: DocumentNode) -> bool:
+    return all(
+        d.operation == OperationType.QUERY
+        for d in document.definitions
+        if isinstance(d, OperationDefinitionNode)
+    )
+
+def _to_utc(instant: Any) -> datetime:
+    """The SDK parses epoch seconds into naive local datetimes, normalize to UTC."""
+    if isinstance(instant, datetime):
+        return dt_util.as_utc(instant.astimezone())
+    return dt_util.utc_from_timestamp(float(instant))
@@ -2,15 +2,128 @@
 from __future__ import annotations
 
 from asyncio import run_coroutine_threadsafe
-from typing import Any, cast
-from aiohttp import ClientSession
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import hashlib
+import importlib.util
+from time import perf_counter
+from typing import Any, Optional, cast
+import async_timeout
+from aiohttp import ClientError, ClientResponse, ClientSession, hdrs
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 import milasdk
+from milasdk.const import AUTH_HEADER
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import config_entry_oauth2_flow, aiohttp_client
 
-from .const import DOMAIN
+from .const import (
+    CONF_TIMEOUT,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    JSON_EXECUTOR_THRESHOLD,
+    RESPONSE_CACHE_SIZE,
+    THROTTLED_STATUSES,
+)
+from .scheduler import async_get_scheduler, parse_retry_after
+
+def _accept_encoding() -> str:
+    """aiohttp can only decode brotli when one of the brotli packages is installed."""
+    if any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi")):
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+ACCEPT_ENCODING = _accept_encoding()
+
+@dataclass
+class MilaTransferStats:
+    """
+    Counters for the API responses received.
+
+    `wire_bytes` only covers the responses whose size on the wire is known, a
+    compressed response sent without a Content-Length counts as `unmeasured`.
+    """
+    requests: int = 0
+    compressed: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    unmeasured: int = 0
+    unmeasured_bytes: int = 0
+    decode_seconds: float = 0.0
+    decoded_off_loop: int = 0
+    cacheable: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+
+    def copy(self) -> MilaTransferStats:
+        return MilaTransferStats(**asdict(self))
+
+    def since(self, other: MilaTransferStats) -> MilaTransferStats:
+        return MilaTransferStats(**{k: v - getattr(other, k) for k, v in asdict(self).items()})
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        if not self.cacheable:
+            return None
+        return round((self.not_modified + self.unchanged) / self.cacheable, 3)
+
+    @property
+    def wire_ratio(self) -> Optional[float]:
+        """Bytes on the wire per decoded byte, of the responses whose wire size is known."""
+        measured = self.decoded_bytes - self.unmeasured_bytes
+        if not measured:
+            return None
+        return round(self.wire_bytes / measured, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "cache_hit_rate": self.cache_hit_rate, "wire_ratio": self.wire_ratio}
+
+@dataclass
+class MilaCachedResponse:
+    """The validators, digest and decoded body of the last response to a query."""
+    json: Any
+    digest: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+class MilaResponse:
+    """
+    A fully read API response.
+
+    Mirrors the parts of `ClientResponse` used by the GraphQL transport, but decodes
+    the body with the fastest available JSON parser.
+    """
+    def __init__(self, response: ClientResponse, json: Any, body: bytes, from_cache: bool = False):
+        self._response = response
+        self._json = json
+        self._body = body
+        self.from_cache = from_cache
+        #a 304 is answered from the cache, present it like the original response
+        self.status = 200 if response.status == 304 else response.status
+        self.headers = response.headers
+
+    async def __aenter__(self) -> MilaResponse:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        return None
+
+    async def json(self, **kwargs) -> Any:
+        if self._json is None:
+            raise ValueError("Response is not JSON")
+        return self._json
+
+    async def text(self, **kwargs) -> str:
+        return self._body.decode(self._response.get_encoding(), errors="replace")
+
+    def raise_for_status(self) -> None:
+        if self._response.status != 304:
+            self._response.raise_for_status()
 
 class MilaConfigEntryAuth(milasdk.auth.AbstractAsyncSession):  # type: ignore[misc]
     """Provide Mila API authentication tied to an OAuth2 based config entry."""
@@ -25,6 +138,10 @@ class MilaConfigEntryAuth(milasdk.auth.AbstractAsyncSession):  # type: ignore[mi
         self.session = config_entry_oauth2_flow.OAuth2Session(
             hass, config_entry, implementation
         )
+        self.stats = MilaTransferStats()
+        self.scheduler = async_get_scheduler(hass)
+        self._timeout = config_entry.options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        self._cache: OrderedDict[str, MilaCachedResponse] = OrderedDict()
         super().__init__(aiohttp_client.async_get_clientsession(self.hass))
 
     async def async_get_access_token(self) -> str:
@@ -32,6 +149,109 @@ class MilaConfigEntryAuth(milasdk.auth.AbstractAsyncSession):  # type: ignore[mi
         await self.session.async_ensure_token_valid()
         return self.session.token["access_token"]  # type: ignore[no-any-return]
 
+    async def post(self, url: str, data: Any = None, **kwargs) -> MilaResponse:
+        """
+        Authenticated post that negotiates compression and decodes the JSON body.
+
+        Queries are cached: validators from the last response are sent along, and a
+        `304 Not Modified` or a body with the same digest reuses the decoded result.
+        Every request waits for the shared scheduler first, the timeout only starts
+        once it is sent.
+        """
+        try:
+            async with async_timeout.timeout(self._timeout):
+                access_token = await self.async_get_access_token()
+        except ClientError as err:
+            raise milasdk.MilaError(f"Access token failure: {err}") from err
+        headers = {
+            AUTH_HEADER: f"Bearer {access_token}",
+            hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING,
+        }
+
+        cache_key = self._cache_key(kwargs.get("json"))
+        cached = self._cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+
+        await self.scheduler.async_acquire()
+        async with async_timeout.timeout(self._timeout):
+            async with self._session.post(url, headers=headers, **kwargs) as resp:
+                body = await resp.read()
+
+        if resp.status in THROTTLED_STATUSES:
+            retry_after = parse_retry_after(resp.headers.get(hdrs.RETRY_AFTER))
+            if retry_after is not None:
+                self.scheduler.defer(retry_after)
+
+        self.stats.requests += 1
+        self.stats.decoded_bytes += len(body)
+        if not resp.headers.get(hdrs.CONTENT_ENCODING):
+            self.stats.wire_bytes += len(body)
+        else:
+            self.stats.compressed += 1
+            #the body is already decompressed, its size on the wire is only known from the header
+            if hdrs.CONTENT_LENGTH in resp.headers:
+                self.stats.wire_bytes += int(resp.headers[hdrs.CONTENT_LENGTH])
+            else:
+                self.stats.unmeasured += 1
+                self.stats.unmeasured_bytes += len(body)
+
+        if cache_key is None or resp.status not in (200, 304):
+            return MilaResponse(resp, await self._async_decode(body), body)
+
+        self.stats.cacheable += 1
+        if resp.status == 304 and cached is not None:
+            self.stats.not_modified += 1
+            self._cache.move_to_end(cache_key)
+            return MilaResponse(resp, cached.json, body, from_cache=True)
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if cached is not None and cached.digest == digest:
+            self.stats.unchanged += 1
+            self._cache.move_to_end(cache_key)
+            return MilaResponse(resp, cached.json, body, from_cache=True)
+
+        json = await self._async_decode(body)
+        if json is not None and "errors" not in json:
+            self._cache[cache_key] = MilaCachedResponse(
+                json,
+                digest,
+                resp.headers.get(hdrs.ETAG),
+                resp.headers.get(hdrs.LAST_MODIFIED)
+            )
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return MilaResponse(resp, json, body)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _cache_key(self, payload: Any) -> Optional[str]:
+        """Only queries are cached, mutations always go through."""
+        if not isinstance(payload, dict) or not isinstance(payload.get("query"), str):
+            return None
+        if payload["query"].lstrip().startswith(("mutation", "subscription")):
+            return None
+        key = repr((payload["query"], payload.get("variables")))
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    async def _async_decode(self, body: bytes) -> Optional[Any]:
+        """Decode a JSON body, off the event loop when it is large."""
+        start = perf_counter()
+        try:
+            if len(body) > JSON_EXECUTOR_THRESHOLD:
+                self.stats.decoded_off_loop += 1
+                return await self.hass.async_add_executor_job(json_loads, body)
+            return json_loads(body)
+        except ValueError:
+            return None
+        finally:
+            self.stats.decode_seconds += perf_counter() - start
+
 class MilaOauthImplementation(config_entry_oauth2_flow.AbstractOAuth2Implementation):
     """Mila implementation of AbstractOAuth2Implementation."""
     def __init__(
@@ -42,8 +262,7 @@ class MilaOauthImplementation(config_entry_oauth2_flow.AbstractOAuth2Implementat
         self.hass = hass
         self._username = config_entry.data["email"]
         self._password = config_entry.data["password"]
-        self._auth = milasdk.MilaOauth2(token=cast(dict, config_entry.data["token"]))
-        
+
     @property
     def name(self) -> str:
         return DOMAIN
@@ -59,13 +278,15 @@ class MilaOauthImplementation(config_entry_oauth2_flow.AbstractOAuth2Implementat
         return {} #can accept the user/password here and use oauth flow if needed
 
     async def _async_refresh_token(self, token: dict) -> dict:
-        try:
-            # try to just refresh the token
-            return await self._auth.async_refresh_token()
-        except Exception as ex:
+        #the OAuth client holds an HTTP session, only keep it open for the refresh
+        async with milasdk.MilaOauth2(token=cast(dict, token)) as auth:
             try:
-                # try the full auth request
-                return await self._auth.async_request_token(self._username, self._password)
-            except:
-                # raise the original exception
-                raise ex
+                # try to just refresh the token
+                return await auth.async_refresh_token()
+            except Exception as ex:
+                try:
+                    # try the full auth request
+                    return await auth.async_request_token(self._username, self._password)
+                except:
+                    # raise the original exception
+                    raise ex
@@ -6,23 +6,32 @@ from typing import Any, Mapping, Optional
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow, CONN_CLASS_CLOUD_POLL
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_EMAIL, CONF_PASSWORD
+from homeassistant.components import webhook
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_EMAIL, CONF_PASSWORD, CONF_WEBHOOK_ID
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import aiohttp_client
 from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import selector
 
 from milasdk import DefaultAsyncSession
 from milasdk.api import MilaApi
 from .const import (
+    CONF_METRICS,
+    CONF_PUSH,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    CONF_THRESHOLDS,
     CONF_TIMEOUT,
     CONF_TOKEN,
+    CONF_WEBHOOK,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_TIMEOUT,
     DOMAIN,
     VALUES_SCAN_INTERVAL,
     VALUES_TIMEOUT,
 )
+from .thresholds import DEFAULT_THRESHOLDS, format_thresholds, parse_thresholds
 
 CREDENTIALS_SCHEMA = vol.Schema(
     {
@@ -34,7 +43,15 @@ CREDENTIALS_SCHEMA = vol.Schema(
 OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.In(VALUES_SCAN_INTERVAL),
-        vol.Required(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): vol.In(VALUES_TIMEOUT)
+        vol.Required(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): vol.In(VALUES_TIMEOUT),
+        vol.Required(CONF_PUSH, default=False): cv.boolean,
+        vol.Required(CONF_WEBHOOK, default=False): cv.boolean,
+        vol.Required(CONF_METRICS, default=False): cv.boolean,
+        vol.Optional(CONF_QUIET_START): selector.TimeSelector(),
+        vol.Optional(CONF_QUIET_END): selector.TimeSelector(),
+        vol.Optional(CONF_THRESHOLDS, default=format_thresholds(DEFAULT_THRESHOLDS)): selector.TextSelector(
+            selector.TextSelectorConfig(multiline=True)
+        )
     }
 )
 
@@ -173,10 +190,25 @@ class MilaOptionsFlowHandler(OptionsFlow):
         self, user_input: Optional[dict[str, str]] = None
     ) -> FlowResult:
         """Manage the options."""
+        errors = {}
         if user_input is not None:
+            try:
+                parse_thresholds(user_input.get(CONF_THRESHOLDS))
+            except ValueError:
+                errors[CONF_THRESHOLDS] = "invalid_thresholds"
+        if user_input is not None and not errors:
+            if user_input.get(CONF_WEBHOOK):
+                #keep the webhook id (and url) stable across option changes
+                user_input[CONF_WEBHOOK_ID] = (
+                    self.entry.options.get(CONF_WEBHOOK_ID) or webhook.async_generate_id()
+                )
             return self.async_create_entry(title="", data=user_input)
 
+        #the defaults of the schema only apply to options that were never set
         return self.async_show_form(
             step_id="init",
-            data_schema=OPTIONS_SCHEMA
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, {**self.entry.options, **(user_input or {})}
+            ),
+            errors=errors
         )
\ No newline at end of file
@@ -1,4 +1,6 @@
 """Constants used by the Mila integration."""
+from datetime import timedelta
+
 DOMAIN = "mila"
 
 ATTRIBUTION = "Data provided by Mila"
@@ -7,13 +9,93 @@ MANUFACTURER = "Milacares"
 
 CONF_TOKEN = "token"
 CONF_TIMEOUT = "timeout"
+CONF_PUSH = "push"
+CONF_WEBHOOK = "webhook"
+CONF_QUIET_START = "quiet_start"
+CONF_QUIET_END = "quiet_end"
+CONF_METRICS = "metrics"
+CONF_THRESHOLDS = "thresholds"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ROOM = "room"
+ATTR_SENSOR_KIND = "sensor_kind"
+
+SERVICE_GET_SNAPSHOT = "get_snapshot"
 
 DATAKEY_ACCOUNT = "account"
 DATAKEY_APPLIANCE = "appliance"
 DATAKEY_LOCATION = "location"
+DATAKEY_HOUSEHOLD = "household"
+DATAKEY_STALE = "stale"
 
 VALUES_SCAN_INTERVAL = [30, 60, 120, 300, 600]
 VALUES_TIMEOUT = [10, 15, 30, 45, 60]
 
 DEFAULT_SCAN_INTERVAL = VALUES_SCAN_INTERVAL[2]
 DEFAULT_TIMEOUT = VALUES_TIMEOUT[2]
+
+TVOC_PPB_TO_UGM3 = 3.767
+
+# A data domain that keeps failing to update makes its entities unavailable after
+# this many update intervals, the account details never go stale
+DOMAIN_STALE_INTERVALS = {
+    DATAKEY_ACCOUNT: None,
+    DATAKEY_APPLIANCE: 3,
+    DATAKEY_LOCATION: 12,
+}
+
+# Accounts are polled in staggered slots, with a bounded number refreshing at once
+DATA_FLEET = f"{DOMAIN}_fleet"
+FLEET_MAX_CONCURRENT_REFRESHES = 4
+FLEET_THROUGHPUT_WINDOW = timedelta(minutes=10)
+
+# Station values shared by all locations and config entries
+DATA_STATIONS = f"{DOMAIN}_stations"
+
+# Poll interval while every room is at bedtime (or during quiet hours)
+SLEEP_SCAN_INTERVAL = timedelta(minutes=30)
+
+# Polls only ask for the sensor kinds of enabled entities, the other kinds an
+# appliance reports are listed this often
+SENSOR_KINDS_INTERVAL = timedelta(hours=1)
+
+# OpenMetrics page of the accounts with metrics enabled
+DATA_METRICS_VIEW = f"{DOMAIN}_metrics_view"
+METRICS_URL = "/api/mila/metrics"
+
+# Smart mode changes made within this many seconds are sent together
+SMART_MODE_BATCH_WINDOW = 0.5
+
+# Fired when a reading crosses one of the configured thresholds
+EVENT_THRESHOLD_CROSSED = f"{DOMAIN}_threshold_crossed"
+
+# API responses larger than this are decoded in the executor
+JSON_EXECUTOR_THRESHOLD = 256 * 1024
+
+# Number of query responses kept for conditional requests
+RESPONSE_CACHE_SIZE = 16
+
+# Responses that hold back every request for their Retry-After
+THROTTLED_STATUSES = (429, 503)
+
+# Request scheduler shared by all config entries (requests per second, burst size).
+# On top of the base rate every account reserves the rate it polls at (requests
+# per poll / scan interval), times the headroom for retries and refreshes
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+SCHEDULER_RATE = 0.5
+SCHEDULER_BURST = 5
+SCHEDULER_POLL_REQUESTS = 2
+SCHEDULER_HEADROOM = 2
+
+# Statistics backfill
+BACKFILL_CHUNK = timedelta(days=1)
+BACKFILL_MAX_AGE = timedelta(days=30)
+BACKFILL_INTERVAL = timedelta(hours=1)
+
+# Push updates
+PUSH_URL = "wss://api.milacares.com/graphql"
+PUSH_SWEEP_INTERVAL = 900
+PUSH_ACK_TIMEOUT = 10
+PUSH_HEARTBEAT = 30
+PUSH_RECONNECT_MIN = 5
+PUSH_RECONNECT_MAX = 300
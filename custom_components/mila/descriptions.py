@@ -0,0 +1,132 @@
+"""Declarative descriptions of the Mila entities."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+    CONCENTRATION_PARTS_PER_MILLION,
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfTemperature,
+)
+from milasdk import ApplianceSensorKind, SmartModeKind
+
+from .const import TVOC_PPB_TO_UGM3
+from .util import compile_path
+
+@dataclass(frozen=True)
+class MilaPathSensorDescription:
+    """A sensor that reads a (dotted) path of the device data."""
+    name: str
+    data_path: str
+    icon: Optional[str] = None
+    uom: Optional[str] = None
+    device_class: Optional[SensorDeviceClass] = None
+    state_class: Optional[SensorStateClass] = None
+    convert_function: Optional[Callable[[Any], Any]] = None
+    enabled_default: bool = True
+    #compiled from data_path and convert_function when the table is built
+    value_fn: Callable[[Any], Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        accessor = compile_path(self.data_path)
+        convert = self.convert_function
+        object.__setattr__(
+            self, "value_fn", accessor if convert is None else lambda document: convert(accessor(document))
+        )
+
+@dataclass(frozen=True)
+class MilaPublishFilter:
+    """
+    Deadband and minimum interval applied to a sensor before its state is written.
+
+    A change is published when it is larger than `absolute`, or than `relative`
+    times the last published value, and at least `min_interval` has passed.
+    Changes to or from an unknown value are always published.
+    """
+    absolute: float = 0.0
+    relative: float = 0.0
+    min_interval: timedelta = timedelta(0)
+
+    def should_publish(self, previous: Optional[float], value: Optional[float], elapsed: timedelta) -> bool:
+        if previous is None or value is None:
+            return previous != value
+        if elapsed < self.min_interval:
+            return False
+        deadband = max(self.absolute, self.relative * abs(previous))
+        return abs(value - previous) > deadband
+
+@dataclass(frozen=True)
+class MilaMeasurementSensorDescription:
+    """A sensor that reads the latest value of an appliance sensor kind."""
+    name: str
+    sensor_kind: ApplianceSensorKind
+    icon: Optional[str] = None
+    uom: Optional[str] = None
+    device_class: Optional[SensorDeviceClass] = None
+    uom_conversion_factor: Optional[float] = None
+    precision: Optional[int] = None
+    #in the units the sensor reports (after conversion)
+    publish_filter: Optional[MilaPublishFilter] = None
+
+@dataclass(frozen=True)
+class MilaSmartModeSwitchDescription:
+    """A switch that turns a smart mode of an appliance on or off."""
+    name: str
+    smartmode_kind: SmartModeKind
+    icon: Optional[str] = None
+
+APPLIANCE_PATH_SENSORS: tuple[MilaPathSensorDescription, ...] = (
+    MilaPathSensorDescription("Mode", "state.actualMode", icon="mdi:state-machine", convert_function=str),
+    MilaPathSensorDescription("Wifi Strength", "state.wifiRssi", device_class=SensorDeviceClass.SIGNAL_STRENGTH, uom=SIGNAL_STRENGTH_DECIBELS_MILLIWATT, icon="mdi:wifi", enabled_default=False),
+    #MilaPathSensorDescription("Filter Kind", "filter.kind", icon="mdi:hvac", convert_function=str),
+    #MilaPathSensorDescription("Filter Days Left", "filter.daysLeft", uom="days", icon="mdi:counter"),
+    #MilaPathSensorDescription("Filter Install Date", "filter.installedAt", device_class=SensorDeviceClass.DATE, icon="mdi:calendar-refresh"),
+    #MilaPathSensorDescription("Filter Calibrated Date", "filter.calibratedAt", device_class=SensorDeviceClass.DATE, icon="mdi:calendar"),
+)
+
+# created once per room, on its primary appliance
+ROOM_PATH_SENSORS: tuple[MilaPathSensorDescription, ...] = (
+    MilaPathSensorDescription("Bedtime Start", "room.bedtime.localStart", icon="mdi:calendar-start", enabled_default=False),
+    MilaPathSensorDescription("Bedtime End", "room.bedtime.localEnd", icon="mdi:calendar-end", enabled_default=False),
+)
+
+APPLIANCE_MEASUREMENT_SENSORS: tuple[MilaMeasurementSensorDescription, ...] = (
+    MilaMeasurementSensorDescription("Air Changes", ApplianceSensorKind.Ach, uom="cph", icon="mdi:cloud-refresh", precision=1, publish_filter=MilaPublishFilter(absolute=0.1)),
+    MilaMeasurementSensorDescription("Air Quality", ApplianceSensorKind.Aqi, device_class=SensorDeviceClass.AQI),
+    MilaMeasurementSensorDescription("CO", ApplianceSensorKind.Co, device_class=SensorDeviceClass.CO, uom=CONCENTRATION_PARTS_PER_MILLION),
+    MilaMeasurementSensorDescription("CO2", ApplianceSensorKind.Co2, device_class=SensorDeviceClass.CO2, uom=CONCENTRATION_PARTS_PER_MILLION, publish_filter=MilaPublishFilter(absolute=10, relative=0.02)),
+    MilaMeasurementSensorDescription("Fan Speed", ApplianceSensorKind.FanSpeed, uom="rpm", icon="mdi:fan", precision=1, publish_filter=MilaPublishFilter(absolute=20, min_interval=timedelta(minutes=1))),
+    MilaMeasurementSensorDescription("Humidity", ApplianceSensorKind.Humidity, device_class=SensorDeviceClass.HUMIDITY, uom=PERCENTAGE, precision=1, publish_filter=MilaPublishFilter(absolute=0.5, min_interval=timedelta(minutes=1))),
+    #MilaMeasurementSensorDescription("Pressure", ApplianceSensorKind.LoadingMg, device_class=SensorDeviceClass.PRESSURE, uom="Unknown"),
+    MilaMeasurementSensorDescription("PM1", ApplianceSensorKind.Pm1, device_class=SensorDeviceClass.PM1, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, publish_filter=MilaPublishFilter(absolute=1, relative=0.05)),
+    MilaMeasurementSensorDescription("PM10", ApplianceSensorKind.Pm10, device_class=SensorDeviceClass.PM10, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, publish_filter=MilaPublishFilter(absolute=1, relative=0.05)),
+    MilaMeasurementSensorDescription("PM2.5", ApplianceSensorKind.Pm2_5, device_class=SensorDeviceClass.PM25, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, publish_filter=MilaPublishFilter(absolute=1, relative=0.05)),
+    #MilaMeasurementSensorDescription("Max Pressure", ApplianceSensorKind.PressureMax, device_class=SensorDeviceClass.PRESSURE, uom="Unknown"),
+    MilaMeasurementSensorDescription("Time To Clean", ApplianceSensorKind.Ttc, device_class=SensorDeviceClass.DURATION, uom="min", icon="mdi:timer-sand"),
+    MilaMeasurementSensorDescription("VOC", ApplianceSensorKind.Voc, device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, uom_conversion_factor=TVOC_PPB_TO_UGM3, publish_filter=MilaPublishFilter(absolute=5, relative=0.05)),
+    MilaMeasurementSensorDescription("Temperature", ApplianceSensorKind.Temperature, uom=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, precision=1, publish_filter=MilaPublishFilter(absolute=0.1, min_interval=timedelta(minutes=1))),
+)
+
+APPLIANCE_SMART_MODE_SWITCHES: tuple[MilaSmartModeSwitchDescription, ...] = (
+    MilaSmartModeSwitchDescription("Quiet", SmartModeKind.Quiet, icon="mdi:ear-hearing-off"),
+    MilaSmartModeSwitchDescription("Quarantine", SmartModeKind.Quarantine, icon="mdi:virus"),
+    MilaSmartModeSwitchDescription("Child Lock", SmartModeKind.ChildLock, icon="mdi:lock"),
+    MilaSmartModeSwitchDescription("Housekeeper", SmartModeKind.Housekeeper, icon="mdi:broom"),
+    MilaSmartModeSwitchDescription("Power Saver", SmartModeKind.PowerSaver, icon="mdi:power"),
+    MilaSmartModeSwitchDescription("Sleep", SmartModeKind.Sleep, icon="mdi:sleep"),
+    MilaSmartModeSwitchDescription("Turndown", SmartModeKind.Turndown, icon="mdi:bed"),
+    MilaSmartModeSwitchDescription("Whitenoise", SmartModeKind.Whitenoise, icon="mdi:waveform"),
+)
+
+LOCATION_PATH_SENSORS: tuple[MilaPathSensorDescription, ...] = (
+    MilaPathSensorDescription("Station Name", "outdoorStation.name", icon="mdi:map-marker"),
+    MilaPathSensorDescription("Station Latitude", "outdoorStation.point.lat", icon="mdi:latitude", enabled_default=False),
+    MilaPathSensorDescription("Station Longitude", "outdoorStation.point.lon", icon="mdi:longitude", enabled_default=False),
+    MilaPathSensorDescription("Station PM2.5", "outdoorStation.sensor.latest.value", device_class=SensorDeviceClass.PM25, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, state_class=SensorStateClass.MEASUREMENT),
+    MilaPathSensorDescription("Pollen Station Name", "pollenStation.name", icon="mdi:map-marker"),
+)
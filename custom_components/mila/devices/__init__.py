@@ -1,3 +1,4 @@
 from .device import MilaDevice
 from .appliance import MilaAppliance
-from .location import MilaLocation
\ No newline at end of file
+from .location import MilaLocation
+from .household import MilaHousehold
\ No newline at end of file
@@ -2,24 +2,19 @@
 
 import logging
 from typing import List, Optional
-from benedict import benedict
-from homeassistant.const import (
-    UnitOfTemperature,
-    UnitOfLength,
-    PERCENTAGE,
-    CONCENTRATION_PARTS_PER_MILLION,
-    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-    SIGNAL_STRENGTH_DECIBELS_MILLIWATT
-)
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorStateClass
-)
 from milasdk import MilaApi, ApplianceSensorKind, SmartModeKind, SoundsConfig
 
+from ..const import DATAKEY_APPLIANCE
+from ..descriptions import (
+    APPLIANCE_MEASUREMENT_SENSORS,
+    APPLIANCE_PATH_SENSORS,
+    APPLIANCE_SMART_MODE_SWITCHES,
+    ROOM_PATH_SENSORS,
+)
 from ..util import camel_case_split, coalesce
+from ..scheduler import RequestPriority, request_priority
 from .device import MilaDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,99 +23,115 @@ class MilaAppliance(MilaDevice):
     """
     API class to represent a single appliance.
     """    
+    data_domain = DATAKEY_APPLIANCE
+
     def __init__(self, coordinator: DataUpdateCoordinator, api: MilaApi, device_id: str):
         super().__init__(coordinator, api, device_id)
 
     @property
     def name(self) -> str:
-        room_kind = ' '.join(camel_case_split(str(self._device_data['room.kind'])))
+        room_kind = ' '.join(camel_case_split(str(self.get_value('room.kind'))))
         return coalesce(
-            self._device_data['name'] or None,
-            self._device_data['room.name'] or None,
+            self.get_value('name') or None,
+            self.get_value('room.name') or None,
             room_kind
         )
 
     @property
     def room_id(self) -> str:
-        return self._device_data['room.id']
+        return self.get_value('room.id')
 
     @property
-    def available(self) -> bool:
-        return self._device_data['state.actualMode'] is not None
+    def is_room_primary(self) -> bool:
+        """True if this appliance carries the entities of its room."""
+        return self._coordinator.is_room_primary(self.id)
 
     @property
-    def _device_data(self) -> benedict:
-        return self._appliance_data[self.id]
+    def reported_sensor_kinds(self) -> set[ApplianceSensorKind]:
+        return self._coordinator.appliance_sensor_kinds.get(self.id, set())
+
+    @property
+    def available(self) -> bool:
+        return self.get_value('state.actualMode') is not None
 
     async def set_smart_mode(self, mode: SmartModeKind, is_enabled: bool):
-        await self._api.set_smart_mode(self.id, mode, is_enabled)
-        await self._coordinator.async_request_refresh()
+        #batched with the other changes made at the same time
+        await self._coordinator.smart_modes.async_set(self.id, mode, is_enabled)
 
     async def set_sound_mode(self, mode: SoundsConfig):
-        await self._api.set_sound_mode(self.id, mode)
+        with request_priority(RequestPriority.COMMAND):
+            await self._api.set_sound_mode(self.id, mode)
         await self._coordinator.async_request_refresh()
 
     async def set_fan_mode(self, mode: str):
-        if mode == "Automagic":
-            await self._api.set_automagic_mode(self.room_id)
-        else:
-            await self._api.set_manual_mode(self.room_id, 10)
+        room_id = self.room_id
+        with request_priority(RequestPriority.COMMAND):
+            if mode == "Automagic":
+                await self._coordinator.async_room_command(
+                    room_id, ("automagic",), lambda: self._api.set_automagic_mode(room_id)
+                )
+            else:
+                await self._coordinator.async_room_command(
+                    room_id, ("manual", 10), lambda: self._api.set_manual_mode(room_id, 10)
+                )
         await self._coordinator.async_request_refresh()
 
     async def set_fan_speed(self, percentage: Optional[int]):
-        await self._api.set_manual_mode(self.room_id, percentage)
-        await self._api.force_room_data(self.room_id)
+        room_id = self.room_id
+        with request_priority(RequestPriority.COMMAND):
+            await self._coordinator.async_room_command(
+                room_id, ("manual", percentage), lambda: self._set_room_speed(room_id, percentage)
+            )
         await self._coordinator.async_request_refresh()
 
+    async def _set_room_speed(self, room_id: str, percentage: Optional[int]):
+        await self._api.set_manual_mode(room_id, percentage)
+        await self._api.force_room_data(room_id)
+
     def _get_all_entities(self) -> List[Entity]:
         #deal with circular imports by bringing in the sensors here
         from ..entities import (
             MilaAppliancePathSensor, 
             MilaApplianceMeasurementSensor, 
-            #MilaSmartModeSwitch,
+            MilaSmartModeSwitch,
             MilaApplianceFan,
-            MilaSoundModeSelect,
-            TVOC_PPB_TO_UGM3
         )
         entities = [
-            MilaAppliancePathSensor(self, "Mode", "state.actualMode", icon="mdi:state-machine", convert_function=lambda v: str(v)),
-            MilaAppliancePathSensor(self, "Wifi Strength", "state.wifiRssi", device_class=SensorDeviceClass.SIGNAL_STRENGTH, uom=SIGNAL_STRENGTH_DECIBELS_MILLIWATT, icon="mdi:wifi"),
-            #MilaAppliancePathSensor(self, "Filter Kind", "filter.kind", icon="mdi:hvac", convert_function=lambda v: str(v)),
-            #MilaAppliancePathSensor(self, "Filter Days Left", "filter.daysLeft", uom="days", icon="mdi:counter"),
-            #MilaAppliancePathSensor(self, "Filter Install Date", "filter.installedAt", device_class=SensorDeviceClass.DATE, icon="mdi:calendar-refresh"),
-            #MilaAppliancePathSensor(self, "Filter Calibrated Date", "filter.calibratedAt", device_class=SensorDeviceClass.DATE, icon="mdi:calendar"),
-            MilaAppliancePathSensor(self, "Bedtime Start", "room.bedtime.localStart", icon="mdi:calendar-start"),
-            MilaAppliancePathSensor(self, "Bedtime End", "room.bedtime.localEnd", icon="mdi:calendar-end"),
-            
-            MilaApplianceMeasurementSensor(self, "Air Changes", ApplianceSensorKind.Ach, uom = "cph", icon="mdi:cloud-refresh", precision=1),
-            MilaApplianceMeasurementSensor(self, "Air Quality", ApplianceSensorKind.Aqi, device_class=SensorDeviceClass.AQI),
-            MilaApplianceMeasurementSensor(self, "CO", ApplianceSensorKind.Co, device_class=SensorDeviceClass.CO, uom=CONCENTRATION_PARTS_PER_MILLION),
-            MilaApplianceMeasurementSensor(self, "CO2", ApplianceSensorKind.Co2, device_class=SensorDeviceClass.CO2, uom=CONCENTRATION_PARTS_PER_MILLION),
-            MilaApplianceMeasurementSensor(self, "Fan Speed", ApplianceSensorKind.FanSpeed, uom = "rpm", icon="mdi:fan", precision=1),
-            MilaApplianceMeasurementSensor(self, "Humidity", ApplianceSensorKind.Humidity, device_class=SensorDeviceClass.HUMIDITY, uom=PERCENTAGE, precision=1),
-            #MilaApplianceMeasurementSensor(self, "Pressure", ApplianceSensorKind.LoadingMg, device_class=SensorDeviceClass.PRESSURE, uom="Unknown"),
-            MilaApplianceMeasurementSensor(self, "PM1", ApplianceSensorKind.Pm1, device_class=SensorDeviceClass.PM1, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER),
-            MilaApplianceMeasurementSensor(self, "PM10", ApplianceSensorKind.Pm10, device_class=SensorDeviceClass.PM10, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER),
-            MilaApplianceMeasurementSensor(self, "PM2.5", ApplianceSensorKind.Pm2_5, device_class=SensorDeviceClass.PM25, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER),
-            #MilaApplianceMeasurementSensor(self, "Max Pressure", ApplianceSensorKind.PressureMax, device_class=SensorDeviceClass.PRESSURE, uom="Unknown"),
-            MilaApplianceMeasurementSensor(self, "Time To Clean", ApplianceSensorKind.Ttc, device_class=SensorDeviceClass.DURATION, uom = "min", icon="mdi:timer-sand"),
-            MilaApplianceMeasurementSensor(self, "VOC", ApplianceSensorKind.Voc, device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS, uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, uom_conversion_factor=TVOC_PPB_TO_UGM3),
-            MilaApplianceMeasurementSensor(self, "Temperature", ApplianceSensorKind.Temperature, uom=UnitOfTemperature.CELSIUS, device_class=SensorDeviceClass.TEMPERATURE, precision=1),
-
-            #MilaSmartModeSwitch(self, SmartModeKind.Quiet, SmartModeKind.Quiet, "mdi:ear-hearing-off"),
-            #MilaSmartModeSwitch(self, SmartModeKind.Quarantine, SmartModeKind.Quarantine, "mdi:virus"),
-            #MilaSmartModeSwitch(self, "Child Lock", SmartModeKind.ChildLock, "mdi:lock"),
-            #MilaSmartModeSwitch(self, SmartModeKind.Housekeeper, SmartModeKind.Housekeeper, "mdi:broom"),
-            #MilaSmartModeSwitch(self, "Power Saver", SmartModeKind.PowerSaver, "mdi:power"),
-            #MilaSmartModeSwitch(self, SmartModeKind.Sleep, SmartModeKind.Sleep, "mdi:sleep"),
-            #MilaSmartModeSwitch(self, SmartModeKind.Turndown, SmartModeKind.Turndown, "mdi:bed"),
-            #MilaSmartModeSwitch(self, SmartModeKind.Whitenoise, SmartModeKind.Whitenoise, "mdi:waveform"),
-
+            *(MilaAppliancePathSensor(self, d) for d in APPLIANCE_PATH_SENSORS),
+            #only the sensors the hardware reports
+            *(
+                MilaApplianceMeasurementSensor(self, d)
+                for d in APPLIANCE_MEASUREMENT_SENSORS
+                if d.sensor_kind in self.reported_sensor_kinds
+            ),
+            *(MilaSmartModeSwitch(self, d) for d in APPLIANCE_SMART_MODE_SWITCHES),
             MilaApplianceFan(self),
-            MilaSoundModeSelect(self)
         ]
 
+        #room level entities are created once per room
+        if self.is_room_primary:
+            entities += self._room_entities()
+
         return entities
 
+    def _room_entities(self) -> List[Entity]:
+        from ..entities import MilaAppliancePathSensor, MilaSoundModeSelect
+        return [
+            *(MilaAppliancePathSensor(self, d) for d in ROOM_PATH_SENSORS),
+            MilaSoundModeSelect(self)
+        ]
+
+    def excluded_unique_ids(self) -> set[str]:
+        from ..entities import measurement_unique_id
+        excluded = {
+            measurement_unique_id(self.id, d.sensor_kind)
+            for d in APPLIANCE_MEASUREMENT_SENSORS
+            if d.sensor_kind not in self.reported_sensor_kinds
+        }
+        #another appliance of the room carries them
+        if not self.is_room_primary:
+            excluded.update(e.unique_id for e in self._room_entities())
+        return excluded
+
     def _get_software_version(self) -> str:
-        return self._device_data["state.firmware.version"]
+        return self.get_value("state.firmware.version")
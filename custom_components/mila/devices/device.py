@@ -1,13 +1,13 @@
 """Milacares API"""
 
-from benedict import benedict
-from typing import List
+from typing import Any, List, Optional
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import Entity, DeviceInfo
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CALLBACK_TYPE
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from milasdk import MilaApi
 
-from ..const import DATAKEY_ACCOUNT, DATAKEY_APPLIANCE, DATAKEY_LOCATION, DOMAIN, MANUFACTURER
+from ..const import DOMAIN, MANUFACTURER
+from ..util import compile_path
 
 class MilaDevice():
     """
@@ -15,12 +15,17 @@ class MilaDevice():
 
     Since a physical device can have many entities, we'll pool common elements here
     """    
+    #the coordinator data the device is read from
+    data_domain: Optional[str] = None
+    model = "Mila Air Purifier"
+
     def __init__(self, coordinator: DataUpdateCoordinator, api: MilaApi, device_id: str):
         self._id = device_id
         self._hass = coordinator.hass
         self._coordinator = coordinator
         self._api = api
         self._entities = {}
+        self._platform_entities: dict[str, list[Entity]] = {}
         self._build_entities_list()
 
     @property
@@ -40,6 +45,11 @@ class MilaDevice():
         """Return True if device is available."""
         return True
 
+    @property
+    def stale(self) -> bool:
+        """True if the data of this device has not been updated for too long."""
+        return self._coordinator.is_domain_stale(self.data_domain)
+
     @property
     def name_or_id(self) -> str:
         return self.name if self.name is not None else self.id
@@ -48,13 +58,17 @@ class MilaDevice():
     def entities(self) -> list[Entity]:
         return list(self._entities.values())
 
+    def entities_for(self, platform: str) -> list[Entity]:
+        """The entities of one platform, bucketed when they were built."""
+        return list(self._platform_entities.get(platform, ()))
+
     @property
     def device_info(self) -> DeviceInfo:
         """
         Return device specific attributes.
         """
         name = self.name
-        model = "Mila Air Purifier"
+        model = self.model
         sw_version = self._get_software_version()
 
         return DeviceInfo(
@@ -66,28 +80,25 @@ class MilaDevice():
         )
 
     @property
-    def _appliance_data(self) -> benedict:
-        return benedict(self._coordinator.data.get(DATAKEY_APPLIANCE,{}))
-
-    @property
-    def _account_data(self) -> benedict:
-        return benedict(self._coordinator.data.get(DATAKEY_ACCOUNT,{}))
-
-    @property
-    def _location_data(self) -> benedict:
-        return benedict(self._coordinator.data.get(DATAKEY_LOCATION,{}))
-
-    @property
-    def _device_data(self) -> benedict:
-        raise NotImplementedError
+    def document(self) -> dict[str, Any]:
+        """The raw data of the device, as stored by the coordinator."""
+        return self._coordinator.data[self.data_domain][self.id]
 
     def get_value(self, data_path: str):
-        return self._device_data[data_path]
+        return compile_path(data_path)(self.document)
+
+    def update_entities(self) -> list[Entity]:
+        """Add any entities that are not built yet and return them."""
+        return self._build_entities_list()
 
-    def add_update_listener(self, callback: CALLBACK_TYPE):
-        self._coordinator.async_add_listener(callback)
+    def remove_excluded_entities(self) -> list[Entity]:
+        """Drop the built entities this device no longer carries and return them."""
+        removed = [self._entities.pop(id) for id in self.excluded_unique_ids() & self._entities.keys()]
+        for entity in removed:
+            self._platform_entities[entity.platform_domain].remove(entity)
+        return removed
 
-    def _build_entities_list(self) -> dict[str, Entity]:
+    def _build_entities_list(self) -> list[Entity]:
         """Build the entities list, adding anything new."""
         from ..entities import MilaEntity
         entities = [
@@ -95,9 +106,20 @@ class MilaDevice():
             if isinstance(e, MilaEntity)
         ]
 
+        added = []
         for entity in entities:
             if entity.unique_id not in self._entities:
-                self._entities[entity.unique_id] = entity        
+                self._entities[entity.unique_id] = entity
+                self._platform_entities.setdefault(entity.platform_domain, []).append(entity)
+                added.append(entity)
+        return added
+
+    def excluded_unique_ids(self) -> set[str]:
+        """
+        Unique ids of entities this device does not carry, e.g. because the hardware
+        does not report them.
+        """
+        return set()
 
     def _get_all_entities(self) -> List[Entity]:
         return []
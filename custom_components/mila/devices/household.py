@@ -0,0 +1,73 @@
+"""Milacares API"""
+
+import logging
+from typing import List
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from milasdk import MilaApi
+
+from ..const import DATAKEY_APPLIANCE, DATAKEY_HOUSEHOLD
+from ..descriptions import APPLIANCE_MEASUREMENT_SENSORS
+from .device import MilaDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+class MilaHousehold(MilaDevice):
+    """
+    The appliances of an account as a whole, carries the aggregate sensors.
+    """
+    data_domain = DATAKEY_HOUSEHOLD
+    model = "Mila Household"
+
+    def __init__(self, coordinator: DataUpdateCoordinator, api: MilaApi, device_id: str):
+        super().__init__(coordinator, api, device_id)
+
+    @property
+    def name(self) -> str:
+        return "Mila Household"
+
+    @property
+    def stale(self) -> bool:
+        #aggregates are only as fresh as the appliance data
+        return self._coordinator.is_domain_stale(DATAKEY_APPLIANCE)
+
+    @property
+    def reported_sensor_kinds(self) -> set:
+        """The sensor kinds reported by any appliance."""
+        return set().union(*self._coordinator.appliance_sensor_kinds.values())
+
+    @property
+    def aggregated_sensor_kinds(self) -> set:
+        """The reported sensor kinds that have aggregates."""
+        from ..entities import AGGREGATE_SENSOR_KINDS
+        return self.reported_sensor_kinds & AGGREGATE_SENSOR_KINDS
+
+    @property
+    def _groups(self) -> list[str]:
+        from ..entities import AGGREGATE_ALL
+        return [AGGREGATE_ALL, *sorted(set(self._coordinator.room_kinds.values()))]
+
+    def excluded_unique_ids(self) -> set[str]:
+        from ..entities import AGGREGATE_STATS, aggregate_unique_id
+        aggregated = self.aggregated_sensor_kinds
+        return {
+            aggregate_unique_id(self.id, group, d.sensor_kind, stat)
+            for group in self._groups
+            for d in APPLIANCE_MEASUREMENT_SENSORS
+            if d.sensor_kind not in aggregated
+            for stat in AGGREGATE_STATS
+        }
+
+    def _get_all_entities(self) -> List[Entity]:
+        # deal with circular imports by bringing in the sensors here
+        from ..entities import AGGREGATE_STATS, MilaHouseholdAggregateSensor
+
+        aggregated = self.aggregated_sensor_kinds
+        return [
+            MilaHouseholdAggregateSensor(self, group, description, stat)
+            for group in self._groups
+            for description in APPLIANCE_MEASUREMENT_SENSORS
+            if description.sensor_kind in aggregated
+            for stat in AGGREGATE_STATS
+        ]
@@ -2,14 +2,14 @@
 
 import logging
 from typing import List
-from benedict import benedict
-from homeassistant.const import CONCENTRATION_MICROGRAMS_PER_CUBIC_METER
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass
 
 from milasdk import MilaApi
 
+from ..const import DATAKEY_LOCATION
+from ..descriptions import LOCATION_PATH_SENSORS
 from ..util import camel_case_split, coalesce
 from .device import MilaDevice
 
@@ -20,6 +20,8 @@ class MilaLocation(MilaDevice):
     """
     API class to represent a location.
     """
+    data_domain = DATAKEY_LOCATION
+
 
     def __init__(
         self, coordinator: DataUpdateCoordinator, api: MilaApi, device_id: str
@@ -28,13 +30,9 @@ class MilaLocation(MilaDevice):
 
     @property
     def name(self) -> str:
-        return f"{self._device_data['address.city']}, \
-            {self._device_data['address.country']} \
-            (#{self._device_data['id']})"
-
-    @property
-    def _device_data(self) -> benedict:
-        return self._location_data[self.id]
+        return f"{self.get_value('address.city')}, \
+            {self.get_value('address.country')} \
+            (#{self.get_value('id')})"
 
     def _get_all_entities(self) -> List[Entity]:
         # deal with circular imports by bringing in the sensors here
@@ -42,65 +40,28 @@ class MilaLocation(MilaDevice):
             MilaLocationAqiSensor,
             MilaLocationPathSensor,
             MilaLocationDistanceSensor,
-            to_pollen_index,
+            MilaLocationPollenSensor,
         )
 
         entities = [
-            MilaLocationPathSensor(
-                self, "Station Name", "outdoorStation.name", icon="mdi:map-marker"
-            ),
-            MilaLocationPathSensor(
-                self,
-                "Station Latitude",
-                "outdoorStation.point.lat",
-                icon="mdi:latitude",
-            ),
-            MilaLocationPathSensor(
-                self,
-                "Station Longitude",
-                "outdoorStation.point.lon",
-                icon="mdi:longitude",
-            ),
-            MilaLocationPathSensor(
-                self,
-                "Station PM2.5",
-                "outdoorStation.sensor.latest.value",
-                device_class=SensorDeviceClass.PM25,
-                uom=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-                state_class=SensorStateClass.MEASUREMENT,
-            ),
-            MilaLocationPathSensor(
-                self, "Pollen Station Name", "pollenStation.name", icon="mdi:map-marker"
-            ),
-            MilaLocationPathSensor(
+            *(MilaLocationPathSensor(self, d) for d in LOCATION_PATH_SENSORS),
+            MilaLocationPollenSensor(
                 self,
                 "Pollen Reported Date",
-                "pollenStation.aggregateWindow[-1].date",
+                "date",
                 device_class=SensorDeviceClass.DATE,
             ),
-            MilaLocationPathSensor(
-                self,
-                "Pollen Status - Trees",
-                "pollenStation.aggregateWindow[-1].status.trees",
-                icon="mdi:tree",
+            MilaLocationPollenSensor(
+                self, "Pollen Status - Trees", "trees", icon="mdi:tree"
             ),
-            MilaLocationPathSensor(
-                self,
-                "Pollen Status - Weeds",
-                "pollenStation.aggregateWindow[-1].status.weeds",
-                icon="mdi:flower",
+            MilaLocationPollenSensor(
+                self, "Pollen Status - Weeds", "weeds", icon="mdi:flower"
             ),
-            MilaLocationPathSensor(
-                self,
-                "Pollen Status - Grass",
-                "pollenStation.aggregateWindow[-1].status.grass",
-                icon="mdi:grass",
+            MilaLocationPollenSensor(
+                self, "Pollen Status - Grass", "grass", icon="mdi:grass"
             ),
-            MilaLocationPathSensor(
-                self,
-                "Pollen Status - Mold",
-                "pollenStation.aggregateWindow[-1].status.mold",
-                icon="mdi:mushroom",
+            MilaLocationPollenSensor(
+                self, "Pollen Status - Mold", "mold", icon="mdi:mushroom"
             ),
             MilaLocationAqiSensor(self),
             MilaLocationDistanceSensor(self),
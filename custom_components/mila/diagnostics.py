@@ -0,0 +1,47 @@
+"""Diagnostics support for Mila."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_TOKEN, DOMAIN
+from .update_coordinator import MilaUpdateCoordinator
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, CONF_TOKEN, "lat", "lon", "firstName", "lastName"}
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: MilaUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "devices": {id: type(device).__name__ for id, device in coordinator.devices.items()},
+        "enabled_entities": sorted(coordinator.enabled_entities),
+        "transfer": {
+            "total": coordinator.transfer_stats.as_dict(),
+            "last_refresh": coordinator.last_refresh_transfer.as_dict(),
+        },
+        "scheduler": coordinator.scheduler.as_dict(),
+        "fleet": coordinator.fleet.as_dict(),
+        "stations": coordinator.stations.as_dict(),
+        "suppressed_writes": dict(coordinator.suppressed_writes),
+        "poll_plan": {
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            **(coordinator.poll_plan.as_dict() if coordinator.poll_plan else {}),
+        },
+        "domains": {
+            key: {
+                "last_success": last_success.isoformat(),
+                "stale": coordinator.is_domain_stale(key),
+                "last_error": coordinator.domain_errors.get(key),
+            }
+            for key, last_success in coordinator.last_success.items()
+        },
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+    }
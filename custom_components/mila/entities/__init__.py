@@ -1,3 +1,4 @@
 from .common import *
 from .appliance import *
-from .location import *
\ No newline at end of file
+from .location import *
+from .household import *
\ No newline at end of file
@@ -1,8 +1,8 @@
 from .sensor import MilaApplianceSensor
 from .path_sensor import MilaAppliancePathSensor
-from .measurement_sensor import MilaApplianceMeasurementSensor
-#from .smart_mode_switch import MilaSmartModeSwitch
-from .fan import MilaApplianceFan
+from .measurement_sensor import MilaApplianceMeasurementSensor, measurement_unique_id
+from .smart_mode_switch import MilaSmartModeSwitch
+from .fan import MilaApplianceFan, rpm_to_percentage
 from .sound_mode_select import MilaSoundModeSelect
 
 from .const import (
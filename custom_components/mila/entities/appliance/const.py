@@ -8,4 +8,4 @@ PRESET_MODES = [
     PRESET_MODE_MANUAL,
 ]
 
-TVOC_PPB_TO_UGM3 = 3.767
\ No newline at end of file
+from ...const import TVOC_PPB_TO_UGM3
\ No newline at end of file
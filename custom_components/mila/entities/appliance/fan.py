@@ -1,7 +1,7 @@
 """Support for MilaAir Purifier."""
 import asyncio
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from homeassistant.components.fan import (
     FanEntityFeature
@@ -18,6 +18,7 @@ _LOGGER = logging.getLogger(__name__)
 
 from ...const import DOMAIN
 from ...devices import MilaAppliance
+from ...util import coalesce
 from ..common import MilaFan
 from .const import (
     MIN_FAN_RPM, 
@@ -27,6 +28,10 @@ from .const import (
     PRESET_MODES
 )
 
+def rpm_to_percentage(speed: float) -> int:
+    """The fan speed as a percentage, in steps of 10."""
+    return round(ranged_value_to_percentage([MIN_FAN_RPM, MAX_FAN_RPM], speed),-1)
+
 class MilaApplianceFan(MilaFan):
     """Representation of the Mila Fan"""
     def __init__(
@@ -44,8 +49,6 @@ class MilaApplianceFan(MilaFan):
         self._speed_count = 10
         self._percentage_override: Optional[float] = None
 
-        self.device.add_update_listener(self._update_listener)
-
     @property
     def unique_id(self) -> str:
         return f"{DOMAIN}_{self.device.id}_fan".lower()
@@ -54,6 +57,14 @@ class MilaApplianceFan(MilaFan):
     def device(self) -> MilaAppliance:
         return self._device
 
+    @property
+    def data_paths(self) -> Tuple[str, ...]:
+        return ("sensors", "state.actualMode")
+
+    @property
+    def sensor_kinds(self) -> Tuple[str, ...]:
+        return (ApplianceSensorKind.FanSpeed,)
+
     @property
     def speed(self) -> float:
         sensors: List = self.device.get_value("sensors")
@@ -64,10 +75,13 @@ class MilaApplianceFan(MilaFan):
     def current_mode(self) -> ApplianceMode:
         return self.device.get_value("state.actualMode")
 
+    _state_attrs = MilaFan._state_attrs + ("_attr_is_on", "_attr_percentage", "_attr_preset_mode")
+
     @property
     def is_on(self):
         """Return true if the entity is on."""
-        return self.speed is not None and self.speed > 0
+        self._ensure_state()
+        return self._attr_is_on
 
     @property
     def supported_features(self):
@@ -82,13 +96,8 @@ class MilaApplianceFan(MilaFan):
     @property
     def percentage(self):
         """Return the percentage based speed of the fan."""
-        if self.speed is None:
-            return None
-        #it can take a little time to update the speed, override until we get the
-        #next update    
-        if self._percentage_override is not None:
-            return self._percentage_override
-        return round(ranged_value_to_percentage([MIN_FAN_RPM, MAX_FAN_RPM], self.speed),-1)
+        self._ensure_state()
+        return self._attr_percentage
 
     @property
     def speed_count(self):
@@ -98,7 +107,24 @@ class MilaApplianceFan(MilaFan):
     @property
     def preset_mode(self):
         """Get the active preset mode."""
-        return PRESET_MODE_MANUAL if self.current_mode == ApplianceMode.Manual else PRESET_MODE_AUTOMAGIC
+        self._ensure_state()
+        return self._attr_preset_mode
+
+    def _update_state(self) -> None:
+        super()._update_state()
+        speed = self.speed
+        self._attr_is_on = speed is not None and speed > 0
+        self._attr_preset_mode = PRESET_MODE_MANUAL if self.current_mode == ApplianceMode.Manual else PRESET_MODE_AUTOMAGIC
+
+        if speed is None:
+            self._attr_percentage = None
+            return
+        percentage = rpm_to_percentage(speed)
+        #it can take a little time to update the speed, override until the reported
+        #speed catches up
+        if self._percentage_override is not None and abs(percentage - self._percentage_override) < 10:
+            self._percentage_override = None
+        self._attr_percentage = coalesce(self._percentage_override, percentage)
 
     async def async_turn_on(
         self,
@@ -128,6 +154,8 @@ class MilaApplianceFan(MilaFan):
         await self.device.set_fan_speed(percentage)
         await asyncio.sleep(1)
         self._percentage_override = percentage
+        self._update_state()
+        self.async_write_ha_state()
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
@@ -140,9 +168,5 @@ class MilaApplianceFan(MilaFan):
                 
         if preset_mode == PRESET_MODE_AUTOMAGIC:
             self._percentage_override = None
-
-    def _update_listener(self) -> None:
-        if self._percentage_override is None:
-            return
-        elif abs(self.percentage - self._percentage_override) < 10:
-            self._percentage_override = None
+            self._update_state()
+            self.async_write_ha_state()
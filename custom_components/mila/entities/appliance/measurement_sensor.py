@@ -1,37 +1,106 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 from milasdk import ApplianceSensorKind
 
 from ...const import DOMAIN
+from ...descriptions import MilaMeasurementSensorDescription
 from ...devices import MilaAppliance
 from .sensor import MilaApplianceSensor
 
+def measurement_unique_id(device_id: str, sensor_kind: ApplianceSensorKind) -> str:
+    return f"{DOMAIN}_{device_id}_sensor_{sensor_kind}".lower()
+
 class MilaApplianceMeasurementSensor(MilaApplianceSensor):
     def __init__(
         self, 
         device: MilaAppliance, 
-        name: str,
-        sensor_kind: ApplianceSensorKind,
-        icon: Optional[str] = None, 
-        uom: Optional[str] = None,
-        device_class: Optional[SensorDeviceClass] = None,
-        uom_conversion_factor: Optional[float] = None,
-        precision: Optional[int] = None
+        description: MilaMeasurementSensorDescription
     ):
-        super().__init__(device, name, icon, uom, device_class, SensorStateClass.MEASUREMENT)
-        self._sensor_kind = sensor_kind
-        self._uom_conversion_factor = uom_conversion_factor
-        self._attr_suggested_display_precision = precision
+        super().__init__(
+            device,
+            description.name,
+            description.icon,
+            description.uom,
+            description.device_class,
+            SensorStateClass.MEASUREMENT
+        )
+        self._sensor_kind = description.sensor_kind
+        self._uom_conversion_factor = description.uom_conversion_factor
+        self._attr_suggested_display_precision = description.precision
+        self._publish_filter = description.publish_filter
+        self._published_at: Optional[datetime] = None
+        self._cancel_flush: Optional[CALLBACK_TYPE] = None
 
     @property
     def unique_id(self) -> str:
-        return f"{DOMAIN}_{self.device.id}_sensor_{self._sensor_kind}".lower()  
+        return measurement_unique_id(self.device.id, self._sensor_kind)
+
+    @property
+    def sensor_kind(self) -> ApplianceSensorKind:
+        return self._sensor_kind
+
+    @property
+    def data_paths(self) -> Tuple[str, ...]:
+        return ("sensors",)
+
+    @property
+    def sensor_kinds(self) -> Tuple[str, ...]:
+        return (self._sensor_kind,)
 
     @property
-    def native_value(self):
+    def sensor_name(self) -> str:
+        return self._name
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._async_cancel_flush()
+
+    def _compute_native_value(self):
+        """Move the state only when the reading moved past the deadband of the sensor."""
+        value = self._current_value()
+        publish_filter = self._publish_filter
+        if self._published_at is not None and publish_filter is not None and value != self._attr_native_value:
+            elapsed = dt_util.utcnow() - self._published_at
+            if not publish_filter.should_publish(self._attr_native_value, value, elapsed):
+                self.coordinator.suppressed_writes[self._sensor_kind] += 1
+                #a change only held back by the interval is written once it passed
+                if (
+                    self.hass is not None
+                    and self._cancel_flush is None
+                    and publish_filter.should_publish(self._attr_native_value, value, publish_filter.min_interval)
+                ):
+                    self._cancel_flush = async_call_later(
+                        self.hass, publish_filter.min_interval - elapsed, self._async_flush
+                    )
+                return self._attr_native_value
+        if self._published_at is None or value != self._attr_native_value:
+            self._published_at = dt_util.utcnow()
+            self._async_cancel_flush()
+        return value
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        self._cancel_flush = None
+        self._handle_coordinator_update()
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+    def _current_value(self) -> Optional[float]:
         sensors: List = self.device.get_value("sensors")
         sensor = next((i for i in sensors if i["kind"] == self._sensor_kind), None)
         if sensor:
-            value = sensor["latest"]["value"]
-            return value * self._uom_conversion_factor if self._uom_conversion_factor else value
-        return None
\ No newline at end of file
+            return self.convert_value(sensor["latest"]["value"])
+        return None
+
+    def convert_value(self, value: Optional[float]) -> Optional[float]:
+        if value is None or not self._uom_conversion_factor:
+            return value
+        return value * self._uom_conversion_factor
\ No newline at end of file
@@ -1,8 +1,8 @@
 import logging
-from typing import Optional
-from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
+from typing import Tuple
 
 from ...const import DOMAIN
+from ...descriptions import MilaPathSensorDescription
 from ...devices import MilaAppliance
 from .sensor import MilaApplianceSensor
 
@@ -12,29 +12,30 @@ class MilaAppliancePathSensor(MilaApplianceSensor):
     def __init__(
         self, 
         device: MilaAppliance, 
-        name: str, 
-        data_path: str, 
-        icon: Optional[str] = None, 
-        uom: Optional[str] = None,
-        device_class: Optional[SensorDeviceClass] = None,
-        state_class: Optional[SensorStateClass] = None,
-        convert_function = None
+        description: MilaPathSensorDescription
     ):
-        super().__init__(device, name, icon, uom, device_class, state_class)
-        self._data_path = data_path
-        self._convert_function = convert_function
+        super().__init__(
+            device,
+            description.name,
+            description.icon,
+            description.uom,
+            description.device_class,
+            description.state_class
+        )
+        self._description = description
+        self._attr_entity_registry_enabled_default = description.enabled_default
 
     @property
     def unique_id(self) -> str:
-        return f"{DOMAIN}_{self.device.id}_{self._data_path.replace('.','_')}".lower()
+        return f"{DOMAIN}_{self.device.id}_{self._description.data_path.replace('.','_')}".lower()
 
     @property
-    def native_value(self):
+    def data_paths(self) -> Tuple[str, ...]:
+        return (self._description.data_path,)
+
+    def _compute_native_value(self):
         try:
-            val = self.device.get_value(self._data_path)
-            if self._convert_function is not None:
-                val = self._convert_function(val)
-            return val
+            return self._description.value_fn(self.device.document)
         except KeyError:
             return None
         except Exception as ex:
@@ -1,41 +1,40 @@
 import logging
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 from milasdk import SmartModeKind
 
 from ...const import DOMAIN
+from ...descriptions import MilaSmartModeSwitchDescription
 from ...devices import MilaAppliance
+from ...smart_modes import SMART_MODE_KEYS
 from ..common import MilaSwitch
 
 _LOGGER = logging.getLogger(__name__)
 
-MODE_MAPPING = {}
-for m in SmartModeKind: # map to camelCase
-    MODE_MAPPING[m] = ''.join([m.value[0].lower(), m.value[1:]])
-
 class MilaSmartModeSwitch(MilaSwitch):
     def __init__(
         self, 
         device: MilaAppliance, 
-        name: str,
-        smartmode_kind: SmartModeKind,
-        icon: Optional[str] = None
+        description: MilaSmartModeSwitchDescription
     ):
-        super().__init__(device, name, icon)
-        self._smartmode_kind = smartmode_kind
+        super().__init__(device, description.name, description.icon)
+        self._smartmode_kind = description.smartmode_kind
 
     @property
     def unique_id(self) -> str:
-        return f"{DOMAIN}_{self.device.id}_smartmode_{self._smartmode_kind}".lower()
+        return f"{DOMAIN}_{self.device.id}_smartmode_{self._smartmode_kind.value}".lower()
 
     @property
     def device(self) -> MilaAppliance:
         return self._device        
 
     @property
-    def is_on(self) -> bool:
+    def data_paths(self) -> Tuple[str, ...]:
+        return ("smartModes",)
+
+    def _compute_is_on(self) -> Optional[bool]:
         try:
             modes: dict[str, Any] = self.device.get_value("smartModes")
-            return modes[MODE_MAPPING[self._smartmode_kind]]["isEnabled"]
+            return modes[SMART_MODE_KEYS[self._smartmode_kind]]["isEnabled"]
         except Exception as ex:
             _LOGGER.error(f"Error getting switch state for {self.name}", exc_info=ex)
             return None
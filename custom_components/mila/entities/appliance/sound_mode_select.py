@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 from milasdk import SoundsConfig
 
 from ...const import DOMAIN
@@ -31,7 +31,10 @@ class MilaSoundModeSelect(MilaSelect):
         return self._device        
 
     @property
-    def current_option(self) -> Optional[str]:
+    def data_paths(self) -> Tuple[str, ...]:
+        return ("room.soundsConfig",)
+
+    def _compute_current_option(self) -> Optional[str]:
         try:
             return self.device.get_value("room.soundsConfig")
         except Exception as ex:
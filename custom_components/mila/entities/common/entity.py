@@ -1,13 +1,24 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
 
 from ...devices import MilaDevice
 
 class MilaEntity(CoordinatorEntity):
-    """Base class for all Mila entities"""
+    """
+    Base class for all Mila entities
+
+    The state is computed once per coordinator update into the `_attr_*` fields
+    listed in `_state_attrs`, and only written when one of them changed.
+    """
+    #the platform the entity is added to
+    platform_domain: str
+    _state_attrs: Tuple[str, ...] = ("_attr_name", "_attr_available")
+
     def __init__(self, device: MilaDevice):
         super().__init__(device._coordinator)
         self._device = device
+        self._state_computed = False
 
     @property
     def device(self) -> MilaDevice:
@@ -23,8 +34,43 @@ class MilaEntity(CoordinatorEntity):
 
     @property
     def name(self) -> str:
-        raise NotImplementedError
+        self._ensure_state()
+        return self._attr_name
+
+    @property
+    def data_paths(self) -> Tuple[str, ...]:
+        """Paths in the device data this entity reads."""
+        return ()
+
+    @property
+    def sensor_kinds(self) -> Tuple[str, ...]:
+        """Appliance sensor kinds this entity reads."""
+        return ()
 
     @property
     def available(self) -> bool:
-        return self.device.available
\ No newline at end of file
+        self._ensure_state()
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        before = self._state_snapshot() if self._state_computed else None
+        self._update_state()
+        if self._state_snapshot() != before:
+            self.async_write_ha_state()
+
+    def _ensure_state(self) -> None:
+        if not self._state_computed:
+            self._update_state()
+
+    def _state_snapshot(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, attr, None) for attr in self._state_attrs)
+
+    def _update_state(self) -> None:
+        """Compute the state of the entity into its `_attr_*` fields."""
+        self._state_computed = True
+        self._attr_name = self._compute_name()
+        self._attr_available = self.device.available and not self.device.stale
+
+    def _compute_name(self) -> str:
+        raise NotImplementedError
\ No newline at end of file
@@ -1,10 +1,13 @@
 from typing import Optional
+from homeassistant.const import Platform
 from homeassistant.components.fan import FanEntity
 
 from ...devices import MilaDevice
 from .entity import MilaEntity
 
 class MilaFan(MilaEntity, FanEntity):
+    platform_domain = Platform.FAN
+
     def __init__(
         self, 
         device: MilaDevice, 
@@ -19,7 +22,6 @@ class MilaFan(MilaEntity, FanEntity):
     def unique_id(self) -> str:
         raise NotImplementedError
     
-    @property
-    def name(self) -> str:
+    def _compute_name(self) -> str:
         return f"{self.device.name_or_id} {self._name}"
 
@@ -1,10 +1,13 @@
 from typing import Any, Optional
+from homeassistant.const import Platform
 from homeassistant.components.select import SelectEntity
 
 from ...devices import MilaDevice
 from .entity import MilaEntity
 
 class MilaSelect(MilaEntity, SelectEntity):
+    platform_domain = Platform.SELECT
+
     def __init__(
         self, 
         device: MilaDevice, 
@@ -19,8 +22,9 @@ class MilaSelect(MilaEntity, SelectEntity):
     def unique_id(self) -> str:
         raise NotImplementedError
     
-    @property
-    def name(self) -> str:
+    _state_attrs = MilaEntity._state_attrs + ("_attr_current_option",)
+
+    def _compute_name(self) -> str:
         return f"{self.device.name_or_id} {self._name}"
 
     @property
@@ -29,6 +33,14 @@ class MilaSelect(MilaEntity, SelectEntity):
 
     @property
     def current_option(self) -> Optional[str]:
+        self._ensure_state()
+        return self._attr_current_option
+
+    def _update_state(self) -> None:
+        super()._update_state()
+        self._attr_current_option = self._compute_current_option()
+
+    def _compute_current_option(self) -> Optional[str]:
         raise NotImplementedError
 
     async def async_select_option(self, option: str) -> None:
@@ -1,10 +1,13 @@
-from typing import Optional
+from typing import Any, Optional
+from homeassistant.const import Platform
 from homeassistant.components.sensor import SensorEntity, SensorStateClass, SensorDeviceClass
 
 from ...devices import MilaDevice
 from .entity import MilaEntity
 
 class MilaSensor(MilaEntity, SensorEntity):
+    platform_domain = Platform.SENSOR
+
     def __init__(
         self, 
         device: MilaDevice, 
@@ -25,10 +28,28 @@ class MilaSensor(MilaEntity, SensorEntity):
     def unique_id(self) -> str:
         raise NotImplementedError
     
-    @property
-    def name(self) -> str:
-        return f"{self.device.name_or_id} {self._name}"
+    _state_attrs = MilaEntity._state_attrs + ("_attr_native_value", "_attr_extra_state_attributes")
 
     @property
     def native_value(self):
+        self._ensure_state()
+        return self._attr_native_value
+
+    @property
+    def extra_state_attributes(self) -> Optional[dict[str, Any]]:
+        self._ensure_state()
+        return self._attr_extra_state_attributes
+
+    def _update_state(self) -> None:
+        super()._update_state()
+        self._attr_native_value = self._compute_native_value()
+        self._attr_extra_state_attributes = self._compute_extra_state_attributes()
+
+    def _compute_name(self) -> str:
+        return f"{self.device.name_or_id} {self._name}"
+
+    def _compute_native_value(self):
         raise NotImplementedError
+
+    def _compute_extra_state_attributes(self) -> Optional[dict[str, Any]]:
+        return None
@@ -1,10 +1,13 @@
 from typing import Any, Optional
+from homeassistant.const import Platform
 from homeassistant.components.switch import SwitchEntity
 
 from ...devices import MilaDevice
 from .entity import MilaEntity
 
 class MilaSwitch(MilaEntity, SwitchEntity):
+    platform_domain = Platform.SWITCH
+
     def __init__(
         self, 
         device: MilaDevice, 
@@ -19,13 +22,22 @@ class MilaSwitch(MilaEntity, SwitchEntity):
     def unique_id(self) -> str:
         raise NotImplementedError
     
-    @property
-    def name(self) -> str:
-        return f"{self.device.name_or_id} {self._name}"
+    _state_attrs = MilaEntity._state_attrs + ("_attr_is_on",)
 
     @property
     def is_on(self) -> bool:
         """Return True if entity is on."""
+        self._ensure_state()
+        return self._attr_is_on
+
+    def _update_state(self) -> None:
+        super()._update_state()
+        self._attr_is_on = self._compute_is_on()
+
+    def _compute_name(self) -> str:
+        return f"{self.device.name_or_id} {self._name}"
+
+    def _compute_is_on(self) -> Optional[bool]:
         raise NotImplementedError
     
     async def async_turn_on(self, **kwargs: Any) -> None:
@@ -0,0 +1,3 @@
+from .aggregate_sensor import MilaHouseholdAggregateSensor, aggregate_unique_id
+
+from .util import household_aggregates, AGGREGATE_ALL, AGGREGATE_CONVERSIONS, AGGREGATE_SENSOR_KINDS, AGGREGATE_STATS
@@ -0,0 +1,70 @@
+from typing import Any, Optional, Tuple
+from homeassistant.components.sensor import SensorStateClass
+from milasdk import ApplianceSensorKind
+
+from ...const import DOMAIN
+from ...descriptions import MilaMeasurementSensorDescription
+from ...devices import MilaHousehold
+from ...util import camel_case_split
+from ..common import MilaSensor
+from .util import AGGREGATE_ALL
+
+def aggregate_unique_id(device_id: str, group: str, sensor_kind: ApplianceSensorKind, stat: str) -> str:
+    return f"{DOMAIN}_{device_id}_{group}_{sensor_kind}_{stat}".lower()
+
+class MilaHouseholdAggregateSensor(MilaSensor):
+    """The min, max or mean of a sensor kind over the household or a room kind."""
+    def __init__(
+        self,
+        device: MilaHousehold,
+        group: str,
+        description: MilaMeasurementSensorDescription,
+        stat: str
+    ):
+        group_name = "" if group == AGGREGATE_ALL else f"{' '.join(camel_case_split(group))} "
+        super().__init__(
+            device,
+            f"{group_name}{description.name} {stat.capitalize()}",
+            description.icon,
+            description.uom,
+            description.device_class,
+            SensorStateClass.MEASUREMENT
+        )
+        self._group = group
+        self._sensor_kind = description.sensor_kind
+        self._stat = stat
+        self._attr_suggested_display_precision = description.precision
+        #opt-in, an enabled aggregate keeps its kind in every poll
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def device(self) -> MilaHousehold:
+        return self._device
+
+    @property
+    def unique_id(self) -> str:
+        return aggregate_unique_id(self.device.id, self._group, self._sensor_kind, self._stat)
+
+    @property
+    def data_paths(self) -> Tuple[str, ...]:
+        return ("sensors",)
+
+    @property
+    def sensor_kinds(self) -> Tuple[str, ...]:
+        return (self._sensor_kind,)
+
+    def _aggregate(self) -> Optional[dict[str, Any]]:
+        return self.device.document.get(self._group, {}).get(self._sensor_kind)
+
+    def _compute_native_value(self):
+        aggregate = self._aggregate()
+        return aggregate[self._stat] if aggregate else None
+
+    def _compute_extra_state_attributes(self) -> Optional[dict[str, Any]]:
+        aggregate = self._aggregate()
+        if not aggregate:
+            return None
+        attributes = {"count": aggregate["count"]}
+        if self._stat != "mean":
+            attributes["room"] = aggregate[f"{self._stat}_room"]
+        return attributes
@@ -0,0 +1,80 @@
+from typing import Any
+
+from milasdk import ApplianceSensorKind
+
+from ...descriptions import APPLIANCE_MEASUREMENT_SENSORS
+
+# the group of all appliances, the other groups are room kinds
+AGGREGATE_ALL = "all"
+AGGREGATE_STATS = ("min", "max", "mean")
+
+# only air quality and climate readings are aggregated, the fan and filter kinds
+# describe a single appliance
+AGGREGATE_SENSOR_KINDS = frozenset((
+    ApplianceSensorKind.Aqi,
+    ApplianceSensorKind.Co,
+    ApplianceSensorKind.Co2,
+    ApplianceSensorKind.Humidity,
+    ApplianceSensorKind.Pm1,
+    ApplianceSensorKind.Pm10,
+    ApplianceSensorKind.Pm2_5,
+    ApplianceSensorKind.Temperature,
+    ApplianceSensorKind.Voc,
+))
+
+# aggregates are in the same unit as the appliance sensors
+AGGREGATE_CONVERSIONS = {
+    d.sensor_kind: d.uom_conversion_factor
+    for d in APPLIANCE_MEASUREMENT_SENSORS
+    if d.uom_conversion_factor
+}
+
+def household_aggregates(appliances: dict[str, Any]) -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    Aggregate the latest reading of the aggregated sensor kinds in a single pass
+    over the appliances, for the whole household and for each room kind.
+
+    The result is keyed by group and then by sensor kind, with the min/max/mean,
+    the rooms holding the min and max, and the number of readings.
+    """
+    #group -> kind -> [min, min room, max, max room, sum, count]
+    totals: dict[str, dict[str, list]] = {}
+    for appliance in appliances.values():
+        room = appliance.get("room") or {}
+        room_name = room.get("name") or appliance.get("name") or appliance.get("id")
+        groups = [totals.setdefault(AGGREGATE_ALL, {})]
+        if room.get("kind"):
+            groups.append(totals.setdefault(room["kind"], {}))
+
+        for sensor in appliance.get("sensors") or ():
+            kind = sensor.get("kind")
+            value = (sensor.get("latest") or {}).get("value")
+            if value is None or kind not in AGGREGATE_SENSOR_KINDS:
+                continue
+            value *= AGGREGATE_CONVERSIONS.get(kind, 1)
+            for group in groups:
+                row = group.get(kind)
+                if row is None:
+                    group[kind] = [value, room_name, value, room_name, value, 1]
+                    continue
+                if value < row[0]:
+                    row[0], row[1] = value, room_name
+                if value > row[2]:
+                    row[2], row[3] = value, room_name
+                row[4] += value
+                row[5] += 1
+
+    return {
+        group: {
+            kind: {
+                "min": row[0],
+                "min_room": row[1],
+                "max": row[2],
+                "max_room": row[3],
+                "mean": row[4] / row[5],
+                "count": row[5],
+            }
+            for kind, row in kinds.items()
+        }
+        for group, kinds in totals.items()
+    }
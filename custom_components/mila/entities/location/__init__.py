@@ -2,5 +2,6 @@ from .sensor import MilaLocationSensor
 from .path_sensor import MilaLocationPathSensor
 from .distance_sensor import MilaLocationDistanceSensor
 from .aqi_sensor import MilaLocationAqiSensor
+from .pollen_sensor import MilaLocationPollenSensor
 
-from .util import to_pollen_index
\ No newline at end of file
+from .util import to_pollen_index, DERIVED_VALUES, DERIVED_INPUTS
\ No newline at end of file
@@ -1,9 +1,10 @@
-import aqi
+from typing import Tuple
 from homeassistant.components.sensor import SensorStateClass, SensorDeviceClass
 
 from ...const import DOMAIN
 from ...devices import MilaLocation
 from .sensor import MilaLocationSensor
+from .util import DERIVED_AQI
 
 class MilaLocationAqiSensor(MilaLocationSensor):
     def __init__(
@@ -17,6 +18,11 @@ class MilaLocationAqiSensor(MilaLocationSensor):
         return f"{DOMAIN}_{self.device.id}_aqi".lower()
 
     @property
-    def native_value(self):
-        pm25: float = self.device.get_value("outdoorStation.sensor.latest.value")
-        return float(aqi.to_iaqi(aqi.POLLUTANT_PM25, str(pm25), algo=aqi.ALGO_EPA))
+    def data_paths(self) -> Tuple[str, ...]:
+        return (DERIVED_AQI,)
+
+    def _compute_native_value(self):
+        try:
+            return self.device.get_value(DERIVED_AQI)
+        except KeyError:
+            return None
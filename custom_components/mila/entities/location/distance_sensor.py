@@ -1,5 +1,4 @@
-from geopy.distance import geodesic
-from typing import Optional
+from typing import Optional, Tuple
 
 from homeassistant.const import (
     UnitOfLength
@@ -10,6 +9,7 @@ from homeassistant.util.unit_conversion import DistanceConverter
 from ...const import DOMAIN
 from ...devices import MilaLocation
 from .sensor import MilaLocationSensor
+from .util import DERIVED_DISTANCE
 
 class MilaLocationDistanceSensor(MilaLocationSensor):
     def __init__(
@@ -23,13 +23,17 @@ class MilaLocationDistanceSensor(MilaLocationSensor):
         return f"{DOMAIN}_{self.device.id}_distance".lower()  
 
     @property
-    def native_value(self):
-        location_point = (float(self.device.get_value("address.point.lat")),
-            float(self.device.get_value("address.point.lon")))
-        station_point = (float(self.device.get_value("outdoorStation.point.lat")),
-            float(self.device.get_value("outdoorStation.point.lon")))
+    def data_paths(self) -> Tuple[str, ...]:
+        return (DERIVED_DISTANCE,)
+
+    def _compute_native_value(self):
+        try:
+            val = self.device.get_value(DERIVED_DISTANCE)
+        except KeyError:
+            return None
+        if val is None:
+            return None
 
-        val = geodesic(location_point, station_point).km
         if self._is_metric:
             val = DistanceConverter.convert(val, UnitOfLength.KILOMETERS, UnitOfLength.MILES)
 
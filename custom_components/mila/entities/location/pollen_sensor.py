@@ -0,0 +1,50 @@
+from typing import Any, Optional, Tuple
+from homeassistant.components.sensor import SensorDeviceClass
+
+from ...const import DOMAIN
+from ...devices import MilaLocation
+from .sensor import MilaLocationSensor
+from .util import DERIVED_POLLEN, POLLEN_KINDS
+
+class MilaLocationPollenSensor(MilaLocationSensor):
+    """A field of the latest pollen window, extracted once per refresh by the coordinator."""
+    def __init__(
+        self,
+        device: MilaLocation,
+        name: str,
+        field: str,
+        icon: Optional[str] = None,
+        device_class: Optional[SensorDeviceClass] = None
+    ):
+        super().__init__(device, name, icon, device_class=device_class)
+        self._field = field
+
+    @property
+    def unique_id(self) -> str:
+        #keep the ids these sensors had when they read the window list directly
+        path = "date" if self._field == "date" else f"status_{self._field}"
+        return f"{DOMAIN}_{self.device.id}_pollenStation_aggregateWindow[-1]_{path}".lower()
+
+    @property
+    def data_paths(self) -> Tuple[str, ...]:
+        return (DERIVED_POLLEN,)
+
+    def _compute_native_value(self):
+        try:
+            return self.device.get_value(f"{DERIVED_POLLEN}.latest.{self._field}")
+        except (KeyError, TypeError):
+            return None
+
+    def _compute_extra_state_attributes(self) -> Optional[dict[str, Any]]:
+        if self._field not in POLLEN_KINDS:
+            return None
+        try:
+            pollen = self.device.get_value(DERIVED_POLLEN)
+        except KeyError:
+            return None
+        if not pollen or not pollen["latest"]:
+            return None
+        return {
+            "index": pollen["latest"][f"{self._field}_index"],
+            "trend": [w[f"{self._field}_index"] for w in pollen["windows"]],
+        }
@@ -1,3 +1,6 @@
+import aqi
+from geopy.distance import geodesic
+from typing import Any, Optional
 
 POLLEN_INDEX_MAPPING={
     "None": 0,
@@ -7,8 +10,81 @@ POLLEN_INDEX_MAPPING={
     "VeryHigh": 4
 }
 
+DERIVED_AQI = "derived.aqi"
+DERIVED_DISTANCE = "derived.distance"
+DERIVED_POLLEN = "derived.pollen"
+
+POLLEN_KINDS = ("trees", "weeds", "grass", "mold")
+
 def to_pollen_index(value: str):
     try:
         return POLLEN_INDEX_MAPPING[value]
     except:
-        return None
\ No newline at end of file
+        return None
+
+def pm25_to_aqi(pm25: Optional[float]) -> Optional[float]:
+    if pm25 is None:
+        return None
+    return float(aqi.to_iaqi(aqi.POLLUTANT_PM25, str(pm25), algo=aqi.ALGO_EPA))
+
+def station_aqi(location: dict[str, Any]) -> Optional[float]:
+    try:
+        return pm25_to_aqi(location["outdoorStation"]["sensor"]["latest"]["value"])
+    except (KeyError, TypeError):
+        return None
+
+def station_distance_km(location: dict[str, Any]) -> Optional[float]:
+    try:
+        location_point = (float(location["address"]["point"]["lat"]),
+            float(location["address"]["point"]["lon"]))
+        station_point = (float(location["outdoorStation"]["point"]["lat"]),
+            float(location["outdoorStation"]["point"]["lon"]))
+    except (KeyError, TypeError):
+        return None
+    return geodesic(location_point, station_point).km
+
+def pollen_record(window: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a daily pollen window, adding the numeric index of every status."""
+    status = window.get("status") or {}
+    record = {"date": window.get("date")}
+    for kind in POLLEN_KINDS:
+        record[kind] = status.get(kind)
+        record[f"{kind}_index"] = to_pollen_index(status.get(kind))
+    return record
+
+def pollen_windows(location: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Extract the pollen windows of a location once, oldest first.
+
+    `latest` is the most recent window that reported any status, `windows`
+    keeps the trailing days for trend sensors.
+    """
+    try:
+        windows = [pollen_record(w) for w in location["pollenStation"]["aggregateWindow"] or []]
+    except (KeyError, TypeError):
+        return None
+
+    reported = [w for w in windows if any(w[kind] is not None for kind in POLLEN_KINDS)]
+    return {
+        "latest": reported[-1] if reported else None,
+        "windows": windows,
+    }
+
+# values computed by the coordinator, only when an enabled entity reads them
+DERIVED_VALUES = {
+    DERIVED_AQI: station_aqi,
+    DERIVED_DISTANCE: station_distance_km,
+    DERIVED_POLLEN: pollen_windows,
+}
+
+# API fields each derived value is computed from
+DERIVED_INPUTS = {
+    DERIVED_AQI: ("outdoorStation.id", "outdoorStation.sensor.latest.value"),
+    DERIVED_DISTANCE: (
+        "address.point.lat",
+        "address.point.lon",
+        "outdoorStation.point.lat",
+        "outdoorStation.point.lon",
+    ),
+    DERIVED_POLLEN: ("pollenStation.id", "pollenStation.aggregateWindow"),
+}
@@ -3,11 +3,11 @@ import logging
 from typing import Callable
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
 
 from .const import DOMAIN
-from .entities import MilaFan
 from .update_coordinator import MilaUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,8 +22,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     entities = [
         entity
         for device in devices
-        for entity in device.entities
-        if isinstance(entity, MilaFan)
+        for entity in device.entities_for(Platform.FAN)
     ]
     _LOGGER.debug(f'Found {len(entities):d} fans')
     async_add_entities(entities)
+    coordinator.async_register_entity_adder(Platform.FAN, async_add_entities)
@@ -0,0 +1,110 @@
+"""Staggers and bounds the refreshes of many Mila accounts."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import hashlib
+from datetime import timedelta
+import logging
+from typing import Any, AsyncIterator
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_FLEET, FLEET_MAX_CONCURRENT_REFRESHES, FLEET_THROUGHPUT_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+class MilaFleet:
+    """
+    Shared by every config entry.
+
+    Each entry polls in its own deterministic slot of the interval, so accounts are
+    spread out instead of all refreshing at the same instant, and only a bounded
+    number of accounts refresh at once.
+    """
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = FLEET_MAX_CONCURRENT_REFRESHES):
+        self._hass = hass
+        self._max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._entries: set[str] = set()
+        self._completed: deque[float] = deque()
+        self._in_flight = 0
+        self.max_in_flight = 0
+        self.refreshes = 0
+        self.refresh_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def register(self, entry_id: str) -> None:
+        self._entries.add(entry_id)
+
+    def unregister(self, entry_id: str) -> None:
+        self._entries.discard(entry_id)
+
+    def offset(self, entry_id: str, period: float) -> float:
+        """The position of an entry within the poll period, the same on every start."""
+        digest = hashlib.blake2b(entry_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64 * period
+
+    def phase(self, entry_id: str, interval: timedelta) -> timedelta:
+        """
+        The delay until the next slot of an entry.
+
+        The first poll after a change of interval lands between half and one and a
+        half intervals away, after that every poll is exactly one interval apart.
+        """
+        period = interval.total_seconds()
+        if period <= 0:
+            return interval
+        #the coordinator schedules from the whole second
+        now = int(self._hass.loop.time())
+        delay = period - (now - self.offset(entry_id, period)) % period
+        if delay < period / 2:
+            delay += period
+        return timedelta(seconds=delay)
+
+    @asynccontextmanager
+    async def refresh(self) -> AsyncIterator[None]:
+        """Hold one of the refresh slots for the duration of a refresh."""
+        loop = self._hass.loop
+        start = loop.time()
+        async with self._semaphore:
+            acquired = loop.time()
+            self.wait_seconds += acquired - start
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+                done = loop.time()
+                self.refreshes += 1
+                self.refresh_seconds += done - acquired
+                self._completed.append(done)
+
+    def throughput(self) -> float:
+        """Refreshes per minute over the recent window."""
+        window = FLEET_THROUGHPUT_WINDOW.total_seconds()
+        cutoff = self._hass.loop.time() - window
+        while self._completed and self._completed[0] < cutoff:
+            self._completed.popleft()
+        return round(len(self._completed) / (window / 60), 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "accounts": len(self._entries),
+            "max_concurrent": self._max_concurrent,
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "refreshes": self.refreshes,
+            "refreshes_per_minute": self.throughput(),
+            "mean_refresh_seconds": round(self.refresh_seconds / self.refreshes, 3) if self.refreshes else None,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+def async_get_fleet(hass: HomeAssistant) -> MilaFleet:
+    """Return the fleet shared by all Mila config entries."""
+    fleet = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = MilaFleet(hass)
+    return fleet
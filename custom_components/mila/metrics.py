@@ -0,0 +1,163 @@
+"""OpenMetrics scrape endpoint for the Mila readings."""
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_METRICS_VIEW, DATAKEY_APPLIANCE, DATAKEY_LOCATION, DOMAIN, METRICS_URL
+from .entities.location.util import DERIVED_AQI, DERIVED_POLLEN, POLLEN_KINDS
+
+if TYPE_CHECKING:
+    from .update_coordinator import MilaUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name -> (type, help), in the order they are rendered
+METRIC_FAMILIES = {
+    "mila_appliance_sensor": ("gauge", "Latest reading of an appliance sensor, in the unit of the API."),
+    "mila_appliance_mode": ("stateset", "Actual mode of an appliance."),
+    "mila_outdoor_pm25": ("gauge", "PM2.5 reported by the outdoor station of a location."),
+    "mila_outdoor_aqi": ("gauge", "US EPA AQI of the outdoor PM2.5 of a location."),
+    "mila_pollen_index": ("gauge", "Pollen index (0-4) of the latest report for a location."),
+    "mila_refresh_duration_seconds": ("gauge", "Duration of the last refresh of an account."),
+    "mila_refresh_requests": ("gauge", "API requests made by the last refresh of an account."),
+    "mila_refresh_wire_bytes": ("gauge", "Bytes received by the last refresh of an account, of the responses with a known size."),
+    "mila_last_refresh_timestamp_seconds": ("gauge", "Time of the last successful refresh of an account."),
+}
+
+# fields the metrics read, requested in addition to those of the enabled entities
+METRICS_APPLIANCE_FIELDS = ("sensors", "room.name", "state.actualMode")
+METRICS_LOCATION_FIELDS = (
+    "outdoorStation.id",
+    "outdoorStation.name",
+    "outdoorStation.sensor.latest.value",
+    "pollenStation.id",
+    "pollenStation.aggregateWindow",
+)
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(**labels: Any) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items() if v is not None)
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+def _number(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+def render_metrics(coordinators: Iterable[MilaUpdateCoordinator]) -> str:
+    """Render the current data of the coordinators as an OpenMetrics page."""
+    samples: dict[str, list[str]] = {name: [] for name in METRIC_FAMILIES}
+
+    def add(name: str, value: Any, **labels: Any) -> None:
+        value = _number(value)
+        if value is not None:
+            samples[name].append(f"{name}{{{_labels(**labels)}}} {value}")
+
+    for coordinator in coordinators:
+        data = coordinator.data
+        entry = coordinator.entry_id
+
+        modes: dict[str, Any] = {}
+        for id, appliance in data[DATAKEY_APPLIANCE].items():
+            room = (appliance.get("room") or {}).get("name")
+            for sensor in appliance.get("sensors") or ():
+                add(
+                    "mila_appliance_sensor", (sensor.get("latest") or {}).get("value"),
+                    entry=entry, appliance=id, room=room, kind=_enum_value(sensor.get("kind"))
+                )
+            modes[id] = _enum_value((appliance.get("state") or {}).get("actualMode"))
+
+        #a stateset lists every known mode for each appliance
+        known_modes = sorted({str(m) for m in modes.values() if m is not None})
+        for id, mode in modes.items():
+            for known in known_modes:
+                add("mila_appliance_mode", int(str(mode) == known), entry=entry, appliance=id, mila_appliance_mode=known)
+
+        for id, location in data[DATAKEY_LOCATION].items():
+            station = location.get("outdoorStation") or {}
+            pm25 = ((station.get("sensor") or {}).get("latest") or {}).get("value")
+            add("mila_outdoor_pm25", pm25, entry=entry, location=id, station=station.get("name"))
+
+            #shared with the entities and the other locations of the station
+            add("mila_outdoor_aqi", coordinator.stations.derived_value(DERIVED_AQI, location), entry=entry, location=id)
+
+            pollen = coordinator.stations.derived_value(DERIVED_POLLEN, location)
+            latest = (pollen or {}).get("latest") or {}
+            for kind in POLLEN_KINDS:
+                add("mila_pollen_index", latest.get(f"{kind}_index"), entry=entry, location=id, kind=kind)
+
+        transfer = coordinator.last_refresh_transfer
+        add("mila_refresh_duration_seconds", coordinator.last_refresh_duration, entry=entry)
+        add("mila_refresh_requests", transfer.requests, entry=entry)
+        add("mila_refresh_wire_bytes", transfer.wire_bytes, entry=entry)
+        last_success = max(coordinator.last_success.values(), default=None)
+        if last_success is not None:
+            add("mila_last_refresh_timestamp_seconds", last_success.timestamp(), entry=entry)
+
+    lines = []
+    for name, (kind, help) in METRIC_FAMILIES.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help}")
+        lines.extend(samples[name])
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+class MilaMetricsView(HomeAssistantView):
+    """
+    Serves the readings of every account with metrics enabled as one OpenMetrics page.
+
+    The page is rendered once per coordinator update, scrapes in between get the
+    cached page.
+    """
+    url = METRICS_URL
+    name = "api:mila:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        #entry ids and data the page was rendered from, not the coordinators, so an
+        #unloaded entry is not kept alive by the page
+        self._snapshot: list[tuple[str, Any]] = []
+        self._page: Optional[str] = None
+
+    async def get(self, request: web.Request) -> web.Response:
+        coordinators = [
+            c for c in self._hass.data.get(DOMAIN, {}).values()
+            if c.metrics_enabled and c.data is not None
+        ]
+        if not coordinators:
+            self._snapshot, self._page = [], None
+            return web.Response(status=HTTPStatus.NOT_FOUND, text="No Mila account has metrics enabled")
+
+        snapshot = [(c.entry_id, c.data) for c in coordinators]
+        if not self._is_cached(snapshot):
+            self._page = render_metrics(coordinators)
+            self._snapshot = snapshot
+        return web.Response(body=self._page.encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    def _is_cached(self, snapshot: list[tuple[str, Any]]) -> bool:
+        """True if no coordinator was added, removed or updated since the page was rendered."""
+        return self._page is not None and len(snapshot) == len(self._snapshot) and all(
+            e == cached_e and d is cached_d
+            for (e, d), (cached_e, cached_d) in zip(snapshot, self._snapshot)
+        )
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view once, it serves all config entries."""
+    if DATA_METRICS_VIEW in hass.data:
+        return
+    view = hass.data[DATA_METRICS_VIEW] = MilaMetricsView(hass)
+    hass.http.register_view(view)
@@ -0,0 +1,92 @@
+"""Plans the poll rate around the bedtime of the rooms."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+import logging
+from typing import Any, Iterable, Optional
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+Window = tuple[time, time]
+
+def parse_local_time(value: Any) -> Optional[time]:
+    """Parse an `HH:mm` (or `HH:mm:ss`) local time."""
+    if isinstance(value, time):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    return dt_util.parse_time(value)
+
+def window_end(window: Window, now: datetime) -> Optional[datetime]:
+    """If `now` is inside a daily window, return when it ends, otherwise None."""
+    start, end = window
+    if start == end:
+        return None
+    current = now.time().replace(tzinfo=None)
+    if start < end:
+        inside = start <= current < end
+        days = 0
+    else:
+        #the window spans midnight
+        inside = current >= start or current < end
+        days = 1 if current >= start else 0
+    if not inside:
+        return None
+    return datetime.combine(now.date() + timedelta(days=days), end, tzinfo=now.tzinfo)
+
+@dataclass
+class MilaPollPlan:
+    """The poll rate chosen for the current time."""
+    asleep: bool
+    interval: timedelta
+    reason: str
+    wake_up: Optional[datetime] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "asleep": self.asleep,
+            "interval": self.interval.total_seconds(),
+            "reason": self.reason,
+            "wake_up": self.wake_up.isoformat() if self.wake_up else None,
+        }
+
+class MilaPollPlanner:
+    """
+    Drops to a low poll rate while every room is in its bedtime window, or during
+    the user's quiet hours, and plans the next poll for the wake-up time.
+    """
+    def __init__(self, interval: timedelta, sleep_interval: timedelta, quiet_hours: Optional[Window] = None):
+        self._interval = interval
+        self._sleep_interval = max(sleep_interval, interval)
+        self._quiet_hours = quiet_hours
+
+    def plan(self, appliances: Iterable[dict[str, Any]], now: Optional[datetime] = None) -> MilaPollPlan:
+        now = now or dt_util.now()
+
+        if self._quiet_hours is not None:
+            wake_up = window_end(self._quiet_hours, now)
+            if wake_up is not None:
+                return self._sleep_plan("quiet hours", now, wake_up)
+
+        wake_ups = []
+        for appliance in appliances:
+            bedtime = (appliance.get("room") or {}).get("bedtime") or {}
+            window = (parse_local_time(bedtime.get("localStart")), parse_local_time(bedtime.get("localEnd")))
+            if None in window:
+                return MilaPollPlan(False, self._interval, "a room has no bedtime")
+            wake_up = window_end(window, now)
+            if wake_up is None:
+                return MilaPollPlan(False, self._interval, "a room is awake")
+            wake_ups.append(wake_up)
+
+        if not wake_ups:
+            return MilaPollPlan(False, self._interval, "no rooms")
+        return self._sleep_plan("all rooms at bedtime", now, min(wake_ups))
+
+    def _sleep_plan(self, reason: str, now: datetime, wake_up: datetime) -> MilaPollPlan:
+        #resume the full rate at wake-up
+        interval = min(self._sleep_interval, max(wake_up - now, self._interval))
+        return MilaPollPlan(True, interval, reason, wake_up)
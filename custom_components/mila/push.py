@@ -0,0 +1,156 @@
+"""Push updates for Mila appliances over a GraphQL subscription."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Iterable, Optional
+
+from aiohttp import ClientError, ClientSession, ClientWebSocketResponse, WSMsgType
+from graphql import DocumentNode, GraphQLError, print_ast
+from milasdk import AbstractAsyncSession, MilaError, OAuthError
+
+from .api import MilaIntegrationApi
+from .const import PUSH_ACK_TIMEOUT, PUSH_HEARTBEAT, PUSH_RECONNECT_MAX, PUSH_RECONNECT_MIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# graphql-transport-ws, falling back to the legacy subscriptions-transport-ws protocol
+WS_PROTOCOLS = ("graphql-transport-ws", "graphql-ws")
+
+class MilaPushError(MilaError):
+    pass
+
+class MilaPushClient:
+    """
+    Keeps a subscription open for each appliance and hands every event to a callback.
+
+    The connection is re-established with an exponential backoff; the owner is told
+    about connection changes so it can fall back to polling while disconnected.
+    """
+    def __init__(
+        self,
+        session: ClientSession,
+        auth: AbstractAsyncSession,
+        api: MilaIntegrationApi,
+        url: str,
+        subscription: Callable[[str], DocumentNode],
+        on_update: Callable[[dict[str, Any]], None],
+        on_connection_change: Callable[[bool], None]
+    ):
+        self._session = session
+        self._auth = auth
+        self._api = api
+        self._url = url
+        self._subscription = subscription
+        self._on_update = on_update
+        self._on_connection_change = on_connection_change
+        self._appliance_ids: set[str] = set()
+        self._documents: dict[str, DocumentNode] = {}
+        self._ws: Optional[ClientWebSocketResponse] = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def async_set_appliances(self, appliance_ids: Iterable[str]) -> None:
+        """Subscribe to new appliances and drop the ones that are gone."""
+        appliance_ids = set(appliance_ids)
+        added = appliance_ids - self._appliance_ids
+        removed = self._appliance_ids - appliance_ids
+        self._appliance_ids = appliance_ids
+
+        if self._ws is None or self._ws.closed:
+            return
+        for id in removed:
+            self._documents.pop(id, None)
+            await self._ws.send_json({"id": id, "type": "complete" if self._is_current_protocol else "stop"})
+        for id in added:
+            await self._async_subscribe(id)
+
+    async def async_run(self) -> None:
+        """Run until cancelled, reconnecting whenever the connection drops."""
+        backoff = PUSH_RECONNECT_MIN
+        while True:
+            try:
+                await self._async_listen()
+                backoff = PUSH_RECONNECT_MIN
+            except (ClientError, asyncio.TimeoutError, ValueError, MilaPushError, OAuthError) as ex:
+                _LOGGER.debug(f"Mila push connection failed: {ex}")
+            finally:
+                self._ws = None
+                self._set_connected(False)
+
+            _LOGGER.debug(f"Reconnecting Mila push in {backoff} seconds")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, PUSH_RECONNECT_MAX)
+
+    async def _async_listen(self) -> None:
+        token = await self._auth.async_get_access_token()
+        async with self._session.ws_connect(
+            self._url, protocols=WS_PROTOCOLS, heartbeat=PUSH_HEARTBEAT
+        ) as ws:
+            self._ws = ws
+            await ws.send_json({
+                "type": "connection_init",
+                "payload": {"Authorization": f"Bearer {token}"}
+            })
+            ack = await ws.receive_json(timeout=PUSH_ACK_TIMEOUT)
+            if ack.get("type") != "connection_ack":
+                raise MilaPushError(f"Subscription was not acknowledged: {ack}")
+
+            for id in self._appliance_ids:
+                await self._async_subscribe(id)
+            self._set_connected(True)
+
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    if msg.type == WSMsgType.ERROR:
+                        raise MilaPushError(f"Websocket error: {ws.exception()}")
+                    break
+                try:
+                    message = msg.json()
+                except ValueError:
+                    _LOGGER.warning(f"Ignoring a Mila push message that is not JSON: {msg.data[:100]}")
+                    continue
+                if isinstance(message, dict):
+                    await self._async_handle_message(message)
+
+    async def _async_subscribe(self, device_id: str) -> None:
+        document = self._subscription(device_id)
+        self._documents[device_id] = document
+        await self._ws.send_json({
+            "id": device_id,
+            "type": "subscribe" if self._is_current_protocol else "start",
+            "payload": {"query": print_ast(document)}
+        })
+
+    async def _async_handle_message(self, message: dict[str, Any]) -> None:
+        kind = message.get("type")
+        if kind == "ping":
+            await self._ws.send_json({"type": "pong"})
+        elif kind in ("next", "data"):
+            document = self._documents.get(message.get("id"))
+            payload = message.get("payload") or {}
+            if document is None or not payload.get("data"):
+                return
+            #a malformed event is dropped, the subscription stays open
+            try:
+                appliance = self._api.parse_result(document, payload["data"])["appliance"]
+            except (GraphQLError, KeyError, TypeError, ValueError) as ex:
+                _LOGGER.warning(f"Ignoring invalid Mila push event for {message.get('id')}: {ex}")
+                return
+            self._on_update(appliance)
+        elif kind == "error":
+            _LOGGER.warning(f"Mila push subscription {message.get('id')} failed: {message.get('payload')}")
+
+    @property
+    def _is_current_protocol(self) -> bool:
+        return self._ws.protocol == WS_PROTOCOLS[0]
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected == self._connected:
+            return
+        self._connected = connected
+        _LOGGER.info(f"Mila push {'connected' if connected else 'disconnected'}")
+        self._on_connection_change(connected)
@@ -0,0 +1,216 @@
+"""Rate limited scheduling of the requests made to the Mila API."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+import heapq
+import logging
+from typing import Any, Iterator, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SCHEDULER, SCHEDULER_BURST, SCHEDULER_HEADROOM, SCHEDULER_RATE
+
+_LOGGER = logging.getLogger(__name__)
+
+class RequestPriority(IntEnum):
+    """Lower values are sent first."""
+    COMMAND = 0
+    REFRESH = 1
+    POLL = 2
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "mila_request_priority", default=RequestPriority.POLL
+)
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Send the requests made in this context (and tasks created from it) with a priority."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+def current_priority() -> RequestPriority:
+    return _request_priority.get()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delay-seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class MilaSchedulerStats:
+    """Counters for the requests that went through the scheduler."""
+    granted: dict[str, int] = field(default_factory=lambda: {p.name.lower(): 0 for p in RequestPriority})
+    wait_seconds: dict[str, float] = field(default_factory=lambda: {p.name.lower(): 0.0 for p in RequestPriority})
+    max_wait_seconds: float = 0.0
+    max_queue_depth: int = 0
+    throttled: int = 0
+    deferred_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "granted": dict(self.granted),
+            "wait_seconds": {k: round(v, 3) for k, v in self.wait_seconds.items()},
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "max_queue_depth": self.max_queue_depth,
+            "throttled": self.throttled,
+            "deferred_seconds": round(self.deferred_seconds, 3),
+        }
+
+class MilaRequestScheduler:
+    """
+    Token bucket shared by every config entry.
+
+    Requests wait for a token in priority order (commands, then refreshes, then
+    polls), and a `Retry-After` from the server holds back all of them. The rate
+    grows with the accounts registered, so each of them can keep its poll rate.
+    """
+    def __init__(self, hass: HomeAssistant, rate: float = SCHEDULER_RATE, burst: int = SCHEDULER_BURST):
+        self._hass = hass
+        self._base_rate = rate
+        self._rate = rate
+        self._burst = burst
+        self._reserved: dict[str, float] = {}
+        self._tokens = float(burst)
+        self._updated = hass.loop.time()
+        self._blocked_until = 0.0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.stats = MilaSchedulerStats()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def register(self, entry_id: str, rate: float) -> None:
+        """Reserve the rate (requests per second) an account polls at."""
+        self._reserved[entry_id] = rate
+        self._update_rate()
+
+    def unregister(self, entry_id: str) -> None:
+        self._reserved.pop(entry_id, None)
+        self._update_rate()
+
+    def _update_rate(self) -> None:
+        #tokens earned so far count at the old rate
+        now = self._hass.loop.time()
+        if now >= self._blocked_until:
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+        self._rate = self._base_rate + SCHEDULER_HEADROOM * sum(self._reserved.values())
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._schedule()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, waiter in self._queue if not waiter.done())
+
+    async def async_acquire(self, priority: Optional[RequestPriority] = None) -> None:
+        """Wait until a request may be sent."""
+        if priority is None:
+            priority = current_priority()
+        loop = self._hass.loop
+        start = loop.time()
+
+        if not self._queue and self._take(start):
+            self._record(priority, 0.0)
+            return
+
+        waiter = loop.create_future()
+        self._sequence += 1
+        heapq.heappush(self._queue, (priority, self._sequence, waiter))
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue_depth)
+        self._schedule()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            #a token handed to a cancelled request goes back to the bucket
+            if waiter.done() and not waiter.cancelled():
+                self._tokens += 1
+            self._schedule()
+            raise
+        self._record(priority, loop.time() - start)
+
+    def defer(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, e.g. after a `Retry-After`."""
+        self.stats.throttled += 1
+        self.stats.deferred_seconds += seconds
+        until = self._hass.loop.time() + seconds
+        if until > self._blocked_until:
+            _LOGGER.warning(f"Mila API is rate limiting requests, waiting {seconds:.0f} seconds")
+            self._blocked_until = until
+            self._tokens = 0.0
+        self._schedule()
+
+    def _take(self, now: float) -> bool:
+        if now < self._blocked_until:
+            return False
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        now = self._hass.loop.time()
+        while self._queue:
+            _, _, waiter = self._queue[0]
+            if waiter.done():
+                heapq.heappop(self._queue)
+                continue
+            if not self._take(now):
+                break
+            heapq.heappop(self._queue)
+            waiter.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._queue:
+            return
+        now = self._hass.loop.time()
+        tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        delay = max((1 - tokens) / self._rate, self._blocked_until - now, 0.0)
+        self._timer = self._hass.loop.call_later(delay, self._dispatch)
+
+    def _record(self, priority: RequestPriority, waited: float) -> None:
+        name = priority.name.lower()
+        self.stats.granted[name] += 1
+        self.stats.wait_seconds[name] += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rate": round(self._rate, 3),
+            "burst": self._burst,
+            "accounts": len(self._reserved),
+            "queue_depth": self.queue_depth,
+            **self.stats.as_dict(),
+        }
+
+def async_get_scheduler(hass: HomeAssistant) -> MilaRequestScheduler:
+    """Return the scheduler shared by all Mila config entries."""
+    scheduler = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = MilaRequestScheduler(hass)
+    return scheduler
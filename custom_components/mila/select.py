@@ -3,10 +3,10 @@ import logging
 from typing import Callable
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .entities import MilaSelect
 from .update_coordinator import MilaUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,8 +21,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     entities = [
         entity
         for device in devices
-        for entity in device.entities
-        if isinstance(entity, MilaSelect)
+        for entity in device.entities_for(Platform.SELECT)
     ]
     _LOGGER.debug(f'Found {len(entities):d} switches')
     async_add_entities(entities)
+    coordinator.async_register_entity_adder(Platform.SELECT, async_add_entities)
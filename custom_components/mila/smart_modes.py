@@ -0,0 +1,119 @@
+"""Batched smart mode changes."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from homeassistant.core import callback
+from milasdk import MilaApi, SmartModeKind
+
+from .const import DATAKEY_APPLIANCE, SMART_MODE_BATCH_WINDOW
+from .scheduler import RequestPriority, request_priority
+
+if TYPE_CHECKING:
+    from .update_coordinator import MilaUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# keys of the smart modes in the `smartModes` map (camelCase)
+SMART_MODE_KEYS = {m: ''.join([m.value[0].lower(), m.value[1:]]) for m in SmartModeKind}
+
+class MilaSmartModeBatcher:
+    """
+    Merges the smart mode changes made within a short window.
+
+    Every change is shown right away (optimistically) in the `smartModes` map of
+    the appliance. When the window closes only the last value of each mode is
+    sent, and only if it differs from the state before the window, all of them
+    concurrently and followed by a single refresh. A change that fails is rolled
+    back and raised to the callers that made it, the others are kept.
+    """
+    def __init__(self, coordinator: MilaUpdateCoordinator, api: MilaApi, window: float = SMART_MODE_BATCH_WINDOW):
+        self._coordinator = coordinator
+        self._api = api
+        self._window = window
+        self._pending: dict[tuple[str, SmartModeKind], bool] = {}
+        self._original: dict[tuple[str, SmartModeKind], Optional[bool]] = {}
+        self._waiters: dict[tuple[str, SmartModeKind], list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def async_set(self, appliance_id: str, mode: SmartModeKind, is_enabled: bool) -> None:
+        """Queue a change, returns once it was sent and raises if it failed."""
+        hass = self._coordinator.hass
+        key = (appliance_id, mode)
+        if key not in self._original:
+            self._original[key] = self._current(appliance_id, mode)
+        self._pending[key] = is_enabled
+        self._coordinator.async_patch_appliance(
+            appliance_id, {"smartModes": {SMART_MODE_KEYS[mode]: {"isEnabled": is_enabled}}}
+        )
+
+        waiter = hass.loop.create_future()
+        self._waiters.setdefault(key, []).append(waiter)
+        if self._timer is None:
+            self._timer = hass.loop.call_later(self._window, self._start_flush)
+        await waiter
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the changes that were not sent yet."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+        self._pending, self._original, self._waiters = {}, {}, {}
+
+    def _current(self, appliance_id: str, mode: SmartModeKind) -> Optional[bool]:
+        try:
+            appliance = self._coordinator.data[DATAKEY_APPLIANCE][appliance_id]
+            return appliance["smartModes"][SMART_MODE_KEYS[mode]]["isEnabled"]
+        except (KeyError, TypeError):
+            return None
+
+    @callback
+    def _start_flush(self) -> None:
+        self._timer = None
+        pending, original, waiters = self._pending, self._original, self._waiters
+        self._pending, self._original, self._waiters = {}, {}, {}
+        self._coordinator.hass.async_create_task(self._async_flush(pending, original, waiters))
+
+    async def _async_flush(
+        self,
+        pending: dict[tuple[str, SmartModeKind], bool],
+        original: dict[tuple[str, SmartModeKind], Optional[bool]],
+        waiters: dict[tuple[str, SmartModeKind], list[asyncio.Future]]
+    ) -> None:
+        #changes that were undone within the window are not sent
+        changes = [(id, mode, enabled) for (id, mode), enabled in pending.items() if enabled != original[(id, mode)]]
+        errors: dict[tuple[str, SmartModeKind], Exception] = {}
+        if changes:
+            _LOGGER.debug(f"Sending {len(changes)} smart mode changes")
+            with request_priority(RequestPriority.COMMAND):
+                results = await asyncio.gather(
+                    *(self._api.set_smart_mode(id, mode, enabled) for id, mode, enabled in changes),
+                    return_exceptions=True
+                )
+            for (id, mode, _), result in zip(changes, results):
+                if isinstance(result, Exception):
+                    errors[(id, mode)] = result
+                    self._coordinator.async_patch_appliance(
+                        id, {"smartModes": {SMART_MODE_KEYS[mode]: {"isEnabled": original[(id, mode)]}}}
+                    )
+            if errors:
+                _LOGGER.warning(
+                    f"{len(errors)} of {len(changes)} smart mode changes failed: {next(iter(errors.values()))}"
+                )
+            await self._coordinator.async_request_refresh()
+
+        for key, key_waiters in waiters.items():
+            error = errors.get(key)
+            for waiter in key_waiters:
+                if waiter.done():
+                    continue
+                if error is not None:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(None)
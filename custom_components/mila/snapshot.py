@@ -0,0 +1,180 @@
+"""The `mila.get_snapshot` service."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+from milasdk import ApplianceSensorKind, MilaError
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_ROOM,
+    ATTR_SENSOR_KIND,
+    DATAKEY_APPLIANCE,
+    DATAKEY_LOCATION,
+    DOMAIN,
+    SERVICE_GET_SNAPSHOT,
+)
+from .entities import AGGREGATE_CONVERSIONS, rpm_to_percentage
+from .entities.location.util import DERIVED_AQI, DERIVED_INPUTS, DERIVED_POLLEN
+
+if TYPE_CHECKING:
+    from .update_coordinator import MilaUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SENSOR_KINDS = {k.value.lower(): k.value for k in ApplianceSensorKind}
+
+# what the snapshot reads, fetched once if disabled entities leave it out of the polls
+SNAPSHOT_APPLIANCE_FIELDS = ("sensors", "smartModes")
+SNAPSHOT_LOCATION_FIELDS = ("outdoorStation.name", *DERIVED_INPUTS[DERIVED_AQI], *DERIVED_INPUTS[DERIVED_POLLEN])
+
+def _sensor_kind(value: Any) -> str:
+    kind = SENSOR_KINDS.get(cv.string(value).lower())
+    if kind is None:
+        raise vol.Invalid(f"Unknown sensor kind: {value}")
+    return kind
+
+SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_ROOM): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_SENSOR_KIND): vol.All(cv.ensure_list, [_sensor_kind]),
+})
+
+def _plain(value: Any) -> Any:
+    """Enums and dates as JSON friendly values."""
+    value = getattr(value, "value", value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+def _age(last_success: Optional[datetime], now: datetime) -> Optional[float]:
+    return round((now - last_success).total_seconds(), 1) if last_success else None
+
+def appliance_snapshot(appliance: dict[str, Any], kinds: Optional[set[str]], age: Optional[float]) -> dict[str, Any]:
+    """The readings and state of an appliance, in the units of its entities."""
+    readings = {}
+    rpm = None
+    for sensor in appliance.get("sensors") or ():
+        value = (sensor.get("latest") or {}).get("value")
+        kind = _plain(sensor.get("kind"))
+        if value is not None:
+            value *= AGGREGATE_CONVERSIONS.get(sensor.get("kind"), 1)
+        if kind == ApplianceSensorKind.FanSpeed.value:
+            rpm = value
+        if kinds is None or kind in kinds:
+            readings[kind] = value
+
+    room = appliance.get("room") or {}
+    smart_modes = appliance.get("smartModes") or {}
+    return {
+        "name": appliance.get("name"),
+        "room": {"id": room.get("id"), "name": room.get("name"), "kind": _plain(room.get("kind"))},
+        "mode": _plain((appliance.get("state") or {}).get("actualMode")),
+        "fan": {"rpm": rpm, "percentage": rpm_to_percentage(rpm) if rpm is not None else None},
+        "smart_modes": {k: v.get("isEnabled") for k, v in smart_modes.items() if isinstance(v, dict)},
+        "readings": readings,
+        "age_seconds": age,
+    }
+
+def location_snapshot(coordinator: MilaUpdateCoordinator, location: dict[str, Any], age: Optional[float]) -> dict[str, Any]:
+    """The outdoor air and pollen of a location."""
+    station = location.get("outdoorStation") or {}
+    pollen = coordinator.stations.derived_value(DERIVED_POLLEN, location) or {}
+    return {
+        "city": (location.get("address") or {}).get("city"),
+        "outdoor": {
+            "station": station.get("name"),
+            "pm25": ((station.get("sensor") or {}).get("latest") or {}).get("value"),
+            "aqi": coordinator.stations.derived_value(DERIVED_AQI, location),
+        },
+        "pollen": {k: _plain(v) for k, v in (pollen.get("latest") or {}).items()},
+        "age_seconds": age,
+    }
+
+def _room_matches(appliance: dict[str, Any], rooms: set[str]) -> bool:
+    room = appliance.get("room") or {}
+    return any(
+        str(_plain(room.get(key))).lower() in rooms
+        for key in ("id", "name", "kind")
+        if room.get(key) is not None
+    )
+
+def build_snapshot(
+    coordinators: list[MilaUpdateCoordinator],
+    rooms: Optional[set[str]] = None,
+    kinds: Optional[set[str]] = None,
+    fetched: Optional[dict[str, dict[str, Any]]] = None
+) -> dict[str, Any]:
+    """
+    Build the snapshot from the data the coordinators hold, without reading any entity.
+
+    `fetched` has the domains fetched for the snapshot, by config entry, they
+    replace the polled ones. Locations are left out when filtering by room.
+    """
+    now = dt_util.utcnow()
+    appliances: dict[str, Any] = {}
+    locations: dict[str, Any] = {}
+    for coordinator in coordinators:
+        entry_fetched = (fetched or {}).get(coordinator.entry_id, {})
+        data = {**coordinator.data, **entry_fetched}
+        age = 0.0 if DATAKEY_APPLIANCE in entry_fetched else _age(coordinator.last_success.get(DATAKEY_APPLIANCE), now)
+        for id, appliance in data[DATAKEY_APPLIANCE].items():
+            if rooms is None or _room_matches(appliance, rooms):
+                appliances[id] = {"entry_id": coordinator.entry_id, **appliance_snapshot(appliance, kinds, age)}
+
+        if rooms is not None:
+            continue
+        age = 0.0 if DATAKEY_LOCATION in entry_fetched else _age(coordinator.last_success.get(DATAKEY_LOCATION), now)
+        for id, location in data[DATAKEY_LOCATION].items():
+            locations[id] = {"entry_id": coordinator.entry_id, **location_snapshot(coordinator, location, age)}
+
+    return {"appliances": appliances, "locations": locations}
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the Mila services."""
+
+    async def async_get_snapshot(call: ServiceCall) -> ServiceResponse:
+        coordinators: list[MilaUpdateCoordinator] = [
+            c for c in hass.data.get(DOMAIN, {}).values() if c.data is not None
+        ]
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            coordinators = [c for c in coordinators if c.entry_id == entry_id]
+            if not coordinators:
+                raise ServiceValidationError(f"No loaded Mila account with config entry {entry_id}")
+
+        rooms = call.data.get(ATTR_ROOM)
+        kinds = call.data.get(ATTR_SENSOR_KIND)
+        #the polls only have what enabled entities read
+        try:
+            fetched = {
+                c.entry_id: await c.async_fetch_missing(
+                    SNAPSHOT_APPLIANCE_FIELDS, () if rooms else SNAPSHOT_LOCATION_FIELDS
+                )
+                for c in coordinators
+            }
+        except MilaError as err:
+            raise HomeAssistantError(f"Error communicating with API: {err}") from err
+
+        return build_snapshot(
+            coordinators,
+            {r.lower() for r in rooms} if rooms else None,
+            set(kinds) if kinds else None,
+            fetched
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        async_get_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
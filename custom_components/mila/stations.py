@@ -0,0 +1,125 @@
+"""Values derived from the outdoor and pollen stations, shared by all locations."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import logging
+from typing import Any, Callable, Iterable
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_STATIONS
+from .entities import DERIVED_INPUTS, DERIVED_VALUES
+from .entities.location.util import DERIVED_AQI, DERIVED_POLLEN
+from .util import compile_path
+
+_LOGGER = logging.getLogger(__name__)
+
+# the station each derived value is computed from
+STATION_FIELDS = {
+    DERIVED_AQI: "outdoorStation",
+    DERIVED_POLLEN: "pollenStation",
+}
+
+# the station fields each derived value reads, its cached value is kept per digest of them
+STATION_INPUTS: dict[str, tuple[Callable[[Any], Any], ...]] = {
+    path: tuple(compile_path(i) for i in DERIVED_INPUTS[path] if i.startswith(f"{station_field}."))
+    for path, station_field in STATION_FIELDS.items()
+}
+
+# digests kept per derived value of a station, so locations that see the station
+# at slightly different times do not evict each other
+STATION_DIGESTS = 2
+
+StationKey = tuple[str, str]
+
+@dataclass
+class MilaStationEntry:
+    """The values derived from a station, keyed by path and by the digest of their inputs."""
+    values: dict[tuple[str, str], Any] = field(default_factory=dict)
+    #the last station document seen per path, with its digest
+    last: dict[str, tuple[dict[str, Any], str]] = field(default_factory=dict)
+
+class MilaStationCache:
+    """
+    Process wide cache of the station values, keyed by station.
+
+    Locations (of any config entry) that use the same station share one entry, so
+    the AQI and pollen windows are computed once per distinct station reading and
+    only again when the fields they are computed from change.
+    """
+    def __init__(self):
+        self._entries: dict[StationKey, MilaStationEntry] = {}
+        self._users: dict[str, set[StationKey]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def derived_value(self, path: str, location: dict[str, Any]) -> Any:
+        """A derived value of a location, from the cache if it is computed from a station."""
+        station_field = STATION_FIELDS.get(path)
+        station = location.get(station_field) if station_field else None
+        if not isinstance(station, dict) or station.get("id") is None:
+            return DERIVED_VALUES[path](location)
+
+        entry = self._entries.setdefault((station_field, station["id"]), MilaStationEntry())
+        last = entry.last.get(path)
+        if last is not None and last[0] is station:
+            digest = last[1]
+        else:
+            digest = _digest(path, location)
+            entry.last[path] = (station, digest)
+
+        key = (path, digest)
+        if key in entry.values:
+            self.hits += 1
+            return entry.values[key]
+
+        self.misses += 1
+        value = entry.values[key] = DERIVED_VALUES[path]({station_field: station})
+        older = [k for k in entry.values if k[0] == path]
+        for k in older[:-STATION_DIGESTS]:
+            del entry.values[k]
+        return value
+
+    def retain(self, entry_id: str, locations: Iterable[dict[str, Any]]) -> None:
+        """Keep the stations used by the locations of a config entry, drop the unused ones."""
+        self._users[entry_id] = {
+            (station_field, location[station_field]["id"])
+            for location in locations
+            for station_field in STATION_FIELDS.values()
+            if isinstance(location.get(station_field), dict) and location[station_field].get("id") is not None
+        }
+        self._prune()
+
+    def release(self, entry_id: str) -> None:
+        self._users.pop(entry_id, None)
+        self._prune()
+
+    def _prune(self) -> None:
+        used = set().union(*self._users.values())
+        for key in self._entries.keys() - used:
+            del self._entries[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stations": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+def async_get_station_cache(hass: HomeAssistant) -> MilaStationCache:
+    """Return the station cache shared by all Mila config entries."""
+    cache = hass.data.get(DATA_STATIONS)
+    if cache is None:
+        cache = hass.data[DATA_STATIONS] = MilaStationCache()
+    return cache
+
+def _digest(path: str, location: dict[str, Any]) -> str:
+    """A digest of the station fields a derived value is computed from."""
+    inputs = []
+    for accessor in STATION_INPUTS[path]:
+        try:
+            inputs.append(accessor(location))
+        except KeyError:
+            inputs.append(None)
+    return json.dumps(inputs, sort_keys=True, default=str)
@@ -0,0 +1,140 @@
+"""Long-term statistics backfill for Mila appliance sensors."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+from milasdk import MilaError
+
+from .api import MilaIntegrationApi
+from .const import BACKFILL_CHUNK, BACKFILL_MAX_AGE, DOMAIN
+
+if TYPE_CHECKING:
+    from .devices import MilaAppliance
+    from .entities import MilaApplianceMeasurementSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+def statistic_id_for(device: MilaAppliance, entity: MilaApplianceMeasurementSensor) -> str:
+    """Return the external statistic id used for a measurement sensor."""
+    return f"{DOMAIN}:{slugify(f'{device.id}_{entity.sensor_kind}')}"
+
+class MilaStatisticsImporter:
+    """
+    Backfills hourly mean/min/max statistics from the Mila history.
+
+    History is pulled in bounded chunks per appliance and every chunk is written
+    with a single recorder job per sensor, resuming from the last imported hour.
+    Only sensors whose entity is enabled are backfilled.
+
+    The history goes into external statistics, not the statistics of the sensor
+    entities: those are compiled by the recorder from the states, importing into
+    them would race its hourly compile and overwrite the hours it compiled.
+    """
+    def __init__(self, hass: HomeAssistant, api: MilaIntegrationApi):
+        self._hass = hass
+        self._api = api
+        self._lock = asyncio.Lock()
+
+    async def async_backfill(self, appliances: list[MilaAppliance], enabled_entities: set[str]) -> None:
+        """Import all completed hours that are missing from the recorder."""
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.debug("Recorder is not loaded, skipping statistics backfill")
+            return
+        if self._lock.locked():
+            _LOGGER.debug("Statistics backfill already running")
+            return
+
+        async with self._lock:
+            for appliance in appliances:
+                try:
+                    await self._async_backfill_appliance(appliance, enabled_entities)
+                except (MilaError, asyncio.TimeoutError) as ex:
+                    _LOGGER.warning(f"Statistics backfill for {appliance.name_or_id} failed: {ex}")
+
+    async def _async_backfill_appliance(self, appliance: MilaAppliance, enabled_entities: set[str]) -> None:
+        from .entities import MilaApplianceMeasurementSensor
+
+        sensors = {
+            entity.sensor_kind: entity
+            for entity in appliance.entities
+            if isinstance(entity, MilaApplianceMeasurementSensor) and entity.unique_id in enabled_entities
+        }
+        if not sensors:
+            return
+
+        #only completed hours are imported, the current one is still changing
+        stop = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        oldest = stop - BACKFILL_MAX_AGE
+
+        resume: dict[str, datetime] = {}
+        for kind, entity in sensors.items():
+            last = await self._async_get_last_imported(statistic_id_for(appliance, entity))
+            resume[kind] = max(last + timedelta(hours=1), oldest) if last else oldest
+
+        start = min(resume.values())
+        if start >= stop:
+            return
+
+        _LOGGER.debug(f"Backfilling statistics for {appliance.name_or_id} from {start}")
+        while start < stop:
+            end = min(start + BACKFILL_CHUNK, stop)
+            history = await self._api.get_appliance_sensor_history(
+                appliance.id, list(sensors.keys()), start, end
+            )
+
+            for kind, rows in history.items():
+                entity = sensors.get(kind)
+                if entity is None:
+                    continue
+                statistics = [
+                    StatisticData(
+                        start=hour,
+                        mean=entity.convert_value(row.get("mean")),
+                        min=entity.convert_value(row.get("min")),
+                        max=entity.convert_value(row.get("max")),
+                    )
+                    for hour, row in sorted(rows.items())
+                    if resume[kind] <= hour < end and "mean" in row
+                ]
+                if statistics:
+                    async_add_external_statistics(
+                        self._hass, self._metadata(appliance, entity), statistics
+                    )
+
+            start = end
+
+    def _metadata(
+        self,
+        appliance: MilaAppliance,
+        entity: MilaApplianceMeasurementSensor
+    ) -> StatisticMetaData:
+        return StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{appliance.name_or_id} {entity.sensor_name}",
+            source=DOMAIN,
+            statistic_id=statistic_id_for(appliance, entity),
+            unit_of_measurement=entity.native_unit_of_measurement,
+        )
+
+    async def _async_get_last_imported(self, statistic_id: str) -> Optional[datetime]:
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, False, set()
+        )
+        if not last.get(statistic_id):
+            return None
+        start = last[statistic_id][0]["start"]
+        if isinstance(start, datetime):
+            return dt_util.as_utc(start)
+        return dt_util.utc_from_timestamp(start)
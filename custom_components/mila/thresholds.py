@@ -0,0 +1,109 @@
+"""Threshold crossings of the appliance readings."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from typing import Any, Iterable, Optional
+
+from milasdk import ApplianceSensorKind
+
+_LOGGER = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class MilaThreshold:
+    """
+    A level of a sensor kind, in the unit of its sensor entity.
+
+    A reading crosses above when it goes over `level`, and only crosses back
+    below once it drops under `level - hysteresis`.
+    """
+    sensor_kind: ApplianceSensorKind
+    level: float
+    hysteresis: float = 0.0
+
+    def __str__(self) -> str:
+        return f"{self.sensor_kind.value} {self.level:g} {self.hysteresis:g}"
+
+DEFAULT_THRESHOLDS = (
+    MilaThreshold(ApplianceSensorKind.Pm2_5, 35, 5),
+    MilaThreshold(ApplianceSensorKind.Co2, 1000, 100),
+)
+
+def parse_thresholds(text: Optional[str]) -> list[MilaThreshold]:
+    """
+    Parse thresholds, one `<sensor kind> <level> [<hysteresis>]` per line.
+
+    Raises a `ValueError` for an unknown sensor kind or a malformed line.
+    """
+    kinds = {k.value.lower(): k for k in ApplianceSensorKind}
+    thresholds = []
+    for line in (text or "").splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) not in (2, 3) or parts[0].lower() not in kinds:
+            raise ValueError(f"Invalid threshold: {line}")
+        level, hysteresis = float(parts[1]), float(parts[2]) if len(parts) == 3 else 0.0
+        if hysteresis < 0:
+            raise ValueError(f"Invalid threshold: {line}")
+        thresholds.append(MilaThreshold(kinds[parts[0].lower()], level, hysteresis))
+    return thresholds
+
+def format_thresholds(thresholds: Iterable[MilaThreshold]) -> str:
+    return "\n".join(str(t) for t in thresholds)
+
+class MilaThresholdMonitor:
+    """
+    Tracks which readings are above their thresholds and reports the crossings.
+
+    The first reading of an appliance only sets its state, so a restart does not
+    report every reading that is already above a threshold.
+    """
+    def __init__(self, thresholds: Iterable[MilaThreshold], conversions: dict[Any, float]):
+        self._thresholds: dict[Any, list[MilaThreshold]] = {}
+        for threshold in thresholds:
+            self._thresholds.setdefault(threshold.sensor_kind, []).append(threshold)
+        self._conversions = conversions
+        self._above: dict[tuple[str, MilaThreshold], bool] = {}
+
+    @property
+    def sensor_kinds(self) -> set:
+        return set(self._thresholds)
+
+    def evaluate(self, appliances: dict[str, Any]) -> list[dict[str, Any]]:
+        """Compare the latest readings with the thresholds, returning the crossings."""
+        if not self._thresholds:
+            return []
+
+        crossings = []
+        for id, appliance in appliances.items():
+            for sensor in appliance.get("sensors") or ():
+                thresholds = self._thresholds.get(sensor.get("kind"))
+                value = (sensor.get("latest") or {}).get("value")
+                if not thresholds or value is None:
+                    continue
+                value *= self._conversions.get(sensor["kind"], 1)
+                for threshold in thresholds:
+                    key = (id, threshold)
+                    was_above = self._above.get(key)
+                    if was_above:
+                        above = value >= threshold.level - threshold.hysteresis
+                    else:
+                        above = value > threshold.level
+                    self._above[key] = above
+                    if was_above is None or above == was_above:
+                        continue
+                    crossings.append({
+                        "appliance_id": id,
+                        "room": (appliance.get("room") or {}).get("name"),
+                        "kind": threshold.sensor_kind.value,
+                        "threshold": threshold.level,
+                        "value": value,
+                        "direction": "above" if above else "below",
+                    })
+        return crossings
+
+    def forget(self, appliance_ids: Iterable[str]) -> None:
+        """Drop the state of appliances that are gone."""
+        ids = set(appliance_ids)
+        self._above = {k: v for k, v in self._above.items() if k[0] not in ids}
@@ -1,28 +1,62 @@
 """Data update coordinator for Mila Air Purifiers"""
 
 import asyncio
-import async_timeout
-from datetime import timedelta
+from collections import Counter
+from http import HTTPStatus
+from datetime import datetime, timedelta
 import logging
-from typing import Any
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
+from aiohttp import web
+from graphql import DocumentNode, GraphQLError
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TIMEOUT
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_WEBHOOK_ID
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import aiohttp_client, device_registry as dr, entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from milasdk import MilaApi, MilaError, OAuthError
+from homeassistant.util import dt as dt_util
+from milasdk import ApplianceSensorKind, MilaError, OAuthError
 
-from .auth import MilaConfigEntryAuth, MilaOauthImplementation
+from .api import APPLIANCE_REQUIRED_FIELDS, LOCATION_REQUIRED_FIELDS, MilaIntegrationApi, reported_sensor_kinds
+from .auth import MilaConfigEntryAuth, MilaOauthImplementation, MilaTransferStats
 from .const import (
+    BACKFILL_INTERVAL,
+    CONF_METRICS,
+    CONF_PUSH,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    CONF_THRESHOLDS,
+    CONF_WEBHOOK,
     DATAKEY_ACCOUNT,
     DATAKEY_APPLIANCE,
+    DATAKEY_HOUSEHOLD,
     DATAKEY_LOCATION,
+    DATAKEY_STALE,
     DEFAULT_SCAN_INTERVAL,
-    DEFAULT_TIMEOUT,
-    DOMAIN
+    DOMAIN,
+    DOMAIN_STALE_INTERVALS,
+    EVENT_THRESHOLD_CROSSED,
+    PUSH_SWEEP_INTERVAL,
+    SCHEDULER_POLL_REQUESTS,
+    SENSOR_KINDS_INTERVAL,
+    SLEEP_SCAN_INTERVAL,
+    PUSH_URL
 )
-from .devices import MilaDevice, MilaAppliance, MilaLocation
+from .devices import MilaDevice, MilaAppliance, MilaHousehold, MilaLocation
+from .entities import AGGREGATE_CONVERSIONS, DERIVED_INPUTS, DERIVED_VALUES, household_aggregates
+from .fleet import async_get_fleet
+from .metrics import METRICS_APPLIANCE_FIELDS, METRICS_LOCATION_FIELDS, async_register_metrics_view
+from .planner import MilaPollPlan, MilaPollPlanner, parse_local_time
+from .push import MilaPushClient
+from .scheduler import MilaRequestScheduler, RequestPriority, request_priority
+from .smart_modes import MilaSmartModeBatcher
+from .stations import async_get_station_cache
+from .statistics import MilaStatisticsImporter
+from .thresholds import DEFAULT_THRESHOLDS, MilaThresholdMonitor, format_thresholds, parse_thresholds
+from .util import deep_merge, merge_appliance_patch
 
 PLATFORMS = ["sensor","switch","fan","select"]
 _LOGGER = logging.getLogger(__name__)
@@ -34,15 +68,75 @@ class MilaUpdateCoordinator(DataUpdateCoordinator):
         """Set up the MilaUpdateCoordinator class."""
         self._hass = hass
         self._config_entry = config_entry        
-        self._api = MilaApi(MilaConfigEntryAuth(hass, config_entry, MilaOauthImplementation(hass, config_entry)))
+        self._auth = MilaConfigEntryAuth(hass, config_entry, MilaOauthImplementation(hass, config_entry))
+        self._api = MilaIntegrationApi(self._auth)
 
         options = config_entry.options
-        self._update_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        self._timeout = options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        #not `_update_interval`, the base class keeps the current interval there
+        self._scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self._push_enabled = options.get(CONF_PUSH, False)
+        self._push: Optional[MilaPushClient] = None
+        self._webhook_id: Optional[str] = (
+            options.get(CONF_WEBHOOK_ID) if options.get(CONF_WEBHOOK, False) else None
+        )
+        self._webhook_document: Optional[DocumentNode] = None
+        self.smart_modes = MilaSmartModeBatcher(self, self._api)
+        self.metrics_enabled: bool = options.get(CONF_METRICS, False)
+        quiet_hours = (
+            parse_local_time(options.get(CONF_QUIET_START)),
+            parse_local_time(options.get(CONF_QUIET_END))
+        )
+        self._planner = MilaPollPlanner(
+            timedelta(seconds=self._scan_interval),
+            SLEEP_SCAN_INTERVAL,
+            None if None in quiet_hours else quiet_hours
+        )
+        self.poll_plan: Optional[MilaPollPlan] = None
+        try:
+            thresholds = parse_thresholds(options.get(CONF_THRESHOLDS, format_thresholds(DEFAULT_THRESHOLDS)))
+        except ValueError as ex:
+            _LOGGER.warning(f"Ignoring the Mila thresholds: {ex}")
+            thresholds = []
+        self._thresholds = MilaThresholdMonitor(thresholds, AGGREGATE_CONVERSIONS)
+        self.fleet = async_get_fleet(hass)
+        self.fleet.register(config_entry.entry_id)
+        self.scheduler.register(config_entry.entry_id, SCHEDULER_POLL_REQUESTS / self._scan_interval)
+        self.stations = async_get_station_cache(hass)
         self._initialized = False
+        self._refresh_requested = False
         self.devices: dict[str, MilaDevice] = {}
+        self.household_id = f"household_{config_entry.entry_id}"
+        self._entity_adders: dict[str, Callable] = {}
+        self.rooms: dict[str, list[str]] = {}
+        self.room_kinds: dict[str, str] = {}
+        self._appliance_rooms: dict[str, str] = {}
+        self._rooms_changed = False
+        self.appliance_sensor_kinds: dict[str, set[ApplianceSensorKind]] = {}
+        self._sensor_kinds_changed = False
+        self._sensor_kinds_listed: Optional[datetime] = None
+        self._room_commands: dict[tuple, asyncio.Task] = {}
+        self.enabled_entities: set[str] = set()
+        self.enabled_data_paths: dict[str, set[str]] = {}
+        self.enabled_sensor_kinds: set[str] = set()
+        self._statistics = MilaStatisticsImporter(hass, self._api)
+        self.last_refresh_transfer = MilaTransferStats()
+        self.last_refresh_duration: Optional[float] = None
+        self.last_success: dict[str, datetime] = {}
+        #the target interval of the current schedule (before phasing), and the
+        #longest one in effect since each domain was last updated
+        self._poll_interval = timedelta(seconds=self._scan_interval)
+        self._stale_interval: dict[str, timedelta] = {}
+        self._fetched: dict[str, tuple[list, dict[str,Any]]] = {}
+        self.domain_errors: dict[str, str] = {}
+        self.suppressed_writes: Counter[str] = Counter()
 
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=timedelta(seconds=self._update_interval))
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=self._scan_interval),
+            always_update=False
+        )
 
     async def async_setup(self):
         """Setup a new coordinator"""
@@ -51,6 +145,19 @@ class MilaUpdateCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("Getting first refresh")
         await self.async_config_entry_first_refresh()
         self._initialized = True
+        self._async_remove_registry_entries(
+            set().union(*(d.excluded_unique_ids() for d in self.devices.values()))
+        )
+        self._config_entry.async_on_unload(
+            self.async_add_listener(self._async_add_new_entities)
+        )
+        self._config_entry.async_on_unload(
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_entity_registry_updated,
+                event_filter=self._is_own_enablement_change
+            )
+        )
 
         _LOGGER.debug("Forwarding setup to platforms")
         await self.hass.config_entries.async_forward_entry_setups(
@@ -58,6 +165,24 @@ class MilaUpdateCoordinator(DataUpdateCoordinator):
             PLATFORMS
         )
 
+        if self._push_enabled:
+            _LOGGER.debug("Starting push updates")
+            await self._async_start_push()
+
+        if self._webhook_id is not None:
+            _LOGGER.debug("Registering webhook")
+            self._async_register_webhook()
+
+        if self.metrics_enabled:
+            _LOGGER.debug("Serving metrics")
+            async_register_metrics_view(self.hass)
+
+        _LOGGER.debug("Scheduling statistics backfill")
+        self._async_schedule_backfill()
+        self._config_entry.async_on_unload(
+            async_track_time_interval(self.hass, self._async_schedule_backfill, BACKFILL_INTERVAL)
+        )
+
         return True
 
     async def async_reset(self):
@@ -68,54 +193,681 @@ class MilaUpdateCoordinator(DataUpdateCoordinator):
             self._config_entry, 
             PLATFORMS
         )
+        if unload_ok:
+            await self.async_shutdown()
         return unload_ok
 
+    async def async_shutdown(self) -> None:
+        """Stop refreshing and drop everything the coordinator holds on to."""
+        await super().async_shutdown()
+        self.fleet.unregister(self._config_entry.entry_id)
+        self.scheduler.unregister(self._config_entry.entry_id)
+        self.stations.release(self._config_entry.entry_id)
+
+        self.smart_modes.async_cancel()
+        for task in self._room_commands.values():
+            task.cancel()
+        self._room_commands.clear()
+        self._push = None
+        self._webhook_document = None
+        self._entity_adders.clear()
+        self.devices.clear()
+        self.rooms.clear()
+        self.room_kinds.clear()
+        self.appliance_sensor_kinds.clear()
+        self._sensor_kinds_listed = None
+        self._appliance_rooms.clear()
+        self.enabled_entities.clear()
+        self.enabled_data_paths.clear()
+        self.enabled_sensor_kinds.clear()
+        self._auth.clear_cache()
+        self._fetched.clear()
+        self._initialized = False
+        self.data = None
+
+    async def _async_start_push(self) -> None:
+        self._push = MilaPushClient(
+            aiohttp_client.async_get_clientsession(self.hass),
+            self._auth,
+            self._api,
+            PUSH_URL,
+            lambda id: self._api.appliance_subscription(id, self._query_fields()[0], self.enabled_sensor_kinds),
+            self._async_handle_push_update,
+            self._async_push_connection_changed
+        )
+        await self._push.async_set_appliances(self._appliance_ids())
+        self._config_entry.async_create_background_task(
+            self.hass,
+            self._push.async_run(),
+            f"{DOMAIN} push updates"
+        )
+
+    @callback
+    def _async_handle_push_update(self, appliance: dict[str,Any]) -> None:
+        """Apply an appliance update received from the subscription."""
+        if self.data is None or appliance.get("id") not in self.data[DATAKEY_APPLIANCE]:
+            return
+
+        appliances = dict(self.data[DATAKEY_APPLIANCE])
+        appliances[appliance["id"]] = deep_merge(appliances[appliance["id"]], appliance)
+        self._mark_updated(DATAKEY_APPLIANCE)
+        self._async_fire_threshold_events(appliances)
+        self._async_set_patched_data(self._with_appliances(appliances))
+
+    @callback
+    def _async_register_webhook(self) -> None:
+        webhook.async_register(
+            self.hass, DOMAIN, "Mila", self._webhook_id, self._async_handle_webhook
+        )
+        self._config_entry.async_on_unload(
+            lambda: webhook.async_unregister(self.hass, self._webhook_id)
+        )
+        _LOGGER.info(
+            f"Accepting Mila readings at {webhook.async_generate_url(self.hass, self._webhook_id)}"
+        )
+
+    async def _async_handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """
+        Accept a batch of appliance patches pushed by a relay.
+
+        The payload is `{"appliances": [<partial appliance document>, ...]}`, every
+        patch has the appliance `id` and sensor readings are merged by `kind`.
+        """
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Invalid JSON")
+        if not isinstance(payload, dict) or not isinstance(payload.get("appliances"), list):
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Expected a list of appliances")
+
+        applied = self.async_apply_appliance_patches(payload["appliances"])
+        return web.json_response({"applied": applied})
+
+    @callback
+    def async_apply_appliance_patches(self, patches: list[dict[str,Any]]) -> int:
+        """Merge a batch of appliance patches, notifying the entities once."""
+        if self.data is None:
+            return 0
+        if self._webhook_document is None:
+            self._webhook_document = self._api.appliance_subscription("webhook")
+
+        appliances = dict(self.data[DATAKEY_APPLIANCE])
+        applied = 0
+        for patch in patches:
+            if not isinstance(patch, dict) or patch.get("id") not in appliances:
+                continue
+            try:
+                patch = self._api.parse_result(self._webhook_document, {"appliance": patch})["appliance"]
+            except (GraphQLError, TypeError, ValueError) as ex:
+                _LOGGER.warning(f"Ignoring invalid Mila patch for {patch.get('id')}: {ex}")
+                continue
+            appliances[patch["id"]] = merge_appliance_patch(appliances[patch["id"]], patch)
+            applied += 1
+
+        if applied:
+            self._mark_updated(DATAKEY_APPLIANCE)
+            self._async_fire_threshold_events(appliances)
+            self._async_set_patched_data(self._with_appliances(appliances))
+        return applied
+
+    @callback
+    def async_patch_appliance(self, appliance_id: str, patch: dict[str,Any]) -> None:
+        """Apply a local (e.g. optimistic) change to an appliance document."""
+        if self.data is None or appliance_id not in self.data[DATAKEY_APPLIANCE]:
+            return
+        appliances = dict(self.data[DATAKEY_APPLIANCE])
+        appliances[appliance_id] = deep_merge(appliances[appliance_id], patch)
+        self._async_set_patched_data(self._with_appliances(appliances))
+
+    @callback
+    def _async_set_patched_data(self, data: dict[str,Any]) -> None:
+        """
+        Notify the entities of patched data.
+
+        Unlike `async_set_updated_data` the next poll stays where it is scheduled,
+        frequent patches would otherwise keep pushing back the sweep.
+        """
+        self.data = data
+        self.async_update_listeners()
+
+    @callback
+    def _async_fire_threshold_events(self, appliances: dict[str,Any]) -> None:
+        """Fire an event for every reading that crossed a threshold."""
+        for crossing in self._thresholds.evaluate(appliances):
+            self.hass.bus.async_fire(EVENT_THRESHOLD_CROSSED, {"entry_id": self.entry_id, **crossing})
+
+    def _with_appliances(self, appliances: dict[str,Any]) -> dict[str,Any]:
+        """The current data with new appliance documents, and the aggregates over them."""
+        data = {
+            **self.data,
+            DATAKEY_APPLIANCE: appliances,
+            DATAKEY_HOUSEHOLD: {self.household_id: household_aggregates(appliances)},
+        }
+        data[DATAKEY_STALE] = self._stale_domains()
+        return data
+
+    @callback
+    def _async_push_connection_changed(self, connected: bool) -> None:
+        """Poll slowly while push is connected, at the normal rate otherwise."""
+        self._update_poll_interval()
+        if not connected:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    def _update_poll_interval(self) -> None:
+        """
+        Poll at the configured rate, slower while push is connected, and slower
+        still while the rooms are asleep (until they wake up).
+        """
+        interval = timedelta(seconds=self._scan_interval)
+        if self._push is not None and self._push.connected:
+            interval = max(interval, timedelta(seconds=PUSH_SWEEP_INTERVAL))
+        asleep = self.poll_plan is not None and self.poll_plan.asleep
+        if asleep:
+            interval = max(interval, self.poll_plan.interval)
+
+        self._poll_interval = interval
+        for key, longest in self._stale_interval.items():
+            self._stale_interval[key] = max(longest, interval)
+
+        if asleep:
+            #the sleep interval already targets the wake-up time
+            self.update_interval = interval
+            return
+        #poll in this account's own slot of the interval
+        self.update_interval = self.fleet.phase(self._config_entry.entry_id, interval)
+
+    @property
+    def entry_id(self) -> str:
+        return self._config_entry.entry_id
+
+    @property
+    def transfer_stats(self) -> MilaTransferStats:
+        return self._auth.stats
+
+    @property
+    def scheduler(self) -> MilaRequestScheduler:
+        return self._auth.scheduler
+
+    def _appliance_ids(self) -> list[str]:
+        return [d.id for d in self.devices.values() if isinstance(d, MilaAppliance)]
+
+    @callback
+    def _async_schedule_backfill(self, *_) -> None:
+        """Backfill long-term statistics in the background."""
+        appliances = [d for d in self.devices.values() if isinstance(d, MilaAppliance)]
+        self._config_entry.async_create_background_task(
+            self.hass,
+            self._statistics.async_backfill(appliances, self.enabled_entities),
+            f"{DOMAIN} statistics backfill"
+        )
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, sent ahead of the background polls."""
+        self._refresh_requested = True
+        await super().async_request_refresh()
+
     async def _async_update_data(self):
+        priority = RequestPriority.REFRESH if self._refresh_requested else RequestPriority.POLL
+        self._refresh_requested = False
+        async with self.fleet.refresh():
+            start = self.hass.loop.time()
+            with request_priority(priority):
+                data = await self._async_fetch_data()
+            self.last_refresh_duration = self.hass.loop.time() - start
+        return data
+
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        transfer_start = self._auth.stats.copy()
+        previous = self.data or {}
         try:
             data = {}
 
-            #get the list of known appliances
-            existing_appliances: list[str] = self.data.get(DATAKEY_APPLIANCE).keys() if self.data is not None else []
-            
             #only need to get the account info the first time
-            if not self._initialized:
-                async with async_timeout.timeout(self._timeout):
-                    data[DATAKEY_ACCOUNT] = await self._api.get_account()
+            if DATAKEY_ACCOUNT in previous:
+                data[DATAKEY_ACCOUNT] = previous[DATAKEY_ACCOUNT]
+            else:
+                await self._async_fetch_domain(data, DATAKEY_ACCOUNT, self._api.get_account)
+
+            #until the devices are known, get the full documents
+            appliance_fields, location_fields = self._query_fields()
+
+            async def get_appliances():
+                #a full document lists every sensor, a narrowed one only now and then
+                now = dt_util.utcnow()
+                list_kinds = (
+                    appliance_fields is None
+                    or self._sensor_kinds_listed is None
+                    or now - self._sensor_kinds_listed >= SENSOR_KINDS_INTERVAL
+                )
+                appliances = await self._api.get_appliances(
+                    appliance_fields, self.enabled_sensor_kinds, list_other_kinds=list_kinds
+                )
+                if list_kinds:
+                    self._sensor_kinds_listed = now
+                return self._reuse_unchanged(DATAKEY_APPLIANCE, appliances, lambda x: x["id"])
 
-            async with async_timeout.timeout(self._timeout):
-                data[DATAKEY_APPLIANCE] = {x["id"]: x for x in await self._api.get_appliances()}
-            async with async_timeout.timeout(self._timeout):
-                data[DATAKEY_LOCATION] = {f"loc_{x['id']}": x for x in await self._api.get_location_data()}
+            async def get_locations():
+                return self._reuse_unchanged(
+                    DATAKEY_LOCATION,
+                    await self._api.get_location_data(location_fields),
+                    lambda x: f"loc_{x['id']}"
+                )
+
+            fetched = [
+                await self._async_fetch_domain(data, DATAKEY_APPLIANCE, get_appliances),
+                await self._async_fetch_domain(data, DATAKEY_LOCATION, get_locations),
+            ]
+            if not any(fetched):
+                errors = ", ".join(f"{k}: {v}" for k, v in self.domain_errors.items())
+                raise UpdateFailed(f"Error communicating with API: {errors}")
+
+            self._update_room_index(data[DATAKEY_APPLIANCE])
+            self._update_sensor_kind_index(data[DATAKEY_APPLIANCE])
 
             #build the device list if needed
             if not self._initialized:
-                await self._build_devices(data)
-            else:
-                #detect new devices and notify the user
-                await self._detect_new_devices(existing_appliances, data[DATAKEY_APPLIANCE])
+                self._build_devices(data)
+                self._async_update_enabled_entities()
+            elif all(fetched):
+                #drop devices that are no longer on the account
+                await self._async_remove_vanished_devices(data)
 
+            self._compute_derived_values(data)
+            data[DATAKEY_HOUSEHOLD] = {self.household_id: household_aggregates(data[DATAKEY_APPLIANCE])}
+            #an unchanged snapshot can't cross anything
+            if data[DATAKEY_APPLIANCE] is not previous.get(DATAKEY_APPLIANCE):
+                self._async_fire_threshold_events(data[DATAKEY_APPLIANCE])
+            #entities compute their availability on updates, so a domain going
+            #stale has to change the data even when its snapshot is reused
+            data[DATAKEY_STALE] = self._stale_domains()
+
+            plan = self._planner.plan(data[DATAKEY_APPLIANCE].values())
+            if self.poll_plan is None or plan.asleep != self.poll_plan.asleep:
+                _LOGGER.debug(f"Mila poll plan: {plan.reason}, polling every {plan.interval}")
+            self.poll_plan = plan
+            self._update_poll_interval()
+
+            self.last_refresh_transfer = self._auth.stats.since(transfer_start)
             return data
         except (OAuthError) as ex:
             raise ConfigEntryAuthFailed from ex            
         except MilaError as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
 
-    async def _build_devices(self, data: dict[str,Any]):
-        for id in data[DATAKEY_APPLIANCE].keys():
+    async def _async_fetch_domain(
+        self,
+        data: dict[str,Any],
+        key: str,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        Fetch one data domain, keeping its previous snapshot if that fails.
+
+        A domain without a previous snapshot can't be skipped and fails the refresh.
+        """
+        try:
+            data[key] = await fetch()
+        except OAuthError:
+            raise
+        except (MilaError, asyncio.TimeoutError) as err:
+            previous = self.data or {}
+            if key not in previous:
+                raise UpdateFailed(f"Error communicating with API: {err}") from err
+            _LOGGER.warning(f"Failed to update Mila {key} data, keeping the last known values: {err}")
+            self.domain_errors[key] = str(err) or type(err).__name__
+            data[key] = previous[key]
+            return False
+
+        self._mark_updated(key)
+        self.domain_errors.pop(key, None)
+        return True
+
+    def _mark_updated(self, key: str) -> None:
+        """Record fresh data for a domain, from a poll, a push event or a webhook."""
+        self.last_success[key] = dt_util.utcnow()
+        self._stale_interval[key] = self._poll_interval
+
+    def is_domain_stale(self, key: Optional[str]) -> bool:
+        """
+        True if a data domain has not been updated for longer than it is trusted.
+
+        That is a number of poll intervals, measured in the longest interval polled
+        at since the last update (e.g. the push sweep or the sleep interval).
+        """
+        intervals = DOMAIN_STALE_INTERVALS.get(key)
+        last_success = self.last_success.get(key)
+        if intervals is None or last_success is None:
+            return False
+        interval = self._stale_interval.get(key, self._poll_interval)
+        return dt_util.utcnow() - last_success > interval * intervals
+
+    def _stale_domains(self) -> list[str]:
+        return sorted(k for k in DOMAIN_STALE_INTERVALS if self.is_domain_stale(k))
+
+    def _build_devices(self, data: dict[str,Any]) -> list[MilaDevice]:
+        """Create the devices that are not known yet."""
+        devices: list[MilaDevice] = []
+        for id in data[DATAKEY_APPLIANCE].keys() - self.devices.keys():
             _LOGGER.info(f"Found Mila device with id={id}, setting up...")
-            self.devices[id] = MilaAppliance(self, self._api, id)
-        for id in data[DATAKEY_LOCATION].keys():
+            devices.append(MilaAppliance(self, self._api, id))
+        for id in data[DATAKEY_LOCATION].keys() - self.devices.keys():
             _LOGGER.info(f"Found Mila location with id={id}, setting up...")
-            self.devices[id] = MilaLocation(self, self._api, id)
+            devices.append(MilaLocation(self, self._api, id))
+        if self.household_id not in self.devices:
+            devices.append(MilaHousehold(self, self._api, self.household_id))
 
-    async def _detect_new_devices(self, old: list[str], new: dict[str,Any]):
-        diff = set(new)-set(old)
-        for id in diff:
-            _LOGGER.info(
-                f"New device with id={id} detected, reload the Mila integration if you want to access it in Home Assistant"
-            )
+        for device in devices:
+            self.devices[device.id] = device
+        return devices
+
+    @callback
+    def async_register_entity_adder(self, platform: str, async_add_entities: Callable) -> None:
+        """Keep a platform's add callback so devices found later can be added to it."""
+        self._entity_adders[platform] = async_add_entities
+
+    @callback
+    def _async_add_new_entities(self) -> None:
+        """Set up devices that appeared on the account since the last refresh."""
+        if not self._initialized or self.data is None:
+            return
+
+        devices = self._build_devices(self.data)
+        entities = [entity for device in devices for entity in device.entities]
+        if devices and self._push is not None:
+            self.hass.async_create_task(self._push.async_set_appliances(self._appliance_ids()))
+
+        #room membership changed, the entities of a room may have moved to another
+        #appliance, or an appliance started reporting a new sensor kind
+        removed = []
+        if self._rooms_changed or self._sensor_kinds_changed:
+            self._rooms_changed = False
+            self._sensor_kinds_changed = False
+            for device in self.devices.values():
+                if device not in devices:
+                    entities.extend(device.update_entities())
+                removed.extend(device.remove_excluded_entities())
+
+        if removed:
+            #removing the registry entry also removes the entity
+            self._async_remove_registry_entries({e.unique_id for e in removed})
+        if not entities and not removed:
+            return
+
+        self._async_update_enabled_entities()
+        by_platform: dict[str, list] = {}
+        for entity in entities:
+            by_platform.setdefault(entity.platform_domain, []).append(entity)
+        for platform, platform_entities in by_platform.items():
+            if platform in self._entity_adders:
+                self._entity_adders[platform](platform_entities)
+
+    def _update_room_index(self, appliances: dict[str,Any]) -> None:
+        """Index the appliances by the room they are in."""
+        rooms: dict[str, list[str]] = {}
+        room_kinds: dict[str, str] = {}
+        appliance_rooms: dict[str, str] = {}
+        for id, appliance in appliances.items():
+            room = appliance.get("room") or {}
+            room_id = room.get("id")
+            if room_id is None:
+                continue
+            rooms.setdefault(room_id, []).append(id)
+            appliance_rooms[id] = room_id
+            if room.get("kind"):
+                room_kinds[room_id] = room["kind"]
+        for ids in rooms.values():
+            ids.sort()
+
+        if self.rooms and (rooms != self.rooms or room_kinds != self.room_kinds):
+            self._rooms_changed = True
+        self.rooms = rooms
+        self.room_kinds = room_kinds
+        self._appliance_rooms = appliance_rooms
+
+    def _update_sensor_kind_index(self, appliances: dict[str,Any]) -> None:
+        """
+        Index the sensor kinds each appliance reports.
+
+        Kinds are only ever added, an appliance that misses a reading keeps its
+        entity until the next restart.
+        """
+        sensor_kinds: dict[str, set[ApplianceSensorKind]] = {}
+        for id, appliance in appliances.items():
+            known = self.appliance_sensor_kinds.get(id)
+            kinds = reported_sensor_kinds(appliance)
+            if known is not None and not kinds <= known:
+                self._sensor_kinds_changed = True
+            sensor_kinds[id] = kinds | (known or set())
+        self.appliance_sensor_kinds = sensor_kinds
+
+    @callback
+    def _async_remove_registry_entries(self, unique_ids: set[str]) -> None:
+        """Remove the registry entries of entities no device carries (any more)."""
+        registry = er.async_get(self.hass)
+        for entry in er.async_entries_for_config_entry(registry, self._config_entry.entry_id):
+            if entry.unique_id in unique_ids:
+                _LOGGER.info(f"Removing {entry.entity_id}, no Mila device carries it")
+                registry.async_remove(entry.entity_id)
+
+    def room_of(self, appliance_id: str) -> Optional[str]:
+        return self._appliance_rooms.get(appliance_id)
+
+    def is_room_primary(self, appliance_id: str) -> bool:
+        """Room level entities are only created on the first appliance of each room."""
+        room_id = self.room_of(appliance_id)
+        return room_id is None or self.rooms[room_id][0] == appliance_id
+
+    async def async_room_command(self, room_id: str, key: tuple, command: Callable[[], Awaitable]) -> None:
+        """
+        Issue a room command once, even when several appliances in the room request it.
+
+        Identical commands for the same room that arrive while one is in flight wait
+        for that one instead of being sent again.
+        """
+        command_key = (room_id, *key)
+        pending = self._room_commands.get(command_key)
+        if pending is None:
+            pending = self.hass.async_create_task(command())
+            self._room_commands[command_key] = pending
+            pending.add_done_callback(lambda _: self._room_commands.pop(command_key, None))
+        await asyncio.shield(pending)
+
+    @callback
+    def _async_update_enabled_entities(self) -> None:
+        """Track which entities are enabled and which data paths they read."""
+        registry = er.async_get(self.hass)
+        entries = {
+            entry.unique_id: entry
+            for entry in er.async_entries_for_config_entry(registry, self._config_entry.entry_id)
+        }
+
+        enabled_entities: set[str] = set()
+        enabled_data_paths: dict[str, set[str]] = {}
+        enabled_sensor_kinds: set[str] = set()
+        for device in self.devices.values():
+            paths = enabled_data_paths.setdefault(device.id, set())
+            for entity in device.entities:
+                entry = entries.get(entity.unique_id)
+                if entry is not None and entry.disabled_by is not None:
+                    continue
+                if entry is None and not entity.entity_registry_enabled_default:
+                    continue
+                enabled_entities.add(entity.unique_id)
+                paths.update(entity.data_paths)
+                enabled_sensor_kinds.update(entity.sensor_kinds)
+
+        if self.metrics_enabled:
+            #the metrics page has every sensor kind
+            enabled_sensor_kinds.update(ApplianceSensorKind)
+        enabled_sensor_kinds.update(self._thresholds.sensor_kinds)
+
+        self.enabled_entities = enabled_entities
+        self.enabled_data_paths = enabled_data_paths
+        self.enabled_sensor_kinds = enabled_sensor_kinds
+
+    def _query_fields(self) -> tuple[Optional[set[str]], Optional[set[str]]]:
+        """The appliance and location fields read by enabled entities."""
+        if not self._initialized:
+            return None, None
+
+        appliance_fields: set[str] = set()
+        location_fields: set[str] = set()
+        if self.metrics_enabled:
+            appliance_fields.update(METRICS_APPLIANCE_FIELDS)
+            location_fields.update(METRICS_LOCATION_FIELDS)
+        if self._thresholds.sensor_kinds:
+            appliance_fields.update(("sensors", "room.name"))
+        for device in self.devices.values():
+            paths = self.enabled_data_paths.get(device.id, ())
+            if isinstance(device, (MilaAppliance, MilaHousehold)):
+                appliance_fields.update(paths)
+            elif isinstance(device, MilaLocation):
+                for path in paths:
+                    location_fields.update(DERIVED_INPUTS.get(path, (path,)))
+        return appliance_fields, location_fields
+
+    async def async_fetch_missing(
+        self,
+        appliance_fields: Iterable[str],
+        location_fields: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch the domains whose polled query leaves out some of the given fields.
+
+        Appliances are fetched with the sensors of every reported kind. Returns only
+        the fetched domains, the polled data is left as it is.
+        """
+        polled_appliance_fields, polled_location_fields = self._query_fields()
+        reported_kinds: set[ApplianceSensorKind] = set().union(*self.appliance_sensor_kinds.values())
+        fetched: dict[str, dict[str, Any]] = {}
+        with request_priority(RequestPriority.REFRESH):
+            if polled_appliance_fields is not None and (
+                not _covers([*APPLIANCE_REQUIRED_FIELDS, *polled_appliance_fields], appliance_fields)
+                or not reported_kinds <= self.enabled_sensor_kinds
+            ):
+                appliances = await self._api.get_appliances(appliance_fields, reported_kinds)
+                fetched[DATAKEY_APPLIANCE] = {a["id"]: a for a in appliances}
+            if polled_location_fields is not None and not _covers(
+                [*LOCATION_REQUIRED_FIELDS, *polled_location_fields], location_fields
+            ):
+                locations = await self._api.get_location_data(location_fields)
+                fetched[DATAKEY_LOCATION] = {f"loc_{l['id']}": l for l in locations}
+        return fetched
+
+    @callback
+    def _is_own_enablement_change(self, event_data: er.EventEntityRegistryUpdatedData) -> bool:
+        """True for registry changes that can enable or disable entities of this entry."""
+        if event_data["action"] == "update" and "disabled_by" not in event_data["changes"]:
+            return False
+        entity_id = event_data["entity_id"]
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is not None:
+            return entry.config_entry_id == self._config_entry.entry_id
+        #a removed entry is no longer in the registry
+        return any(e.entity_id == entity_id for d in self.devices.values() for e in d.entities)
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        self._async_update_enabled_entities()
+
+    def _compute_derived_values(self, data: dict[str,Any]) -> None:
+        """
+        Compute values that are not in the API response, only for enabled entities.
+
+        Station values come from the shared station cache.
+        """
+        locations = data[DATAKEY_LOCATION]
+        self.stations.retain(self.entry_id, locations.values())
+        updated: dict[str,Any] = {}
+        for id, location in locations.items():
+            paths = self.enabled_data_paths.get(id, ())
+            wanted = {path for path in DERIVED_VALUES if path in paths}
+            derived = location.get("derived")
+            #unchanged locations keep what was computed for them
+            if derived is not None and {f"derived.{k}" for k in derived} == wanted:
+                continue
+            #on a copy, the document itself may be a cached response
+            updated[id] = {**location, "derived": {
+                path.split(".", 1)[1]: self.stations.derived_value(path, location)
+                for path in wanted
+            }}
+        if not updated:
+            return
+
+        data[DATAKEY_LOCATION] = {**locations, **updated}
+        #an unchanged response keeps reusing the locations with their derived values
+        last = self._fetched.get(DATAKEY_LOCATION)
+        if last is not None and last[1] is locations:
+            self._fetched[DATAKEY_LOCATION] = (last[0], data[DATAKEY_LOCATION])
+
+    def _reuse_unchanged(
+        self,
+        key: str,
+        fetched: list[dict[str,Any]],
+        id_of: Callable[[dict[str,Any]], str]
+    ) -> dict[str,Any]:
+        """
+        Keep the previous object for documents that did not change.
+
+        A response answered from the cache is the same list that was parsed last
+        time, its snapshot is reused as a whole unless something patched it since.
+        Otherwise unchanged documents compare by identity, and a refresh where
+        nothing changed does not notify the entities at all.
+        """
+        previous = self.data.get(key) if self.data is not None else None
+        last = self._fetched.get(key)
+        if previous and last is not None and last[0] is fetched and last[1] is previous:
+            return previous
+
+        documents = {id_of(x): x for x in fetched}
+        if previous:
+            for id, document in documents.items():
+                old = previous.get(id)
+                if old is not None and _without_derived(old) == document:
+                    documents[id] = old
+            if documents == previous:
+                documents = previous
+        self._fetched[key] = (fetched, documents)
+        return documents
+
+    async def _async_remove_vanished_devices(self, data: dict[str,Any]):
+        """Remove devices (and their entities) that are no longer on the account."""
+        current = data[DATAKEY_APPLIANCE].keys() | data[DATAKEY_LOCATION].keys() | {self.household_id}
+        vanished = [id for id in self.devices if id not in current]
+        if not vanished:
+            return
+
+        self._thresholds.forget(vanished)
+        device_registry = dr.async_get(self.hass)
+        for id in vanished:
+            _LOGGER.info(f"Mila device with id={id} was removed from the account, removing it...")
+            device = self.devices.pop(id)
+            for entity in device.entities:
+                if entity.hass is not None:
+                    await entity.async_remove(force_remove=True)
+
+            device_entry = device_registry.async_get_device(identifiers={(DOMAIN, id)})
+            if device_entry is not None:
+                device_registry.async_update_device(
+                    device_entry.id, remove_config_entry_id=self._config_entry.entry_id
+                )
+
+        if self._push is not None:
+            await self._push.async_set_appliances(self._appliance_ids())
+
+def _without_derived(document: dict[str,Any]) -> dict[str,Any]:
+    if "derived" not in document:
+        return document
+    return {k: v for k, v in document.items() if k != "derived"}
+
+def _covers(fields: Iterable[str], paths: Iterable[str]) -> bool:
+    """True if a query of (dotted) `fields` has every path in `paths`."""
+    fields = set(fields)
+    return all(any(p == f or p.startswith(f"{f}.") for f in fields) for p in paths)
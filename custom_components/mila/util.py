@@ -1,4 +1,6 @@
+from functools import lru_cache
 from re import finditer
+from typing import Any, Callable
 import math
 
 def camel_case_split(identifier):
@@ -7,3 +9,50 @@ def camel_case_split(identifier):
 
 def coalesce(*arg): 
     return next((a for a in arg if a is not None), None)
+
+def deep_merge(base: dict, patch: dict) -> dict:
+    """Return a copy of base with patch applied, merging nested dicts."""
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def merge_appliance_patch(appliance: dict, patch: dict) -> dict:
+    """Apply a partial appliance document, replacing sensor readings by kind."""
+    sensors = patch.get("sensors")
+    merged = deep_merge(appliance, {k: v for k, v in patch.items() if k != "sensors"})
+    if sensors is not None:
+        by_kind = {s.get("kind"): s for s in appliance.get("sensors") or []}
+        for sensor in sensors:
+            by_kind[sensor.get("kind")] = deep_merge(by_kind.get(sensor.get("kind"), {}), sensor)
+        merged["sensors"] = list(by_kind.values())
+    return merged
+
+@lru_cache(maxsize=None)
+def compile_path(data_path: str) -> Callable[[Any], Any]:
+    """
+    Compile a dotted path (`a.b[-1].c`) into a function that reads it from a document.
+
+    Missing keys, indexes or intermediate values raise a `KeyError`.
+    """
+    keys: list = []
+    for part in data_path.split("."):
+        name, *indexes = part.split("[")
+        if name:
+            keys.append(name)
+        keys.extend(int(i.rstrip("]")) for i in indexes)
+    keys = tuple(keys)
+
+    def accessor(document: Any) -> Any:
+        value = document
+        try:
+            for key in keys:
+                value = value[key]
+        except (IndexError, TypeError) as ex:
+            raise KeyError(data_path) from ex
+        return value
+
+    return accessor
@@ -0,0 +1,163 @@
+"""Fixtures for the Mila tests."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+from typing import Any, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientResponseError
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from multidict import CIMultiDict
+from milasdk import ApplianceMode, ApplianceSensorKind, SoundsConfig
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mila.api import SENSOR_KINDS_ALIAS, MilaIntegrationApi
+from custom_components.mila.auth import MilaConfigEntryAuth, MilaOauthImplementation
+from custom_components.mila.const import CONF_THRESHOLDS, CONF_TOKEN, DOMAIN
+from custom_components.mila.smart_modes import SMART_MODE_KEYS
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+def make_appliance(
+    id: str,
+    room_id: str = "room1",
+    readings: Optional[dict[ApplianceSensorKind, Optional[float]]] = None
+) -> dict[str, Any]:
+    """An appliance document as the API returns it, parsed."""
+    if readings is None:
+        readings = {ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.Co2: 600.0}
+    sensors = [{"kind": k, "latest": {"value": v}} for k, v in readings.items()]
+    return {
+        "id": id,
+        "name": f"Mila {id}",
+        "room": {
+            "id": room_id,
+            "kind": "Bedroom",
+            "name": f"Room {room_id}",
+            "bedtime": {"localStart": None, "localEnd": None},
+            "soundsConfig": SoundsConfig.Enabled,
+        },
+        "state": {"actualMode": ApplianceMode.Automagic, "firmware": {"version": "1.0"}},
+        "smartModes": {key: {"isEnabled": False} for key in SMART_MODE_KEYS.values()},
+        "sensors": sensors,
+    }
+
+def make_location(id: str = "1") -> dict[str, Any]:
+    return {
+        "id": id,
+        "address": {"city": "Brooklyn", "country": "US"},
+        "outdoorStation": {"id": f"station{id}", "name": "Station", "sensor": {"latest": {"value": 8.0}}},
+        "pollenStation": None,
+    }
+
+class MockMilaApi:
+    """The documents served by the patched API, change them to change the next refresh."""
+    def __init__(self):
+        self.appliances = [make_appliance("a1")]
+        self.locations = [make_location()]
+        self.get_account = AsyncMock(return_value={"id": "owner"})
+        self.get_appliances = AsyncMock(side_effect=self._get_appliances)
+        self.get_location_data = AsyncMock(side_effect=self._get_locations)
+        self.set_smart_mode = AsyncMock()
+
+    async def _get_appliances(self, fields=None, sensor_kinds=None, list_other_kinds=False):
+        appliances = copy.deepcopy(self.appliances)
+        if fields is None:
+            return appliances
+        #like the API, only the requested sensor kinds and smart modes
+        for appliance in appliances:
+            sensors = appliance.pop("sensors")
+            appliance["sensors"] = [s for s in sensors if s["kind"] in set(sensor_kinds or ())]
+            if list_other_kinds:
+                appliance[SENSOR_KINDS_ALIAS] = [s for s in sensors if s not in appliance["sensors"]]
+            if not any(f.split(".")[0] == "smartModes" for f in fields):
+                del appliance["smartModes"]
+        return appliances
+
+    async def _get_locations(self, fields=None):
+        return copy.deepcopy(self.locations)
+
+@pytest.fixture
+def mock_api():
+    api = MockMilaApi()
+    with patch.multiple(
+        MilaIntegrationApi,
+        get_account=api.get_account,
+        get_appliances=api.get_appliances,
+        get_location_data=api.get_location_data,
+        set_smart_mode=api.set_smart_mode,
+    ):
+        yield api
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="test@example.com",
+        unique_id="test@example.com",
+        data={
+            CONF_EMAIL: "test@example.com",
+            CONF_PASSWORD: "password",
+            CONF_TOKEN: {"access_token": "token", "refresh_token": "refresh", "expires_at": 4102444800},
+        },
+        options={CONF_THRESHOLDS: ""},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+async def setup_entry(hass: HomeAssistant, entry: MockConfigEntry):
+    """Set up a config entry and return its coordinator."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+class FakeResponse:
+    def __init__(self, status: int, body: bytes, headers: dict, delay: float = 0):
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self._body = body
+        self._delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def read(self) -> bytes:
+        await asyncio.sleep(self._delay)
+        return self._body
+
+    def get_encoding(self) -> str:
+        return "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise ClientResponseError(MagicMock(), (), status=self.status, headers=self.headers)
+
+class FakeSession:
+    """Answers every post with the next queued response."""
+    def __init__(self, responses: list[FakeResponse]):
+        self.responses = responses
+        self.headers: list[dict] = []
+        self.payloads: list[Any] = []
+
+    def post(self, url, headers=None, **kwargs):
+        self.headers.append(dict(headers))
+        self.payloads.append(kwargs.get("json"))
+        return self.responses.pop(0)
+
+def appliances_body(value: float) -> bytes:
+    return json.dumps({"data": {"owner": {"appliances": [{
+        "id": "a1",
+        "sensors": [{"kind": "Pm2_5", "latest": {"value": value}}],
+    }]}}}).encode()
+
+def make_auth(hass: HomeAssistant, config_entry: MockConfigEntry) -> MilaConfigEntryAuth:
+    return MilaConfigEntryAuth(hass, config_entry, MilaOauthImplementation(hass, config_entry))
@@ -0,0 +1,51 @@
+"""Tests for the queries of the integration."""
+import json
+from unittest.mock import AsyncMock, patch
+
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.api import SENSOR_KINDS_ALIAS, MilaIntegrationApi
+
+from .conftest import FakeResponse, FakeSession, make_auth, setup_entry
+
+def body(data: dict) -> bytes:
+    return json.dumps({"data": data}).encode()
+
+async def test_narrowed_queries_select_only_the_requested_fields(hass, config_entry):
+    """The query sent on the wire has only the requested paths and sensor kinds."""
+    auth = make_auth(hass, config_entry)
+    appliances = body({"owner": {"appliances": []}})
+    locations = body({"owner": {"locations": []}})
+    auth._session = FakeSession([FakeResponse(200, b, {}) for b in (appliances, appliances, appliances, locations, locations)])
+    api = MilaIntegrationApi(auth)
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")):
+        await api.get_appliances()
+        await api.get_appliances(["sensors"], [ApplianceSensorKind.Pm2_5])
+        await api.get_appliances(["sensors"], [ApplianceSensorKind.Pm2_5], list_other_kinds=True)
+        await api.get_location_data()
+        await api.get_location_data(["outdoorStation.name"])
+
+    full, narrowed, listing, full_locations, narrowed_locations = (p["query"] for p in auth._session.payloads)
+    for field in ("filter", "wifiRssi", "soundsConfig"):
+        assert field in full and field not in narrowed
+    assert "sensors(kinds: [Pm2_5])" in narrowed
+    assert SENSOR_KINDS_ALIAS not in narrowed
+    #the listing only covers the kinds left out of the poll
+    other_kinds = listing.split(f"{SENSOR_KINDS_ALIAS}: sensors(")[1].split("]")[0]
+    assert "Pm2_5" not in other_kinds and "Co2" in other_kinds
+    for field in ("timezone", "point", "pollenStation"):
+        assert field in full_locations and field not in narrowed_locations
+    assert len(narrowed_locations) < len(full_locations) / 2
+
+async def test_polls_ask_for_what_enabled_entities_read(hass, mock_api, config_entry):
+    coordinator = await setup_entry(hass, config_entry)
+
+    #devices are built from full documents
+    assert mock_api.get_appliances.await_args_list[0].args == (None, set())
+
+    await coordinator.async_refresh()
+    fields, kinds = mock_api.get_appliances.await_args.args
+    assert {"sensors", "smartModes"} <= fields
+    assert "room.soundsConfig" in fields
+    assert kinds == {ApplianceSensorKind.Pm2_5, ApplianceSensorKind.Co2, ApplianceSensorKind.FanSpeed}
@@ -0,0 +1,131 @@
+"""Tests for the authenticated session."""
+import asyncio
+import gzip
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from milasdk import ApplianceSensorKind, MilaError
+
+from custom_components.mila import api as api_module
+from custom_components.mila.api import MilaIntegrationApi
+from custom_components.mila.const import JSON_EXECUTOR_THRESHOLD
+from custom_components.mila.scheduler import MilaRequestScheduler
+
+from .conftest import FakeResponse, FakeSession, appliances_body, make_auth
+
+async def test_unchanged_response_is_not_parsed_again(hass, config_entry):
+    auth = make_auth(hass, config_entry)
+    auth._session = FakeSession([
+        FakeResponse(200, appliances_body(4.0), {"ETag": '"1"'}),
+        FakeResponse(200, appliances_body(4.0), {"ETag": '"1"'}),
+        FakeResponse(304, b"", {"ETag": '"1"'}),
+        FakeResponse(200, appliances_body(5.0), {"ETag": '"2"'}),
+    ])
+    api = MilaIntegrationApi(auth)
+    kinds = [ApplianceSensorKind.Pm2_5]
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")), \
+            patch.object(api_module, "parse_result", wraps=api_module.parse_result) as parse:
+        first = await api.get_appliances(["sensors"], kinds)
+        #same digest, then not modified: the previous parsed result is returned as is
+        assert await api.get_appliances(["sensors"], kinds) is first
+        assert await api.get_appliances(["sensors"], kinds) is first
+        changed = await api.get_appliances(["sensors"], kinds)
+
+    assert parse.call_count == 2
+    assert api.parses_skipped == 2
+    assert first[0]["sensors"][0]["kind"] == ApplianceSensorKind.Pm2_5
+    assert changed[0]["sensors"][0]["latest"]["value"] == 5.0
+    assert auth.stats.unchanged == 1 and auth.stats.not_modified == 1
+    assert auth._session.headers[2]["If-None-Match"] == '"1"'
+
+async def test_timeout_does_not_count_the_queue(hass, config_entry):
+    """A request that waits for the scheduler longer than the timeout is still sent."""
+    auth = make_auth(hass, config_entry)
+    auth._timeout = 0.1
+    auth.scheduler = MilaRequestScheduler(hass, rate=5, burst=1)
+    auth._session = FakeSession([
+        FakeResponse(200, appliances_body(1.0), {}),
+        FakeResponse(200, appliances_body(2.0), {}),
+        FakeResponse(200, appliances_body(3.0), {}),
+        FakeResponse(200, appliances_body(4.0), {}, delay=0.3),
+    ])
+    payload = {"json": {"query": "mutation { x }"}}
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")):
+        responses = await asyncio.gather(*(auth.post("url", **payload) for _ in range(3)))
+        assert [r.status for r in responses] == [200, 200, 200]
+        assert auth.scheduler.stats.max_wait_seconds > auth._timeout
+
+        #a slow response still times out
+        with pytest.raises(asyncio.TimeoutError):
+            await auth.post("url", **payload)
+
+async def test_compressed_transfers_and_large_bodies(hass, config_entry):
+    """Wire and decoded bytes are counted apart, large bodies are decoded off the event loop."""
+    auth = make_auth(hass, config_entry)
+    small = appliances_body(1.0)
+    large = json.dumps({"data": {"owner": {"appliances": [
+        {"id": f"a{i}", "sensors": [{"kind": "Pm2_5", "latest": {"value": float(i)}}]}
+        for i in range(JSON_EXECUTOR_THRESHOLD // 50)
+    ]}}}).encode()
+    assert len(small) < JSON_EXECUTOR_THRESHOLD < len(large)
+    #the session hands over decompressed bodies, the headers tell the size on the wire
+    auth._session = FakeSession([
+        FakeResponse(200, body, {"Content-Encoding": "gzip", "Content-Length": str(len(gzip.compress(body)))})
+        for body in (small, large)
+    ])
+    payload = {"json": {"query": "mutation { x }"}}
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")):
+        small_response = await auth.post("url", **payload)
+        large_response = await auth.post("url", **payload)
+
+    assert "gzip" in auth._session.headers[0]["Accept-Encoding"]
+    assert (await small_response.json())["data"]["owner"]["appliances"][0]["id"] == "a1"
+    assert len((await large_response.json())["data"]["owner"]["appliances"]) == JSON_EXECUTOR_THRESHOLD // 50
+    assert auth.stats.compressed == 2
+    assert auth.stats.decoded_bytes == len(small) + len(large)
+    assert auth.stats.wire_bytes < auth.stats.decoded_bytes / 5
+    assert auth.stats.decoded_off_loop == 1
+    assert auth.stats.decode_seconds > 0
+
+async def test_compressed_response_without_length_is_unmeasured(hass, config_entry):
+    """A chunked compressed response does not count its decoded size as wire bytes."""
+    auth = make_auth(hass, config_entry)
+    body = appliances_body(1.0)
+    auth._session = FakeSession([
+        FakeResponse(200, body, {"Content-Encoding": "gzip", "Transfer-Encoding": "chunked"}),
+        FakeResponse(200, body, {"Content-Encoding": "gzip", "Content-Length": "40"}),
+    ])
+    payload = {"json": {"query": "mutation { x }"}}
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")):
+        await auth.post("url", **payload)
+        await auth.post("url", **payload)
+
+    assert auth.stats.compressed == 2
+    assert auth.stats.unmeasured == 1
+    assert auth.stats.wire_bytes == 40
+    assert auth.stats.decoded_bytes == 2 * len(body)
+    assert auth.stats.wire_ratio == round(40 / len(body), 3)
+
+async def test_throttled_request_fails_without_retrying(hass, config_entry):
+    """A 429 or 503 holds back the scheduler and fails the request, instead of sleeping in the SDK."""
+    auth = make_auth(hass, config_entry)
+    auth._session = FakeSession([
+        FakeResponse(429, b"Too Many Requests", {"Retry-After": "0"}),
+        FakeResponse(503, b"Service Unavailable", {"Retry-After": "0"}),
+    ])
+    api = MilaIntegrationApi(auth)
+
+    with patch.object(auth, "async_get_access_token", AsyncMock(return_value="token")):
+        with pytest.raises(MilaError, match="HTTP 429"):
+            await api.get_appliances(["sensors"], [ApplianceSensorKind.Pm2_5])
+        with pytest.raises(MilaError, match="HTTP 503"):
+            await api.get_location_data(["outdoorStation.name"])
+
+    #one request each, no retries
+    assert len(auth._session.payloads) == 2
+    assert auth.scheduler.stats.throttled == 2
@@ -0,0 +1,32 @@
+"""Tests for the options flow."""
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.mila.const import CONF_PUSH, CONF_THRESHOLDS, CONF_TIMEOUT
+
+def suggested_values(result) -> dict:
+    return {
+        str(key): key.description["suggested_value"]
+        for key in result["data_schema"].schema
+        if key.description and "suggested_value" in key.description
+    }
+
+async def test_options_form_shows_the_current_options(hass, config_entry):
+    options = {CONF_SCAN_INTERVAL: 300, CONF_TIMEOUT: 15, CONF_PUSH: True, CONF_THRESHOLDS: "Co2 800 50"}
+    hass.config_entries.async_update_entry(config_entry, options=options)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    assert suggested_values(result) == options
+
+async def test_invalid_thresholds_keep_the_input(hass, config_entry):
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    user_input = {CONF_SCAN_INTERVAL: 60, CONF_TIMEOUT: 30, CONF_PUSH: False, CONF_THRESHOLDS: "Co2 high"}
+
+    result = await hass.config_entries.options.async_configure(result["flow_id"], user_input)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_THRESHOLDS: "invalid_thresholds"}
+    assert suggested_values(result)[CONF_SCAN_INTERVAL] == 60
+    assert suggested_values(result)[CONF_THRESHOLDS] == "Co2 high"
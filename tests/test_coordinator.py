@@ -0,0 +1,173 @@
+"""Tests for the update coordinator."""
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from milasdk import ApplianceSensorKind, MilaError
+
+from custom_components.mila.const import (
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    DATAKEY_APPLIANCE,
+    DATAKEY_LOCATION,
+    DATAKEY_STALE,
+    SENSOR_KINDS_INTERVAL,
+)
+
+from .conftest import make_appliance, make_location, setup_entry
+
+APPLIANCE_SENSOR = "sensor.mila_a1_pm2_5"
+CO_SENSOR = "sensor.mila_a1_co"
+LOCATION_SENSOR = "sensor.brooklyn_us_1_station_name"
+
+@pytest.fixture(autouse=True)
+def frozen_time(freezer):
+    freezer.move_to("2024-01-01 12:00:00+00:00")
+    return freezer
+
+async def test_push_keeps_appliances_fresh(hass, mock_api, config_entry, frozen_time):
+    """Push events count as updates, and the slower push sweep is not stale."""
+    coordinator = await setup_entry(hass, config_entry)
+    coordinator._push = MagicMock(connected=True)
+    coordinator._update_poll_interval()
+    next_poll = coordinator._unsub_refresh.__self__
+
+    #well past three scan intervals, within three sweep intervals
+    frozen_time.tick(timedelta(minutes=20))
+    coordinator._async_handle_push_update({
+        "id": "a1",
+        "sensors": [{"kind": ApplianceSensorKind.Pm2_5, "latest": {"value": 9.0}}],
+    })
+    await hass.async_block_till_done()
+
+    assert hass.states.get(APPLIANCE_SENSOR).state == "9.0"
+    assert coordinator.data[DATAKEY_STALE] == []
+    #the event did not push back the sweep
+    assert coordinator._unsub_refresh.__self__ is next_poll
+
+    #the last event is what counts for the appliances
+    frozen_time.tick(timedelta(minutes=40))
+    assert not coordinator.is_domain_stale(DATAKEY_APPLIANCE)
+    assert not coordinator.is_domain_stale(DATAKEY_LOCATION)
+    frozen_time.tick(timedelta(minutes=10))
+    assert coordinator.is_domain_stale(DATAKEY_APPLIANCE)
+
+async def test_webhook_patches_keep_appliances_fresh(hass, mock_api, config_entry, frozen_time):
+    coordinator = await setup_entry(hass, config_entry)
+
+    frozen_time.tick(timedelta(minutes=10))
+    assert coordinator.is_domain_stale(DATAKEY_APPLIANCE)
+    applied = coordinator.async_apply_appliance_patches([
+        {"id": "a1", "sensors": [{"kind": "Pm2_5", "latest": {"value": 7.0}}]},
+    ])
+    await hass.async_block_till_done()
+
+    assert applied == 1
+    assert not coordinator.is_domain_stale(DATAKEY_APPLIANCE)
+    assert coordinator.data[DATAKEY_STALE] == []
+    assert hass.states.get(APPLIANCE_SENSOR).state == "7.0"
+
+async def test_quiet_hours_failure_is_not_stale(hass, mock_api, config_entry, frozen_time):
+    """A failed poll during quiet hours is measured in sleep intervals."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, CONF_QUIET_START: "00:00", CONF_QUIET_END: "23:59"}
+    )
+    coordinator = await setup_entry(hass, config_entry)
+    assert coordinator.poll_plan.asleep
+    assert coordinator.update_interval == timedelta(minutes=30)
+
+    mock_api.get_location_data.side_effect = MilaError("unavailable")
+    frozen_time.tick(timedelta(minutes=30))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert set(coordinator.domain_errors) == {DATAKEY_LOCATION}
+    assert coordinator.data[DATAKEY_STALE] == []
+    assert hass.states.get(LOCATION_SENSOR).state != STATE_UNAVAILABLE
+
+    #appliances go stale after three sleep intervals without an update
+    mock_api.get_location_data.side_effect = mock_api._get_locations
+    mock_api.get_appliances.side_effect = MilaError("unavailable")
+    for _ in range(3):
+        frozen_time.tick(timedelta(minutes=30))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert coordinator.data[DATAKEY_STALE] == []
+    frozen_time.tick(timedelta(minutes=1))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.data[DATAKEY_STALE] == [DATAKEY_APPLIANCE]
+    assert hass.states.get(APPLIANCE_SENSOR).state == STATE_UNAVAILABLE
+    assert hass.states.get(LOCATION_SENSOR).state != STATE_UNAVAILABLE
+
+async def test_sensors_without_a_reading_are_not_created(hass, mock_api, config_entry, frozen_time):
+    """A kind listed without a value is not reported, until a value shows up."""
+    mock_api.appliances = [make_appliance("a1", readings={ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.Co: None})]
+    coordinator = await setup_entry(hass, config_entry)
+
+    assert coordinator.appliance_sensor_kinds["a1"] == {ApplianceSensorKind.Pm2_5}
+    assert hass.states.get(APPLIANCE_SENSOR) is not None
+    assert hass.states.get(CO_SENSOR) is None
+
+    #the other kinds are not listed on every poll
+    mock_api.appliances = [make_appliance("a1", readings={ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.Co: 1.0})]
+    frozen_time.tick(timedelta(minutes=2))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert mock_api.get_appliances.call_args.kwargs["list_other_kinds"] is False
+    assert hass.states.get(CO_SENSOR) is None
+
+    frozen_time.tick(SENSOR_KINDS_INTERVAL)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    _, polled_kinds = mock_api.get_appliances.call_args.args
+    assert ApplianceSensorKind.Co not in polled_kinds
+    assert mock_api.get_appliances.call_args.kwargs["list_other_kinds"] is True
+    assert hass.states.get(CO_SENSOR) is not None
+
+    #the next poll asks for the new kind
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(CO_SENSOR).state == "1.0"
+
+async def test_derived_values_leave_cached_documents_alone(hass, mock_api, config_entry):
+    """A response answered from the cache comes back as the same objects, they are not written to."""
+    cached = [make_location()]
+    mock_api.get_location_data.side_effect = None
+    mock_api.get_location_data.return_value = cached
+    coordinator = await setup_entry(hass, config_entry)
+
+    location = coordinator.data[DATAKEY_LOCATION]["loc_1"]
+    assert location["derived"]["aqi"] is not None
+    assert "derived" not in cached[0]
+
+    await coordinator.async_refresh()
+    #the unchanged response reuses the snapshot with its derived values
+    assert coordinator.data[DATAKEY_LOCATION]["loc_1"] is location
+    assert "derived" not in cached[0]
+
+async def test_unchanged_documents_keep_their_identity(hass, mock_api, config_entry):
+    """Only the changed appliance gets a new document, and a refresh that changes nothing notifies no one."""
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2")]
+    coordinator = await setup_entry(hass, config_entry)
+    await coordinator.async_refresh()
+    before = coordinator.data[DATAKEY_APPLIANCE]
+    updates = []
+    unsub = coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+
+    readings = {ApplianceSensorKind.Pm2_5: 40.0, ApplianceSensorKind.Co2: 600.0}
+    mock_api.appliances = [make_appliance("a1", readings=readings), make_appliance("a2", "room2")]
+    await coordinator.async_refresh()
+    after = coordinator.data[DATAKEY_APPLIANCE]
+    assert after["a1"] is not before["a1"]
+    assert after["a2"] is before["a2"]
+    assert len(updates) == 1
+
+    await coordinator.async_refresh()
+    assert coordinator.data[DATAKEY_APPLIANCE] is after
+    assert coordinator.data[DATAKEY_LOCATION]["loc_1"] is updates[0][DATAKEY_LOCATION]["loc_1"]
+    assert len(updates) == 1
+    unsub()
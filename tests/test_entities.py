@@ -0,0 +1,83 @@
+"""Tests for the entity state handling."""
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import entity_registry as er
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.entities.appliance.measurement_sensor import MilaApplianceMeasurementSensor
+
+from .conftest import make_appliance, setup_entry
+
+async def test_state_is_computed_once_per_update(hass, mock_api, config_entry):
+    """Reading the properties does not compute the state again, and unchanged states are not written."""
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2")]
+    coordinator = await setup_entry(hass, config_entry)
+    sensors = [
+        e for d in coordinator.devices.values() for e in d.entities
+        if isinstance(e, MilaApplianceMeasurementSensor)
+    ]
+    changes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, lambda e: changes.append(e.data["entity_id"]))
+
+    compute = MilaApplianceMeasurementSensor._compute_native_value
+    with patch.object(
+        MilaApplianceMeasurementSensor, "_compute_native_value", autospec=True, side_effect=compute
+    ) as computed:
+        readings = {ApplianceSensorKind.Pm2_5: 40.0, ApplianceSensorKind.Co2: 600.0}
+        mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2", readings)]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert computed.call_count == len(sensors)
+
+        for sensor in sensors:
+            for _ in range(10):
+                sensor.native_value, sensor.available, sensor.name
+        assert computed.call_count == len(sensors)
+
+    assert hass.states.get("sensor.mila_a2_pm2_5").state == "40.0"
+    assert not [entity_id for entity_id in changes if "mila_a1" in entity_id]
+
+#(entity id, unique id, enabled by default) of every appliance and location entity
+ENTITIES = [
+    ('fan.mila_a1_fan', 'mila_a1_fan', True),
+    ('select.mila_a1_sound_mode', 'mila_a1_soundmode', True),
+    ('sensor.brooklyn_us_1_aqi', 'mila_loc_1_aqi', True),
+    ('sensor.brooklyn_us_1_pollen_reported_date', 'mila_loc_1_pollenstation_aggregatewindow[-1]_date', True),
+    ('sensor.brooklyn_us_1_pollen_station_name', 'mila_loc_1_pollenstation_name', True),
+    ('sensor.brooklyn_us_1_pollen_status_grass', 'mila_loc_1_pollenstation_aggregatewindow[-1]_status_grass', True),
+    ('sensor.brooklyn_us_1_pollen_status_mold', 'mila_loc_1_pollenstation_aggregatewindow[-1]_status_mold', True),
+    ('sensor.brooklyn_us_1_pollen_status_trees', 'mila_loc_1_pollenstation_aggregatewindow[-1]_status_trees', True),
+    ('sensor.brooklyn_us_1_pollen_status_weeds', 'mila_loc_1_pollenstation_aggregatewindow[-1]_status_weeds', True),
+    ('sensor.brooklyn_us_1_station_distance', 'mila_loc_1_distance', True),
+    ('sensor.brooklyn_us_1_station_latitude', 'mila_loc_1_outdoorstation_point_lat', False),
+    ('sensor.brooklyn_us_1_station_longitude', 'mila_loc_1_outdoorstation_point_lon', False),
+    ('sensor.brooklyn_us_1_station_name', 'mila_loc_1_outdoorstation_name', True),
+    ('sensor.brooklyn_us_1_station_pm2_5', 'mila_loc_1_outdoorstation_sensor_latest_value', True),
+    ('sensor.mila_a1_bedtime_end', 'mila_a1_room_bedtime_localend', False),
+    ('sensor.mila_a1_bedtime_start', 'mila_a1_room_bedtime_localstart', False),
+    ('sensor.mila_a1_co2', 'mila_a1_sensor_co2', True),
+    ('sensor.mila_a1_mode', 'mila_a1_state_actualmode', True),
+    ('sensor.mila_a1_pm2_5', 'mila_a1_sensor_pm2_5', True),
+    ('sensor.mila_a1_wifi_strength', 'mila_a1_state_wifirssi', False),
+    ('switch.mila_a1_child_lock', 'mila_a1_smartmode_childlock', True),
+    ('switch.mila_a1_housekeeper', 'mila_a1_smartmode_housekeeper', True),
+    ('switch.mila_a1_power_saver', 'mila_a1_smartmode_powersaver', True),
+    ('switch.mila_a1_quarantine', 'mila_a1_smartmode_quarantine', True),
+    ('switch.mila_a1_quiet', 'mila_a1_smartmode_quiet', True),
+    ('switch.mila_a1_sleep', 'mila_a1_smartmode_sleep', True),
+    ('switch.mila_a1_turndown', 'mila_a1_smartmode_turndown', True),
+    ('switch.mila_a1_whitenoise', 'mila_a1_smartmode_whitenoise', True),
+]
+
+async def test_entities_are_registered_as_before(hass, mock_api, config_entry):
+    """Entity ids, unique ids and enabled defaults are kept across refactorings."""
+    mock_api.appliances = [make_appliance("a1")]
+    await setup_entry(hass, config_entry)
+
+    registry = er.async_get(hass)
+    assert sorted(
+        (e.entity_id, e.unique_id, e.disabled_by is None)
+        for e in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+        if not e.unique_id.startswith("mila_household_")
+    ) == ENTITIES
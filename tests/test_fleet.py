@@ -0,0 +1,45 @@
+"""Tests for the staggered refreshes of many accounts."""
+import asyncio
+from collections import Counter
+from datetime import timedelta
+
+from custom_components.mila.const import FLEET_MAX_CONCURRENT_REFRESHES
+from custom_components.mila.fleet import MilaFleet
+
+ACCOUNTS = 240
+INTERVAL = timedelta(seconds=120)
+
+async def test_accounts_are_spread_over_the_interval(hass):
+    """The load profile of many accounts is flat, instead of one burst per interval."""
+    fleet = MilaFleet(hass)
+    period = INTERVAL.total_seconds()
+    now = int(hass.loop.time())
+
+    first_polls = [now + fleet.phase(f"entry{i}", INTERVAL).total_seconds() for i in range(ACCOUNTS)]
+    assert all(now + period / 2 <= t < now + period * 1.5 for t in first_polls)
+
+    #requests per 10 second bucket of the interval, ideally 20
+    buckets = Counter(int(t % period // 10) for t in first_polls)
+    assert len(buckets) == period / 10
+    assert max(buckets.values()) <= 2 * ACCOUNTS / len(buckets)
+
+    #every account keeps its slot
+    assert fleet.phase("entry0", INTERVAL) == fleet.phase("entry0", INTERVAL)
+    assert MilaFleet(hass).offset("entry0", period) == fleet.offset("entry0", period)
+
+async def test_refreshes_are_bounded(hass):
+    fleet = MilaFleet(hass)
+    release = asyncio.Event()
+
+    async def refresh():
+        async with fleet.refresh():
+            await release.wait()
+
+    tasks = [asyncio.create_task(refresh()) for _ in range(3 * FLEET_MAX_CONCURRENT_REFRESHES)]
+    await asyncio.sleep(0)
+    assert fleet.as_dict()["in_flight"] == FLEET_MAX_CONCURRENT_REFRESHES
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert fleet.max_in_flight == FLEET_MAX_CONCURRENT_REFRESHES
+    assert fleet.refreshes == 3 * FLEET_MAX_CONCURRENT_REFRESHES
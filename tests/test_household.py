@@ -0,0 +1,55 @@
+"""Tests for the household aggregates."""
+import pytest
+from homeassistant.helpers import entity_registry as er
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.const import DOMAIN, TVOC_PPB_TO_UGM3
+from custom_components.mila.entities import AGGREGATE_ALL, household_aggregates
+
+from .conftest import make_appliance, setup_entry
+
+def appliance(id: str, room_id: str, room_kind: str, readings: dict) -> dict:
+    document = make_appliance(id, room_id, readings)
+    document["room"]["kind"] = room_kind
+    return document
+
+def test_aggregates_per_household_and_room_kind():
+    appliances = {
+        a["id"]: a for a in (
+            appliance("a1", "r1", "Bedroom", {ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.Voc: 10.0}),
+            appliance("a2", "r2", "Bedroom", {ApplianceSensorKind.Pm2_5: 10.0, ApplianceSensorKind.Co2: None}),
+            appliance("a3", "r3", "Kitchen", {ApplianceSensorKind.Pm2_5: 1.0, ApplianceSensorKind.FanSpeed: 900.0}),
+        )
+    }
+
+    aggregates = household_aggregates(appliances)
+
+    assert set(aggregates) == {AGGREGATE_ALL, "Bedroom", "Kitchen"}
+    assert aggregates[AGGREGATE_ALL][ApplianceSensorKind.Pm2_5] == {
+        "min": 1.0, "min_room": "Room r3", "max": 10.0, "max_room": "Room r2", "mean": 5.0, "count": 3,
+    }
+    assert aggregates["Bedroom"][ApplianceSensorKind.Pm2_5] == {
+        "min": 4.0, "min_room": "Room r1", "max": 10.0, "max_room": "Room r2", "mean": 7.0, "count": 2,
+    }
+    assert aggregates["Kitchen"][ApplianceSensorKind.Pm2_5]["count"] == 1
+    #in the unit of the appliance sensor
+    assert aggregates[AGGREGATE_ALL][ApplianceSensorKind.Voc]["mean"] == pytest.approx(10.0 * TVOC_PPB_TO_UGM3)
+    #kinds without a reading, and kinds that are not aggregated, are left out
+    assert ApplianceSensorKind.Co2 not in aggregates[AGGREGATE_ALL]
+    assert ApplianceSensorKind.FanSpeed not in aggregates[AGGREGATE_ALL]
+
+async def test_aggregate_sensors_are_opt_in(hass, mock_api, config_entry):
+    mock_api.appliances = [
+        make_appliance("a1", readings={ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.FanSpeed: 900.0})
+    ]
+    coordinator = await setup_entry(hass, config_entry)
+
+    unique_ids = {e.unique_id for e in coordinator.devices[coordinator.household_id].entities}
+    assert unique_ids == {
+        f"mila_{coordinator.household_id}_{group}_pm2_5_{stat}".lower()
+        for group in (AGGREGATE_ALL, "bedroom")
+        for stat in ("min", "max", "mean")
+    }
+    registry = er.async_get(hass)
+    assert all(registry.async_get(registry.async_get_entity_id("sensor", DOMAIN, id)).disabled for id in unique_ids)
+    assert not unique_ids & coordinator.enabled_entities
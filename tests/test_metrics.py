@@ -0,0 +1,58 @@
+"""Tests for the OpenMetrics page."""
+from custom_components.mila.const import CONF_METRICS, METRICS_URL
+from custom_components.mila.metrics import CONTENT_TYPE
+
+from .conftest import make_appliance, setup_entry
+
+async def setup_metrics(hass, config_entry, enabled: bool = True):
+    hass.config_entries.async_update_entry(config_entry, options={**config_entry.options, CONF_METRICS: enabled})
+    return await setup_entry(hass, config_entry)
+
+async def test_page_format(hass, hass_client, mock_api, config_entry):
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2")]
+    await setup_metrics(hass, config_entry)
+    client = await hass_client()
+
+    response = await client.get(METRICS_URL)
+    assert response.status == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    page = await response.text()
+    lines = page.splitlines()
+
+    entry = config_entry.entry_id
+    assert lines[:2] == [
+        "# TYPE mila_appliance_sensor gauge",
+        "# HELP mila_appliance_sensor Latest reading of an appliance sensor, in the unit of the API.",
+    ]
+    assert f'mila_appliance_sensor{{entry="{entry}",appliance="a2",room="Room room2",kind="Pm2_5"}} 4.0' in lines
+    assert f'mila_appliance_mode{{entry="{entry}",appliance="a1",mila_appliance_mode="Automagic"}} 1' in lines
+    assert "# TYPE mila_appliance_mode stateset" in lines
+    assert any(line.startswith(f'mila_outdoor_aqi{{entry="{entry}",location="loc_1"}} ') for line in lines)
+    #every sample belongs to the family declared right before it
+    family = None
+    for line in lines[:-1]:
+        if line.startswith("# TYPE "):
+            family = line.split()[2]
+        elif not line.startswith("#"):
+            assert line.split("{")[0] == family
+    assert page.endswith("# EOF\n")
+
+async def test_page_requires_auth(hass, hass_client_no_auth, mock_api, config_entry):
+    await setup_metrics(hass, config_entry)
+    client = await hass_client_no_auth()
+
+    response = await client.get(METRICS_URL)
+    assert response.status == 401
+
+async def test_page_without_metrics_enabled(hass, hass_client, mock_api, config_entry):
+    await setup_metrics(hass, config_entry)
+    client = await hass_client()
+    assert (await client.get(METRICS_URL)).status == 200
+
+    #the view stays registered, the account is no longer on the page
+    hass.config_entries.async_update_entry(config_entry, options={**config_entry.options, CONF_METRICS: False})
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await client.get(METRICS_URL)
+    assert response.status == 404
@@ -0,0 +1,76 @@
+"""Tests for the poll planner."""
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from custom_components.mila.planner import MilaPollPlanner, parse_local_time, window_end
+
+TZ = timezone(timedelta(hours=-5))
+INTERVAL = timedelta(minutes=2)
+SLEEP_INTERVAL = timedelta(minutes=30)
+
+def at(hour: int, minute: int = 0, day: int = 1) -> datetime:
+    return datetime(2024, 1, day, hour, minute, tzinfo=TZ)
+
+def room(start: str, end: str) -> dict:
+    return {"room": {"bedtime": {"localStart": start, "localEnd": end}}}
+
+@pytest.mark.parametrize(
+    "window, now, end",
+    [
+        #the start is inside, the end is not
+        ((time(9), time(17)), at(9), at(17)),
+        ((time(9), time(17)), at(16, 59), at(17)),
+        ((time(9), time(17)), at(17), None),
+        ((time(9), time(17)), at(8, 59), None),
+        #across midnight, before and after it
+        ((time(22), time(6)), at(22), at(6, day=2)),
+        ((time(22), time(6)), at(23, 59), at(6, day=2)),
+        ((time(22), time(6)), at(0), at(6)),
+        ((time(22), time(6)), at(5, 59), at(6)),
+        ((time(22), time(6)), at(6), None),
+        ((time(22), time(6)), at(21, 59), None),
+        #an empty window
+        ((time(6), time(6)), at(6), None),
+    ],
+)
+def test_window_end(window, now, end):
+    assert window_end(window, now) == end
+
+def test_parse_local_time():
+    assert parse_local_time("22:30") == time(22, 30)
+    assert parse_local_time("06:00:15") == time(6, 0, 15)
+    assert parse_local_time(time(7)) == time(7)
+    assert parse_local_time("") is None
+    assert parse_local_time(None) is None
+
+def test_sleeps_only_while_every_room_is_at_bedtime():
+    planner = MilaPollPlanner(INTERVAL, SLEEP_INTERVAL)
+    rooms = [room("22:00", "06:00"), room("23:00", "07:00")]
+
+    assert not planner.plan(rooms, at(22, 30)).asleep
+    plan = planner.plan(rooms, at(23, 30))
+    assert plan.asleep
+    assert plan.interval == SLEEP_INTERVAL
+    #the first room to wake up ends the sleep
+    assert plan.wake_up == at(6, day=2)
+
+    assert planner.plan([*rooms, room(None, "06:00")], at(23, 30)).reason == "a room has no bedtime"
+    assert planner.plan([], at(23, 30)).reason == "no rooms"
+
+def test_next_poll_is_at_wake_up():
+    planner = MilaPollPlanner(INTERVAL, SLEEP_INTERVAL)
+
+    assert planner.plan([room("22:00", "06:00")], at(5, 50)).interval == timedelta(minutes=10)
+    #never faster than the normal rate
+    assert planner.plan([room("22:00", "06:00")], at(5, 59)).interval == INTERVAL
+
+def test_quiet_hours_across_midnight():
+    planner = MilaPollPlanner(INTERVAL, SLEEP_INTERVAL, (time(23), time(7)))
+    awake = [room("12:00", "13:00")]
+
+    plan = planner.plan(awake, at(1))
+    assert plan.asleep and plan.reason == "quiet hours"
+    assert plan.wake_up == at(7)
+    assert planner.plan(awake, at(23)).wake_up == at(7, day=2)
+    assert not planner.plan(awake, at(7)).asleep
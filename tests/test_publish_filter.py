@@ -0,0 +1,73 @@
+"""Tests for the deadband applied to the measurement sensors."""
+from datetime import timedelta
+
+import pytest
+from milasdk import ApplianceSensorKind
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.mila.descriptions import MilaPublishFilter
+
+from .conftest import make_appliance, setup_entry
+
+PM2_5_SENSOR = "sensor.mila_a1_pm2_5"
+CO2_SENSOR = "sensor.mila_a1_co2"
+TEMPERATURE_SENSOR = "sensor.mila_a1_temperature"
+
+@pytest.fixture(autouse=True)
+def frozen_time(freezer):
+    freezer.move_to("2024-01-01 12:00:00+00:00")
+    return freezer
+
+def test_deadband_is_the_larger_of_absolute_and_relative():
+    publish_filter = MilaPublishFilter(absolute=1, relative=0.05)
+
+    assert not publish_filter.should_publish(10.0, 11.0, timedelta(0))
+    assert publish_filter.should_publish(10.0, 11.5, timedelta(0))
+    #5% of 100 is wider than the absolute deadband
+    assert not publish_filter.should_publish(100.0, 104.0, timedelta(0))
+    assert publish_filter.should_publish(100.0, 94.0, timedelta(0))
+
+def test_unknown_values_are_always_published():
+    publish_filter = MilaPublishFilter(absolute=1, min_interval=timedelta(minutes=1))
+
+    assert publish_filter.should_publish(None, 1.0, timedelta(0))
+    assert publish_filter.should_publish(1.0, None, timedelta(0))
+    assert not publish_filter.should_publish(None, None, timedelta(0))
+    assert not publish_filter.should_publish(1.0, 5.0, timedelta(seconds=59))
+    assert publish_filter.should_publish(1.0, 5.0, timedelta(minutes=1))
+
+async def refresh(hass, coordinator, mock_api, readings):
+    mock_api.appliances = [make_appliance("a1", readings=readings)]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+async def test_small_changes_are_not_written(hass, mock_api, config_entry):
+    readings = {ApplianceSensorKind.Pm2_5: 4.0, ApplianceSensorKind.Co2: 600.0}
+    mock_api.appliances = [make_appliance("a1", readings=readings)]
+    coordinator = await setup_entry(hass, config_entry)
+
+    await refresh(hass, coordinator, mock_api, {ApplianceSensorKind.Pm2_5: 4.5, ApplianceSensorKind.Co2: 610.0})
+    assert hass.states.get(PM2_5_SENSOR).state == "4.0"
+    assert hass.states.get(CO2_SENSOR).state == "600.0"
+    assert coordinator.suppressed_writes == {ApplianceSensorKind.Pm2_5: 1, ApplianceSensorKind.Co2: 1}
+
+    #the change is measured from the published value, 2% of 600 ppm is the deadband
+    await refresh(hass, coordinator, mock_api, {ApplianceSensorKind.Pm2_5: 5.5, ApplianceSensorKind.Co2: 613.0})
+    assert hass.states.get(PM2_5_SENSOR).state == "5.5"
+    assert hass.states.get(CO2_SENSOR).state == "613.0"
+    assert coordinator.suppressed_writes == {ApplianceSensorKind.Pm2_5: 1, ApplianceSensorKind.Co2: 1}
+
+async def test_change_held_back_by_the_interval_is_written_later(hass, mock_api, config_entry, frozen_time):
+    mock_api.appliances = [make_appliance("a1", readings={ApplianceSensorKind.Temperature: 20.0})]
+    coordinator = await setup_entry(hass, config_entry)
+
+    frozen_time.tick(timedelta(seconds=20))
+    await refresh(hass, coordinator, mock_api, {ApplianceSensorKind.Temperature: 21.0})
+    assert hass.states.get(TEMPERATURE_SENSOR).state == "20.0"
+    assert coordinator.suppressed_writes[ApplianceSensorKind.Temperature] == 1
+
+    #without another poll, the change is written once the interval passed
+    frozen_time.tick(timedelta(seconds=40))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(TEMPERATURE_SENSOR).state == "21.0"
@@ -0,0 +1,79 @@
+"""Tests for the push client, against a local subscription server."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientSession, web
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.api import MilaIntegrationApi
+from custom_components.mila.push import WS_PROTOCOLS, MilaPushClient
+
+async def start_server(events: list):
+    """A subscription server that acknowledges, then sends `events` to the first subscription."""
+    closed = asyncio.Event()
+
+    async def handle(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=WS_PROTOCOLS)
+        await ws.prepare(request)
+        assert (await ws.receive_json())["type"] == "connection_init"
+        await ws.send_json({"type": "connection_ack"})
+        subscription = await ws.receive_json()
+        for event in events:
+            if isinstance(event, str):
+                await ws.send_str(event)
+            else:
+                await ws.send_json({"id": subscription["id"], "type": "next", "payload": {"data": event}})
+        await ws.receive()
+        closed.set()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/graphql", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"ws://127.0.0.1:{port}/graphql", closed
+
+async def test_malformed_events_are_skipped(socket_enabled):
+    """A malformed event is dropped without closing the subscription."""
+    valid = {"appliance": {"id": "a1", "sensors": [{"kind": "Pm2_5", "latest": {"value": 12.0}}]}}
+    runner, url, closed = await start_server([
+        "not json",
+        {"appliance": {"id": "a1", "sensors": [{"kind": "NotAKind", "latest": {"value": 1.0}}]}},
+        {"appliance": {"id": "a1", "sensors": "not a list"}},
+        valid,
+    ])
+
+    api = MilaIntegrationApi(MagicMock())
+    auth = MagicMock(async_get_access_token=AsyncMock(return_value="token"))
+    updates = []
+    connection = []
+    received = asyncio.Event()
+
+    def on_update(appliance):
+        updates.append(appliance)
+        received.set()
+
+    async with ClientSession() as session:
+        client = MilaPushClient(
+            session, auth, api, url,
+            lambda id: api.appliance_subscription(id, ["sensors"], [ApplianceSensorKind.Pm2_5]),
+            on_update,
+            connection.append
+        )
+        await client.async_set_appliances(["a1"])
+        task = asyncio.create_task(client.async_run())
+        try:
+            await asyncio.wait_for(received.wait(), 5)
+            #connected once, never dropped by the bad events
+            assert connection == [True]
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await asyncio.wait_for(closed.wait(), 5)
+    await runner.cleanup()
+
+    assert [u["sensors"][0]["kind"] for u in updates] == [ApplianceSensorKind.Pm2_5]
+    assert updates[0]["sensors"][0]["latest"]["value"] == 12.0
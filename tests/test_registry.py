@@ -0,0 +1,50 @@
+"""Tests for following the entity registry."""
+from unittest.mock import patch
+
+from homeassistant.helpers import entity_registry as er
+from milasdk import ApplianceSensorKind
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .conftest import setup_entry
+
+async def test_disabling_an_entity_narrows_the_query(hass, mock_api, config_entry):
+    coordinator = await setup_entry(hass, config_entry)
+    registry = er.async_get(hass)
+    co2_entities = [
+        e.entity_id for e in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+        if "_co2" in e.entity_id and not e.disabled
+    ]
+    assert ApplianceSensorKind.Co2 in coordinator.enabled_sensor_kinds
+
+    for entity_id in co2_entities:
+        registry.async_update_entity(entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+
+    assert ApplianceSensorKind.Co2 not in coordinator.enabled_sensor_kinds
+    _, kinds = mock_api.get_appliances.await_args.args
+    assert ApplianceSensorKind.Co2 not in kinds
+
+    for entity_id in co2_entities:
+        registry.async_update_entity(entity_id, disabled_by=None)
+    await hass.async_block_till_done()
+
+    assert ApplianceSensorKind.Co2 in coordinator.enabled_sensor_kinds
+
+async def test_other_registry_changes_are_ignored(hass, mock_api, config_entry):
+    coordinator = await setup_entry(hass, config_entry)
+    registry = er.async_get(hass)
+    other_entry = MockConfigEntry(domain="other")
+    other_entry.add_to_hass(hass)
+    other = registry.async_get_or_create("sensor", "other", "1", config_entry=other_entry)
+    own = registry.async_get(hass.states.get("sensor.mila_a1_pm2_5").entity_id)
+
+    with patch.object(coordinator, "_async_update_enabled_entities") as update:
+        registry.async_update_entity(other.entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+        registry.async_update_entity(own.entity_id, name="Renamed")
+        await hass.async_block_till_done()
+        assert update.call_count == 0
+
+        registry.async_update_entity(own.entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+        await hass.async_block_till_done()
+        assert update.call_count == 1
@@ -0,0 +1,55 @@
+"""Tests for unloading and reloading a config entry."""
+import asyncio
+import gc
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+
+from custom_components.mila.const import DOMAIN
+from custom_components.mila.entities.common.entity import MilaEntity
+from custom_components.mila.update_coordinator import MilaUpdateCoordinator
+
+from .conftest import make_appliance, setup_entry
+
+def footprint(hass, entry) -> dict:
+    """What a loaded entry holds on to, besides its own coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    gc.collect()
+    #pending registry saves listen for the final write until they are flushed
+    listeners = {k: v for k, v in hass.bus.async_listeners().items() if k != EVENT_HOMEASSISTANT_FINAL_WRITE}
+    return {
+        "bus_listeners": listeners,
+        "tasks": len(asyncio.all_tasks()),
+        "entries": set(hass.data[DOMAIN]),
+        "on_unload": len(entry._on_unload or ()),
+        "update_listeners": len(entry.update_listeners),
+        "coordinator_listeners": len(coordinator._listeners),
+        "fleet": set(coordinator.fleet._entries),
+        "scheduler": set(coordinator.scheduler._reserved),
+        "scheduler_rate": coordinator.scheduler.rate,
+        "stations": set(coordinator.stations._users),
+        "states": len(hass.states.async_all()),
+        "coordinators": sum(isinstance(o, MilaUpdateCoordinator) for o in gc.get_objects()),
+        "entities": sum(isinstance(o, MilaEntity) for o in gc.get_objects()),
+    }
+
+async def test_reload_does_not_leak(hass, mock_api, config_entry):
+    """Reloading an entry a hundred times leaves nothing behind."""
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2")]
+    await setup_entry(hass, config_entry)
+    #one reload first, so lazily created shared state is in the baseline
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    baseline = footprint(hass, config_entry)
+    assert baseline["coordinators"] == 1
+
+    for _ in range(100):
+        assert await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert footprint(hass, config_entry) == baseline
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    gc.collect()
+    assert hass.data[DOMAIN] == {}
+    assert not any(isinstance(o, MilaUpdateCoordinator) for o in gc.get_objects())
@@ -0,0 +1,62 @@
+"""Tests for the room level entities."""
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.mila.const import DOMAIN
+
+from .conftest import make_appliance, setup_entry
+
+def room_entities(hass) -> set[str]:
+    return {
+        entity_id for entity_id in hass.states.async_entity_ids()
+        if entity_id.endswith(("_sound_mode", "_bedtime_start", "_bedtime_end"))
+    }
+
+def registered_room_entities(hass, entry) -> set[str]:
+    """The ids of the appliances that carry room entities in the registry."""
+    registry = er.async_get(hass)
+    return {
+        e.unique_id.split("_")[1] for e in er.async_entries_for_config_entry(registry, entry.entry_id)
+        if e.unique_id.endswith(("_soundmode", "_bedtime_localstart", "_bedtime_localend"))
+    }
+
+async def test_orphaned_room_entities_are_removed_at_setup(hass, mock_api, config_entry):
+    """Room entities registered on an appliance that is not the first of its room are removed."""
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2")]
+    registry = er.async_get(hass)
+    registry.async_get_or_create("select", DOMAIN, "mila_a2_soundmode", config_entry=config_entry)
+    registry.async_get_or_create("sensor", DOMAIN, "mila_a2_room_bedtime_localstart", config_entry=config_entry)
+
+    await setup_entry(hass, config_entry)
+
+    assert room_entities(hass) == {"select.mila_a1_sound_mode"}
+    assert registered_room_entities(hass, config_entry) == {"a1"}
+
+async def test_room_entities_follow_room_membership(hass, mock_api, config_entry):
+    mock_api.appliances = [make_appliance("a1", "room1"), make_appliance("a2", "room2")]
+    coordinator = await setup_entry(hass, config_entry)
+    assert room_entities(hass) == {"select.mila_a1_sound_mode", "select.mila_a2_sound_mode"}
+
+    #a2 moves into the room of a1, a1 stays the first appliance of the room
+    mock_api.appliances = [make_appliance("a1", "room1"), make_appliance("a2", "room1")]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert room_entities(hass) == {"select.mila_a1_sound_mode"}
+    assert registered_room_entities(hass, config_entry) == {"a1"}
+    assert "mila_a2_soundmode" not in {e.unique_id for e in coordinator.devices["a2"].entities}
+
+    #a0 joins the room and takes over its entities
+    mock_api.appliances = [make_appliance("a0", "room1"), *mock_api.appliances]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert room_entities(hass) == {"select.mila_a0_sound_mode"}
+    assert registered_room_entities(hass, config_entry) == {"a0"}
+    assert coordinator.devices["a1"].entities_for("select") == []
+
+    #a2 moves back to its own room
+    mock_api.appliances = [make_appliance("a0", "room1"), make_appliance("a1", "room1"), make_appliance("a2", "room2")]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert room_entities(hass) == {"select.mila_a0_sound_mode", "select.mila_a2_sound_mode"}
@@ -0,0 +1,33 @@
+"""Tests for the request scheduler."""
+import asyncio
+
+from custom_components.mila.const import SCHEDULER_POLL_REQUESTS, SCHEDULER_RATE
+from custom_components.mila.scheduler import MilaRequestScheduler, RequestPriority
+
+async def test_rate_scales_with_accounts(hass):
+    """Every account keeps its poll rate, with more accounts than the base rate serves."""
+    scheduler = MilaRequestScheduler(hass)
+    accounts, interval, rounds = 50, 0.5, 3
+    #the base rate alone serves a few requests per interval
+    assert accounts * SCHEDULER_POLL_REQUESTS > SCHEDULER_RATE * interval * 10
+    for i in range(accounts):
+        scheduler.register(f"entry{i}", SCHEDULER_POLL_REQUESTS / interval)
+
+    async def poll() -> None:
+        for _ in range(SCHEDULER_POLL_REQUESTS):
+            await scheduler.async_acquire(RequestPriority.POLL)
+
+    loop = hass.loop
+    start = loop.time()
+    for round in range(rounds):
+        await asyncio.gather(*(poll() for _ in range(accounts)))
+        #the polls of a round are done before the next one is due
+        assert loop.time() - start < (round + 1) * interval
+        await asyncio.sleep(start + (round + 1) * interval - loop.time())
+
+    assert scheduler.stats.granted["poll"] == rounds * accounts * SCHEDULER_POLL_REQUESTS
+    assert scheduler.stats.max_wait_seconds < interval
+
+    for i in range(accounts):
+        scheduler.unregister(f"entry{i}")
+    assert scheduler.rate == SCHEDULER_RATE
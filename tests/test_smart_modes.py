@@ -0,0 +1,45 @@
+"""Tests for the batched smart mode changes."""
+import asyncio
+
+from milasdk import MilaError, SmartModeKind
+
+from .conftest import make_appliance, setup_entry
+
+async def test_failed_changes_are_rolled_back_alone(hass, mock_api, config_entry):
+    """Within one batch, only the change that failed is undone and raised to its caller."""
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2")]
+    await setup_entry(hass, config_entry)
+
+    async def set_smart_mode(id, mode, enabled):
+        if id == "a2":
+            raise MilaError("rejected")
+    mock_api.set_smart_mode.side_effect = set_smart_mode
+    #keep the local state, the refresh after the batch fails
+    mock_api.get_appliances.side_effect = MilaError("unavailable")
+
+    results = await asyncio.gather(
+        *(
+            hass.services.async_call("switch", "turn_on", {"entity_id": entity_id}, blocking=True)
+            for entity_id in ("switch.mila_a1_quiet", "switch.mila_a2_quiet", "switch.mila_a2_sleep")
+        ),
+        return_exceptions=True
+    )
+    await hass.async_block_till_done()
+
+    assert results[0] is None
+    assert isinstance(results[1], MilaError) and isinstance(results[2], MilaError)
+    assert mock_api.set_smart_mode.await_count == 3
+    assert hass.states.get("switch.mila_a1_quiet").state == "on"
+    assert hass.states.get("switch.mila_a2_quiet").state == "off"
+    assert hass.states.get("switch.mila_a2_sleep").state == "off"
+
+async def test_undone_change_is_not_sent(hass, mock_api, config_entry):
+    device = (await setup_entry(hass, config_entry)).devices["a1"]
+
+    await asyncio.gather(
+        device.set_smart_mode(SmartModeKind.Quiet, True),
+        device.set_smart_mode(SmartModeKind.Quiet, False),
+    )
+
+    mock_api.set_smart_mode.assert_not_awaited()
+    assert hass.states.get("switch.mila_a1_quiet").state == "off"
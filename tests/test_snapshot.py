@@ -0,0 +1,45 @@
+"""Tests for the snapshot service."""
+from homeassistant.helpers import entity_registry as er
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.const import DATAKEY_APPLIANCE, DOMAIN, SERVICE_GET_SNAPSHOT
+
+from .conftest import setup_entry
+
+async def get_snapshot(hass, **data):
+    return await hass.services.async_call(DOMAIN, SERVICE_GET_SNAPSHOT, data, blocking=True, return_response=True)
+
+async def test_snapshot_of_polled_data(hass, mock_api, config_entry):
+    """With every entity enabled, the snapshot is read from the last poll."""
+    await setup_entry(hass, config_entry)
+    polls = mock_api.get_appliances.await_count
+
+    snapshot = await get_snapshot(hass)
+
+    assert mock_api.get_appliances.await_count == polls
+    assert snapshot["appliances"]["a1"]["readings"] == {"Pm2_5": 4.0, "Co2": 600.0}
+
+async def test_snapshot_has_the_data_of_disabled_entities(hass, mock_api, config_entry):
+    coordinator = await setup_entry(hass, config_entry)
+    registry = er.async_get(hass)
+    for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        if "co2" in entry.entity_id or entry.domain == "switch":
+            registry.async_update_entity(entry.entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+
+    #the polls leave out what the disabled entities read
+    _, kinds = mock_api.get_appliances.await_args.args
+    assert ApplianceSensorKind.Co2 not in kinds
+    assert "smartModes" not in coordinator.data[DATAKEY_APPLIANCE]["a1"]
+
+    snapshot = await get_snapshot(hass)
+
+    appliance = snapshot["appliances"]["a1"]
+    assert appliance["readings"] == {"Pm2_5": 4.0, "Co2": 600.0}
+    assert appliance["smart_modes"] and not any(appliance["smart_modes"].values())
+    assert appliance["age_seconds"] == 0.0
+    _, kinds = mock_api.get_appliances.await_args.args
+    assert ApplianceSensorKind.Co2 in kinds
+    #the one-off fetch does not change the polled data
+    assert "smartModes" not in coordinator.data[DATAKEY_APPLIANCE]["a1"]
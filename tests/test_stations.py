@@ -0,0 +1,45 @@
+"""Tests for the shared station cache."""
+from custom_components.mila.entities.location.util import DERIVED_AQI, pm25_to_aqi
+from custom_components.mila.stations import MilaStationCache
+
+from .conftest import make_location
+
+def location(pm25: float, name: str = "Station") -> dict:
+    document = make_location()
+    document["outdoorStation"]["sensor"]["latest"]["value"] = pm25
+    document["outdoorStation"]["name"] = name
+    return document
+
+def test_values_are_computed_once_per_reading():
+    cache = MilaStationCache()
+
+    assert cache.derived_value(DERIVED_AQI, location(8.0)) == pm25_to_aqi(8.0)
+    #a new document with the same reading, or with other fields changed
+    assert cache.derived_value(DERIVED_AQI, location(8.0)) == pm25_to_aqi(8.0)
+    assert cache.derived_value(DERIVED_AQI, location(8.0, "Renamed")) == pm25_to_aqi(8.0)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert cache.derived_value(DERIVED_AQI, location(20.0)) == pm25_to_aqi(20.0)
+    assert cache.misses == 2
+
+def test_locations_with_different_readings_do_not_evict_each_other():
+    """Two entries polling the same station at different times alternate between two readings."""
+    cache = MilaStationCache()
+    older, newer = location(8.0), location(9.0)
+
+    for _ in range(10):
+        assert cache.derived_value(DERIVED_AQI, older) == pm25_to_aqi(8.0)
+        assert cache.derived_value(DERIVED_AQI, newer) == pm25_to_aqi(9.0)
+
+    assert cache.misses == 2
+
+def test_unused_stations_are_dropped():
+    cache = MilaStationCache()
+    cache.retain("entry1", [location(8.0)])
+    cache.retain("entry2", [location(8.0)])
+    cache.derived_value(DERIVED_AQI, location(8.0))
+
+    cache.release("entry1")
+    assert cache.as_dict()["stations"] == 1
+    cache.release("entry2")
+    assert cache.as_dict()["stations"] == 0
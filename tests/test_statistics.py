@@ -0,0 +1,66 @@
+"""Tests for the statistics backfill."""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.entities import MilaApplianceMeasurementSensor
+from custom_components.mila.statistics import MilaStatisticsImporter
+
+NOW = datetime(2024, 1, 10, 12, 30, tzinfo=timezone.utc)
+
+def hour(h: int) -> datetime:
+    return datetime(2024, 1, 10, h, tzinfo=timezone.utc)
+
+def sensor(kind: ApplianceSensorKind) -> MilaApplianceMeasurementSensor:
+    entity = MagicMock(spec=MilaApplianceMeasurementSensor)
+    entity.sensor_kind = kind
+    entity.unique_id = f"mila_a1_sensor_{kind.value}".lower()
+    entity.convert_value.side_effect = lambda value: value
+    return entity
+
+@pytest.fixture
+def appliance():
+    return SimpleNamespace(
+        id="a1",
+        name_or_id="Mila a1",
+        entities=[sensor(ApplianceSensorKind.Pm2_5), sensor(ApplianceSensorKind.Co2)],
+    )
+
+@pytest.fixture(autouse=True)
+def frozen_time(freezer):
+    freezer.move_to(NOW)
+
+async def backfill(hass, appliance, last_imported, enabled):
+    api = MagicMock()
+    api.get_appliance_sensor_history = AsyncMock(return_value={
+        ApplianceSensorKind.Pm2_5: {hour(h): {"mean": h, "min": h, "max": h} for h in range(7, 12)},
+    })
+    importer = MilaStatisticsImporter(hass, api)
+    hass.config.components.add("recorder")
+    with patch.object(importer, "_async_get_last_imported", AsyncMock(return_value=last_imported)), patch(
+        "custom_components.mila.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        await importer.async_backfill([appliance], enabled)
+    return api.get_appliance_sensor_history, add_statistics
+
+async def test_resumes_after_the_last_imported_hour(hass, appliance):
+    """Only the completed hours after the last import are requested and written."""
+    history, add_statistics = await backfill(hass, appliance, hour(8), {"mila_a1_sensor_pm2_5"})
+
+    #the disabled CO2 sensor does not pull the start back to the oldest hour
+    history.assert_awaited_once_with("a1", [ApplianceSensorKind.Pm2_5], hour(9), hour(12))
+    (_, metadata, statistics), _ = add_statistics.call_args
+    assert metadata["statistic_id"] == "mila:a1_pm2_5"
+    assert [s["start"] for s in statistics] == [hour(9), hour(10), hour(11)]
+
+async def test_nothing_to_import(hass, appliance):
+    history, add_statistics = await backfill(hass, appliance, hour(11), {"mila_a1_sensor_pm2_5"})
+    history.assert_not_awaited()
+    add_statistics.assert_not_called()
+
+    #or nothing enabled
+    history, _ = await backfill(hass, appliance, None, set())
+    history.assert_not_awaited()
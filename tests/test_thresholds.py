@@ -0,0 +1,67 @@
+"""Tests for the threshold crossings."""
+import pytest
+from milasdk import ApplianceSensorKind
+
+from custom_components.mila.thresholds import (
+    DEFAULT_THRESHOLDS,
+    MilaThreshold,
+    MilaThresholdMonitor,
+    format_thresholds,
+    parse_thresholds,
+)
+
+from .conftest import make_appliance
+
+def test_parse_thresholds():
+    assert parse_thresholds("co2 1000 100\n\n  Pm2_5 35  \n") == [
+        MilaThreshold(ApplianceSensorKind.Co2, 1000, 100),
+        MilaThreshold(ApplianceSensorKind.Pm2_5, 35, 0),
+    ]
+    assert parse_thresholds(None) == []
+    assert parse_thresholds(format_thresholds(DEFAULT_THRESHOLDS)) == list(DEFAULT_THRESHOLDS)
+
+@pytest.mark.parametrize("text", ["Radon 4", "Co2", "Co2 1000 100 5", "Co2 high", "Co2 1000 -1"])
+def test_parse_errors(text):
+    with pytest.raises(ValueError):
+        parse_thresholds(text)
+
+def crossings(monitor: MilaThresholdMonitor, value: float) -> list[str]:
+    appliance = make_appliance("a1", readings={ApplianceSensorKind.Co2: value})
+    return [c["direction"] for c in monitor.evaluate({"a1": appliance})]
+
+def test_first_reading_only_sets_the_state():
+    monitor = MilaThresholdMonitor([MilaThreshold(ApplianceSensorKind.Co2, 1000, 100)], {})
+
+    assert crossings(monitor, 1200) == []
+    assert crossings(monitor, 850) == ["below"]
+
+    #an appliance that is forgotten starts over
+    monitor.forget(["a1"])
+    assert crossings(monitor, 1200) == []
+
+def test_hysteresis():
+    monitor = MilaThresholdMonitor([MilaThreshold(ApplianceSensorKind.Co2, 1000, 100)], {})
+    crossings(monitor, 900)
+
+    #only going over the level is above, and only dropping under the band is below
+    assert crossings(monitor, 1000) == []
+    assert crossings(monitor, 1001) == ["above"]
+    assert crossings(monitor, 950) == []
+    assert crossings(monitor, 900) == []
+    assert crossings(monitor, 899) == ["below"]
+    assert crossings(monitor, 950) == []
+
+def test_readings_are_converted_to_the_sensor_unit():
+    monitor = MilaThresholdMonitor([MilaThreshold(ApplianceSensorKind.Co2, 1000)], {ApplianceSensorKind.Co2: 2})
+    crossings(monitor, 400)
+
+    crossing = monitor.evaluate({"a1": make_appliance("a1", readings={ApplianceSensorKind.Co2: 600})})
+
+    assert crossing == [{
+        "appliance_id": "a1",
+        "room": "Room room1",
+        "kind": "Co2",
+        "threshold": 1000,
+        "value": 1200,
+        "direction": "above",
+    }]
@@ -0,0 +1,44 @@
+"""Tests for the webhook that accepts pushed readings."""
+from homeassistant.const import CONF_WEBHOOK_ID, EVENT_STATE_CHANGED
+
+from custom_components.mila.const import CONF_WEBHOOK
+
+from .conftest import make_appliance, setup_entry
+
+WEBHOOK_ID = "mila_test_webhook"
+
+def patch(id: str, pm2_5) -> dict:
+    return {"id": id, "sensors": [{"kind": "Pm2_5", "latest": {"value": pm2_5}}]}
+
+async def test_webhook_applies_batches(hass, hass_client_no_auth, mock_api, config_entry):
+    """A batch is merged with one state write per entity, invalid patches are skipped."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, CONF_WEBHOOK: True, CONF_WEBHOOK_ID: WEBHOOK_ID}
+    )
+    mock_api.appliances = [make_appliance("a1"), make_appliance("a2", "room2")]
+    await setup_entry(hass, config_entry)
+    polls = mock_api.get_appliances.await_count
+    client = await hass_client_no_auth()
+    changes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, lambda e: changes.append(e.data["entity_id"]))
+
+    response = await client.post(f"/api/webhook/{WEBHOOK_ID}", json={"appliances": [
+        patch("a1", 20.0),
+        patch("a1", 30.0),
+        patch("a2", 40.0),
+        patch("a9", 50.0),
+        {"id": "a2", "sensors": [{"kind": "NotAKind", "latest": {"value": 1.0}}]},
+    ]})
+    await hass.async_block_till_done()
+
+    assert response.status == 200
+    assert await response.json() == {"applied": 3}
+    assert hass.states.get("sensor.mila_a1_pm2_5").state == "30.0"
+    assert hass.states.get("sensor.mila_a2_pm2_5").state == "40.0"
+    assert changes.count("sensor.mila_a1_pm2_5") == 1
+    assert mock_api.get_appliances.await_count == polls
+
+    for body in ("not json", '{"appliances": "a1"}'):
+        response = await client.post(f"/api/webhook/{WEBHOOK_ID}", data=body)
+        assert response.status == 400